@@ -1,15 +1,21 @@
 from fastapi import Depends
 from sqlmodel import Session
-from app.database import get_session
+from app.database import (
+    get_session, get_async_session, get_async_session_factory, get_read_session, get_read_session_factory,
+)
 from app.dependencies.auth import get_current_user
 
 # Create standard dependencies alias for simpler imports in routers
 def get_db():
     yield from get_session()
 
-# Re-export get_current_user and get_session for convenience in API routes
+# Re-export get_current_user and the session dependencies for convenience in API routes
 # This acts as the central dependency injection container
 deps = {
     "get_session": get_session,
+    "get_async_session": get_async_session,
+    "get_async_session_factory": get_async_session_factory,
+    "get_read_session": get_read_session,
+    "get_read_session_factory": get_read_session_factory,
     "get_current_user": get_current_user
 }
@@ -0,0 +1,102 @@
+from datetime import datetime
+from typing import List, Literal, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy import and_, or_
+from app.api import deps
+from app.core.limiter import limiter
+from app.models.message import Message
+from app.models.order import Order
+from app.models.review import Review
+from app.models.user import User
+from app.services import export_service
+from app.services.export_service import ExportFormat
+from app.services.row_serializers import message_rows, order_rows, review_rows
+
+router = APIRouter()
+
+# Full histories as NDJSON (default) or CSV, streamed with constant memory
+# from a read replica when one is configured. Rows come oldest first; pass the
+# id of the last row received as `after` to resume an interrupted export.
+
+
+@router.get("/orders")
+@limiter.limit("10/minute")
+async def export_orders(
+    request: Request,
+    format: ExportFormat = "ndjson",
+    status: Optional[List[str]] = Query(None),
+    role: Optional[Literal["client", "freelancer"]] = None,
+    counterpart_id: Optional[UUID] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    after: Optional[UUID] = None,
+    current_user: User = Depends(deps.get_current_user),
+    sessions=Depends(deps.get_read_session_factory),
+):
+    """The current user's orders, optionally by status, side, other party and creation date."""
+    as_client = Order.client_id == current_user.id
+    as_freelancer = Order.freelancer_id == current_user.id
+    if counterpart_id is not None:
+        as_client = and_(as_client, Order.freelancer_id == counterpart_id)
+        as_freelancer = and_(as_freelancer, Order.client_id == counterpart_id)
+    sides = {"client": as_client, "freelancer": as_freelancer}
+    conditions = [sides[role] if role else or_(as_client, as_freelancer)]
+    if status:
+        conditions.append(Order.status.in_(status))
+
+    resume_from = await export_service.resume_point(sessions, Order, after, conditions)
+    statement = export_service.export_statement(order_rows, Order, conditions, since, until, resume_from)
+    return export_service.export_response(sessions, statement, order_rows, format, "orders")
+
+
+@router.get("/messages")
+@limiter.limit("10/minute")
+async def export_messages(
+    request: Request,
+    format: ExportFormat = "ndjson",
+    counterpart_id: Optional[UUID] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    after: Optional[UUID] = None,
+    current_user: User = Depends(deps.get_current_user),
+    sessions=Depends(deps.get_read_session_factory),
+):
+    """Messages the current user sent or received; one conversation with `counterpart_id`."""
+    sent = Message.sender_id == current_user.id
+    received = Message.receiver_id == current_user.id
+    if counterpart_id is not None:
+        sent = and_(sent, Message.receiver_id == counterpart_id)
+        received = and_(received, Message.sender_id == counterpart_id)
+    conditions = [or_(sent, received)]
+
+    resume_from = await export_service.resume_point(sessions, Message, after, conditions)
+    statement = export_service.export_statement(message_rows, Message, conditions, since, until, resume_from)
+    return export_service.export_response(sessions, statement, message_rows, format, "messages")
+
+
+@router.get("/reviews")
+@limiter.limit("10/minute")
+async def export_reviews(
+    request: Request,
+    format: ExportFormat = "ndjson",
+    role: Optional[Literal["given", "received"]] = None,
+    counterpart_id: Optional[UUID] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    after: Optional[UUID] = None,
+    current_user: User = Depends(deps.get_current_user),
+    sessions=Depends(deps.get_read_session_factory),
+):
+    """Reviews the current user wrote or received."""
+    given = Review.reviewer_id == current_user.id
+    received = Review.reviewee_id == current_user.id
+    if counterpart_id is not None:
+        given = and_(given, Review.reviewee_id == counterpart_id)
+        received = and_(received, Review.reviewer_id == counterpart_id)
+    sides = {"given": given, "received": received}
+    conditions = [sides[role] if role else or_(given, received)]
+
+    resume_from = await export_service.resume_point(sessions, Review, after, conditions)
+    statement = export_service.export_statement(review_rows, Review, conditions, since, until, resume_from)
+    return export_service.export_response(sessions, statement, review_rows, format, "reviews")
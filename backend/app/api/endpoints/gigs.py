@@ -1,64 +1,201 @@
+from datetime import datetime
+from decimal import Decimal
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.orm import joinedload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.api import deps
+from app.core.conditional import PUBLIC_CATALOG, conditional_json, etag_from_body, etag_from_versions
 from app.core.limiter import limiter
+from app.core.pagination import link_next_page, paginate, set_next_cursor
+from app.core.read_cache import pack_response, unpack_response
+from app.core.serialization import dump_json, wants_columnar
 from app.models.gig import Gig
+from app.models.rating import UserRatingSummary
 from app.models.user import User
-from app.schemas.gig import GigCreate, GigUpdate, GigRead
+from app.schemas.gig import GigCreate, GigExpandedRead, GigUpdate, GigRead
+from app.schemas.rating import GigRatingRead
+from app.services import gig_catalog, gig_search, rating_service
 
 router = APIRouter()
 
 @router.get("/", response_model=List[GigRead])
-def read_gigs(
+async def read_gigs(
+    request: Request,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    active_only: bool = True,
+    session: AsyncSession = Depends(deps.get_read_session)
+):
+    # Pass `cursor` (from the Link / X-Next-Cursor header) for keyset paging; `skip` still works
+    return await _gig_page(request, session, skip, limit, cursor, active_only, expand=False)
+
+@router.get("/expanded", response_model=List[GigExpandedRead])
+async def read_gigs_expanded(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     active_only: bool = True,
-    session: Session = Depends(deps.get_session)
+    session: AsyncSession = Depends(deps.get_read_session)
+):
+    """Same feed as `/`, with each gig's freelancer embedded (joined in the same query)."""
+    return await _gig_page(request, session, skip, limit, cursor, active_only, expand=True)
+
+async def _gig_page(request: Request, session: AsyncSession, skip: int, limit: int, cursor: Optional[str], active_only: bool, expand: bool):
+    # Embedded profiles do not fit the columnar format; expanded pages are always objects
+    columnar = wants_columnar(request) and not expand
+
+    async def load() -> bytes:
+        if expand:
+            query = select(Gig).options(joinedload(Gig.freelancer))
+        else:
+            # Only GigRead's columns (plus the row version for the ETag), no ORM objects
+            query = gig_catalog.gig_rows.select(Gig.updated_at)
+        if active_only:
+            query = query.where(Gig.is_active == True)
+        query = paginate(query, Gig, limit, skip=skip, cursor=cursor)
+        gigs = (await session.exec(query)).all()
+        next_cursor = set_next_cursor(request, Response(), gigs, limit)
+        if expand:
+            # Embedded profiles have no row version on the gig, so expanded pages hash the body
+            body = dump_json(gig_catalog.gig_expanded_list_adapter, gigs)
+            etag = etag_from_body(body)
+        else:
+            # No Last-Modified on pages: a gig leaving the page would not move it forward
+            body = gig_catalog.gig_rows.dump(gigs, columnar)
+            etag = etag_from_versions([(gig.id, gig.updated_at) for gig in gigs], next_cursor, columnar)
+        return pack_response(body, {"next_cursor": next_cursor, "etag": etag})
+
+    # Served pre-serialized from the catalog cache; the session only connects on a miss
+    key = gig_catalog.list_key(active_only, skip, limit, cursor, expand, columnar)
+    meta, body = unpack_response(await gig_catalog.get_or_load(request, key, load))
+    response = conditional_json(
+        request, body, meta["etag"], cache_control=PUBLIC_CATALOG, vary="Accept",
+        media_type=gig_catalog.gig_rows.media_type(columnar),
+    )
+    if meta.get("next_cursor"):
+        link_next_page(request, response, meta["next_cursor"], limit)
+    return response
+
+@router.get("/search", response_model=List[GigRead])
+async def search_gigs(
+    request: Request,
+    q: Optional[str] = Query(None, max_length=200),
+    min_price: Optional[Decimal] = Query(None, ge=0),
+    max_price: Optional[Decimal] = Query(None, ge=0),
+    max_delivery_days: Optional[int] = Query(None, ge=1),
+    min_rating: Optional[float] = Query(None, ge=1, le=5),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    session: AsyncSession = Depends(deps.get_read_session)
+):
+    """
+    Full-text search over active gigs with price, delivery and freelancer rating
+    filters. Results are ranked by relevance; without `q` they are newest first.
+    """
+    filters = dict(min_price=min_price, max_price=max_price, max_delivery_days=max_delivery_days, min_rating=min_rating)
+    terms = gig_search.search_terms(q or "")
+    columnar = wants_columnar(request)
+    columns = [*gig_catalog.gig_rows.columns, Gig.updated_at]
+
+    async def load() -> bytes:
+        if terms:
+            query = gig_search.search_statement(session.bind.dialect.name, terms, limit, skip=skip, columns=columns, **filters)
+        else:
+            query = paginate(gig_search.apply_filters(select(*columns), **filters), Gig, limit, skip=skip)
+        gigs = (await session.exec(query)).all()
+        body = gig_catalog.gig_rows.dump(gigs, columnar)
+        return pack_response(body, {"etag": etag_from_versions([(gig.id, gig.updated_at) for gig in gigs], columnar)})
+
+    key = gig_catalog.search_key(terms, skip, limit, columnar, **filters)
+    meta, body = unpack_response(await gig_catalog.get_or_load(request, key, load))
+    return conditional_json(
+        request, body, meta["etag"], cache_control=PUBLIC_CATALOG, vary="Accept",
+        media_type=gig_catalog.gig_rows.media_type(columnar),
+    )
+
+@router.get("/ratings", response_model=List[GigRatingRead])
+async def read_gig_ratings(
+    ids: List[UUID] = Query(..., max_length=100),
+    session: AsyncSession = Depends(deps.get_read_session)
 ):
-    query = select(Gig)
-    if active_only:
-        query = query.where(Gig.is_active == True)
-    query = query.offset(skip).limit(limit)
-    gigs = session.exec(query).all()
-    return gigs
+    """Ratings for a page of gigs in one query (gig -> freelancer summary by primary key)."""
+    rows = (await session.exec(
+        select(Gig.id, Gig.freelancer_id, UserRatingSummary)
+        .outerjoin(UserRatingSummary, UserRatingSummary.user_id == Gig.freelancer_id)
+        .where(Gig.id.in_(ids))
+    )).all()
+    return [
+        GigRatingRead(gig_id=gig_id, **rating_service.to_read(freelancer_id, summary).model_dump())
+        for gig_id, freelancer_id, summary in rows
+    ]
 
 @router.post("/", response_model=GigRead)
 @limiter.limit("10/minute")
-def create_gig(
+async def create_gig(
     request: Request,
     gig_in: GigCreate,
     current_user: User = Depends(deps.get_current_user),
-    session: Session = Depends(deps.get_session)
+    session: AsyncSession = Depends(deps.get_async_session)
 ):
-    # Create Gig model
-    gig = Gig.from_orm(gig_in)
-    gig.freelancer_id = current_user.id
+    # Create Gig model (freelancer_id is required, so it is supplied during validation)
+    gig = Gig.model_validate(gig_in, update={"freelancer_id": current_user.id})
     
     session.add(gig)
-    session.commit()
-    session.refresh(gig)
+    await session.commit()
+    await gig_catalog.invalidate()
+    await session.refresh(gig)
     return gig
 
 @router.get("/{id}", response_model=GigRead)
-def read_gig(
+async def read_gig(
+    request: Request,
     id: UUID,
-    session: Session = Depends(deps.get_session)
+    session: AsyncSession = Depends(deps.get_read_session)
 ):
-    gig = session.get(Gig, id)
-    if not gig:
+    async def load() -> bytes:
+        gig = await session.get(Gig, id)
+        if not gig:
+            # Not cached: raised to every request waiting on this load
+            raise HTTPException(status_code=404, detail="Gig not found")
+        body = GigRead.model_validate(gig).model_dump_json().encode()
+        return pack_response(body, {
+            "etag": etag_from_versions(gig.id, gig.updated_at),
+            "last_modified": gig.updated_at.isoformat(),
+        })
+
+    # A revalidation that hits the cache answers 304 without touching the database
+    meta, body = unpack_response(await gig_catalog.get_or_load(request, gig_catalog.detail_key(id), load))
+    last_modified = datetime.fromisoformat(meta["last_modified"])
+    return conditional_json(request, body, meta["etag"], last_modified, cache_control=PUBLIC_CATALOG)
+
+@router.get("/{id}/rating", response_model=GigRatingRead)
+async def read_gig_rating(
+    id: UUID,
+    session: AsyncSession = Depends(deps.get_read_session)
+):
+    row = (await session.exec(
+        select(Gig.freelancer_id, UserRatingSummary)
+        .outerjoin(UserRatingSummary, UserRatingSummary.user_id == Gig.freelancer_id)
+        .where(Gig.id == id)
+    )).first()
+    if row is None:
         raise HTTPException(status_code=404, detail="Gig not found")
-    return gig
+    freelancer_id, summary = row
+    return GigRatingRead(gig_id=id, **rating_service.to_read(freelancer_id, summary).model_dump())
 
 @router.patch("/{id}", response_model=GigRead)
-def update_gig(
+async def update_gig(
     id: UUID,
     gig_update: GigUpdate,
     current_user: User = Depends(deps.get_current_user),
-    session: Session = Depends(deps.get_session)
+    session: AsyncSession = Depends(deps.get_async_session)
 ):
-    gig = session.get(Gig, id)
+    gig = await session.get(Gig, id)
     if not gig:
         raise HTTPException(status_code=404, detail="Gig not found")
         
@@ -70,23 +207,25 @@ def update_gig(
         setattr(gig, key, value)
         
     session.add(gig)
-    session.commit()
-    session.refresh(gig)
+    await session.commit()
+    await gig_catalog.invalidate()
+    await session.refresh(gig)
     return gig
 
 @router.delete("/{id}")
-def delete_gig(
+async def delete_gig(
     id: UUID,
     current_user: User = Depends(deps.get_current_user),
-    session: Session = Depends(deps.get_session)
+    session: AsyncSession = Depends(deps.get_async_session)
 ):
-    gig = session.get(Gig, id)
+    gig = await session.get(Gig, id)
     if not gig:
         raise HTTPException(status_code=404, detail="Gig not found")
         
     if gig.freelancer_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not enough permissions")
         
-    session.delete(gig)
-    session.commit()
+    await session.delete(gig)
+    await session.commit()
+    await gig_catalog.invalidate()
     return {"ok": True}
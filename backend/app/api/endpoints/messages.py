@@ -1,14 +1,23 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect, Query
-from sqlmodel import Session, select, or_
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect, Query, Request, Response, status
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api import deps
+from app.core.pagination import paginate_union, set_next_cursor
+from app.core.serialization import wants_columnar
+from app.models.conversation import Conversation
 from app.models.message import Message
 from app.models.user import User
+from app.schemas.conversation import ConversationRead
 from app.schemas.message import MessageCreate, MessageRead
+from app.services import conversation_service, outbox
+from app.services.row_serializers import message_rows
+from app.websocket import protocol
 from app.websocket.connection_manager import manager
-from app.dependencies.auth import get_current_user
+from app.websocket.ingest import handle_frame
+from app.dependencies.auth import authenticate_websocket, get_current_user
 
 router = APIRouter()
 
@@ -18,16 +27,16 @@ router = APIRouter()
 async def send_message(
     message_in: MessageCreate,
     current_user: User = Depends(deps.get_current_user),
-    session: Session = Depends(deps.get_session)
+    session: AsyncSession = Depends(deps.get_async_session)
 ):
     """
     Send a message via REST API.
     1. Validates receiver exists.
-    2. Saves to DB.
-    3. Pushes to WebSocket if receiver is connected.
+    2. Saves to DB, with a `message.created` outbox event in the same transaction.
+    3. The outbox dispatcher pushes it to the receiver's sockets after the commit.
     """
     # Check if receiver exists
-    receiver = session.get(User, message_in.receiver_id)
+    receiver = await session.get(User, message_in.receiver_id)
     if not receiver:
         raise HTTPException(status_code=404, detail="Receiver not found")
 
@@ -39,74 +48,121 @@ async def send_message(
         order_id=message_in.order_id
     )
     session.add(message)
-    session.commit()
-    session.refresh(message)
+    # Flush first: the conversation row references the new message
+    await session.flush()
+    await conversation_service.record_message(session, message)
+    await outbox.record(session, [outbox.message_event(message)])
+    await session.commit()
+    await session.refresh(message)
+    return message
 
-    # Push to WebSocket if connected
-    # We send a JSON string representation or just the content. 
-    # For now sending raw content or a structured JSON string.
-    await manager.send_personal_message(
-        f"New message from {current_user.full_name}: {message.content}",
-        message.receiver_id
+@router.get("/conversations", response_model=List[ConversationRead])
+async def read_conversations(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(deps.get_current_user),
+    session: AsyncSession = Depends(deps.get_read_session),
+    limit: int = 20,
+    cursor: Optional[str] = None
+):
+    """
+    Inbox: the current user's conversations, most recently active first.
+    Served from the Conversation table, so the cost does not grow with message volume.
+    """
+    # A notes-to-self conversation has the user on both sides; only the first branch returns it
+    statement = paginate_union(
+        Conversation,
+        [
+            Conversation.user_a_id == current_user.id,
+            (Conversation.user_b_id == current_user.id) & (Conversation.user_a_id != current_user.id),
+        ],
+        limit, cursor=cursor, sort_key="last_message_at"
     )
+    conversations = (await session.exec(statement)).all()
+    set_next_cursor(request, response, conversations, limit, sort_key="last_message_at")
+    return [conversation_service.to_read(conversation, current_user.id) for conversation in conversations]
 
-    return message
+@router.post("/conversations/{user_id}/read", response_model=ConversationRead)
+async def mark_conversation_read(
+    user_id: UUID,  # The other user in the conversation
+    current_user: User = Depends(deps.get_current_user),
+    session: AsyncSession = Depends(deps.get_async_session)
+):
+    """
+    Resets the current user's unread counter for a conversation.
+    """
+    conversation = await conversation_service.mark_read(session, current_user.id, user_id)
+    if not conversation:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    return conversation_service.to_read(conversation, current_user.id)
 
 @router.get("/{user_id}", response_model=List[MessageRead])
-def get_chat_history(
+async def get_chat_history(
+    request: Request,
     user_id: UUID,  # The other user in the conversation
     current_user: User = Depends(deps.get_current_user),
-    session: Session = Depends(deps.get_session),
+    session: AsyncSession = Depends(deps.get_read_session),
     limit: int = 50,
-    skip: int = 0
+    skip: int = 0,
+    cursor: Optional[str] = None
 ):
     """
     Get conversation history between current user and another user.
+    Older pages are fetched with the cursor from the Link / X-Next-Cursor header.
     """
-    statement = select(Message).where(
-        or_(
-            (Message.sender_id == current_user.id) & (Message.receiver_id == user_id),
-            (Message.sender_id == user_id) & (Message.receiver_id == current_user.id)
-        )
-    ).order_by(Message.created_at.desc()).offset(skip).limit(limit)
+    # One index seek per direction of the conversation (a single one for notes-to-self)
+    directions = [(Message.sender_id == current_user.id) & (Message.receiver_id == user_id)]
+    if user_id != current_user.id:
+        directions.append((Message.sender_id == user_id) & (Message.receiver_id == current_user.id))
+    statement = paginate_union(Message, directions, limit, skip=skip, cursor=cursor, columns=message_rows.fields)
     
-    messages = session.exec(statement).all()
+    messages = (await session.exec(statement)).all()
     # Reverse to show chronological order if frontend expects it, 
     # but strictly speaking API returns what DB gives (descending here).
-    return messages
+    columnar = wants_columnar(request)
+    response = Response(content=message_rows.dump(messages, columnar), media_type=message_rows.media_type(columnar))
+    response.headers["Vary"] = "Accept"
+    set_next_cursor(request, response, messages, limit)
+    return response
 
 
 # --- WebSocket Endpoint ---
 
 @router.websocket("/ws/{user_id}")
-async def websocket_endpoint(
-    websocket: WebSocket, 
-    user_id: UUID,
-    session: Session = Depends(deps.get_session)
-):
+async def websocket_endpoint(websocket: WebSocket, user_id: UUID):
     """
     WebSocket endpoint for real-time messaging.
-    Note: Authentication for WebSockets is tricky with cookies/headers in standard Depends.
-    Here we assume the client connects and we trust the user_id path param matches the verified session 
-    or we implement a query param token check.
-    
-    For strict security, you should validate a token sent in query params: ws://.../ws?token=...
-    Implementation below is a basic structure.
+    Frames are JSON objects with a "type" (see app/websocket/protocol.py), or
+    msgpack when the client requests the "msgpack" subprotocol.
+
+    The handshake is authenticated with the `access_token` cookie or a
+    `?token=` query parameter, and the token must belong to `user_id`.
+    No database session is held while the socket is open; frames that need
+    the database open their own short-lived session.
     """
-    # In a real app, validate token here!
-    # token = websocket.query_params.get("token")
-    # user = verify_token(token)
-    
-    await manager.connect(websocket, user_id)
+    user = await authenticate_websocket(websocket)
+    if user is None or user.id != user_id:
+        # Rejects the handshake (HTTP 403) before the socket is accepted
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    codec = protocol.negotiate_codec(websocket.scope.get("subprotocols"))
+    connection = await manager.connect(websocket, user_id, codec=codec)
     try:
         while True:
-            data = await websocket.receive_text()
-            # Handle incoming WebSocket messages if any (e.g. typing indicators)
-            # Or simplified: Client sends message via REST POST, and receives via WS.
-            # If we want full WS chat:
-            # 1. Parse 'data' (JSON) containing content and receiver_id
-            # 2. Save to DB
-            # 3. manager.send_personal_message(...)
-            pass
+            event = await websocket.receive()
+            if event["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(event.get("code", 1000))
+            # Any inbound frame (including a heartbeat pong) proves the client is alive
+            connection.touch()
+            try:
+                frame = protocol.parse_inbound(codec.decode(event))
+            except (ValueError, TypeError):
+                connection.enqueue(protocol.encode(protocol.ErrorFrame(detail="Malformed frame")))
+                continue
+            await handle_frame(connection, user_id, frame)
     except WebSocketDisconnect:
-        manager.disconnect(user_id)
+        pass
+    finally:
+        # Also on unexpected errors, so a dead socket never stays registered
+        await manager.disconnect(connection)
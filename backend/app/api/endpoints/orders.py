@@ -1,28 +1,41 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Body, Request
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, HTTPException, Body, Query, Request, Response
+from sqlalchemy.orm import joinedload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.api import deps
+from app.core.conditional import (
+    PRIVATE_REVALIDATE, PRIVATE_VARY, etag_from_versions, is_not_modified, not_modified, set_validators,
+)
 from app.core.limiter import limiter
+from app.core.pagination import paginate_union, set_next_cursor
+from app.core.serialization import wants_columnar
 from app.models.order import Order, OrderStatus
 from app.models.gig import Gig
 from app.models.payment import PaymentProof
 from app.models.user import User
-from app.schemas.order import OrderCreate, OrderRead, PaymentProofCreate
-from app.services.order_service import change_order_status
+from app.schemas.order import (
+    BulkOrderTransition, BulkOrderTransitionRead, BulkPaymentConfirmation, OrderCreate, OrderExpandedRead,
+    OrderRead, PaymentProofCreate,
+)
+from app.services.order_service import (
+    TRANSITIONS, apply_bulk_transition, apply_transition, explain_conflict, to_expanded_read, try_transition,
+)
+from app.services.row_serializers import order_rows
 
 router = APIRouter()
 
 @router.post("/", response_model=OrderRead)
 @limiter.limit("5/minute")
-def create_order(
+async def create_order(
     request: Request,
     order_in: OrderCreate,
     current_user: User = Depends(deps.get_current_user),
-    session: Session = Depends(deps.get_session)
+    session: AsyncSession = Depends(deps.get_async_session)
 ):
     # Retrieve Gig to ensure it exists and get freelancer_id
-    gig = session.get(Gig, order_in.gig_id)
+    gig = await session.get(Gig, order_in.gig_id)
     if not gig:
         raise HTTPException(status_code=404, detail="Gig not found")
     
@@ -37,42 +50,114 @@ def create_order(
     )
     
     session.add(order)
-    session.commit()
-    session.refresh(order)
+    await session.commit()
+    await session.refresh(order)
     return order
 
 @router.get("/", response_model=List[OrderRead])
-def read_orders(
+async def read_orders(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: User = Depends(deps.get_current_user),
-    session: Session = Depends(deps.get_session)
+    session: AsyncSession = Depends(deps.get_read_session)
 ):
     # User can see orders where they are client OR freelancer
-    statement = select(Order).where(
-        (Order.client_id == current_user.id) | 
-        (Order.freelancer_id == current_user.id)
-    ).offset(skip).limit(limit)
-    orders = session.exec(statement).all()
-    return orders
+    sides = [Order.client_id == current_user.id, Order.freelancer_id == current_user.id]
+    columnar = wants_columnar(request)
+    vary = PRIVATE_VARY + ", Accept"
+
+    # A revalidation checks (id, updated_at) of the page and answers 304 without loading rows
+    if "if-none-match" in request.headers:
+        versions = (await session.exec(
+            paginate_union(Order, sides, limit, skip=skip, cursor=cursor, columns=["id", "created_at", "updated_at"])
+        )).all()
+        etag = etag_from_versions([(row.id, row.updated_at) for row in versions], skip, limit, cursor, columnar)
+        if is_not_modified(request, etag):
+            return not_modified(etag, cache_control=PRIVATE_REVALIDATE, vary=vary)
+
+    # OrderRead's columns as rows, serialized in one pass; the ETag comes from the same rows
+    statement = paginate_union(Order, sides, limit, skip=skip, cursor=cursor, columns=[*order_rows.fields, "updated_at"])
+    orders = (await session.exec(statement)).all()
+    etag = etag_from_versions([(row.id, row.updated_at) for row in orders], skip, limit, cursor, columnar)
+    response = Response(content=order_rows.dump(orders, columnar), media_type=order_rows.media_type(columnar))
+    set_validators(response, etag, cache_control=PRIVATE_REVALIDATE, vary=vary)
+    set_next_cursor(request, response, orders, limit)
+    return response
+
+@router.get("/expanded", response_model=List[OrderExpandedRead])
+async def read_orders_expanded(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    current_user: User = Depends(deps.get_current_user),
+    session: AsyncSession = Depends(deps.get_read_session)
+):
+    """
+    Order dashboard: each order with its gig, the other party and the payment
+    proof. Two statements whatever the page size: the page of ids, then the
+    orders with their relations joined in.
+    """
+    sides = [Order.client_id == current_user.id, Order.freelancer_id == current_user.id]
+    page = (await session.exec(
+        paginate_union(Order, sides, limit, skip=skip, cursor=cursor, columns=["id", "created_at"])
+    )).all()
+    set_next_cursor(request, response, page, limit)
+    if not page:
+        return []
+
+    statement = select(Order).where(Order.id.in_([row.id for row in page])).options(
+        joinedload(Order.gig),
+        joinedload(Order.client),
+        joinedload(Order.freelancer),
+        joinedload(Order.payment_proof),
+    )
+    orders = {order.id: order for order in (await session.exec(statement)).all()}
+    return [to_expanded_read(orders[row.id], current_user.id) for row in page]
+
+async def bulk_transition(session: AsyncSession, order_ids: List[UUID], target: str, user_id: UUID) -> BulkOrderTransitionRead:
+    results = await apply_bulk_transition(session, order_ids, target, user_id)
+    return BulkOrderTransitionRead(
+        status=target,
+        updated=sum(result.outcome == "updated" for result in results),
+        results=results,
+    )
+
+@router.post("/bulk/transition", response_model=BulkOrderTransitionRead)
+async def transition_orders(
+    body: BulkOrderTransition,
+    current_user: User = Depends(deps.get_current_user),
+    session: AsyncSession = Depends(deps.get_async_session)
+):
+    """Moves many orders to one status in a single transaction, with a result per order."""
+    return await bulk_transition(session, body.order_ids, body.status, current_user.id)
+
+@router.post("/bulk/confirm-payment", response_model=BulkOrderTransitionRead)
+async def confirm_payments(
+    body: BulkPaymentConfirmation,
+    current_user: User = Depends(deps.get_current_user),
+    session: AsyncSession = Depends(deps.get_async_session)
+):
+    return await bulk_transition(session, body.order_ids, OrderStatus.PAYMENT_CONFIRMED, current_user.id)
 
 @router.patch("/{id}/submit-payment", response_model=OrderRead)
 @limiter.limit("10/minute")
-def submit_payment(
+async def submit_payment(
     request: Request,
     id: UUID,
     payment_proof_in: PaymentProofCreate,
+    version: Optional[int] = Query(None, description="Fail with 409 unless the order is still at this version"),
     current_user: User = Depends(deps.get_current_user),
-    session: Session = Depends(deps.get_session)
+    session: AsyncSession = Depends(deps.get_async_session)
 ):
-    order = session.get(Order, id)
-    if not order:
-        raise HTTPException(status_code=404, detail="Order not found")
-        
-    if order.client_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
-    # Create Payment Proof
+    order = await try_transition(session, id, "submit-payment", current_user.id, version)
+    if order is None:
+        return await explain_conflict(session, id, "submit-payment", current_user.id, version)
+
+    # Recorded in the same transaction as the status change
     payment_proof = PaymentProof(
         order_id=order.id,
         user_id=current_user.id,
@@ -81,73 +166,23 @@ def submit_payment(
         amount=payment_proof_in.amount
     )
     session.add(payment_proof)
-    
-    # Use Service to update status
-    updated_order = change_order_status(session, order, OrderStatus.PAYMENT_SUBMITTED)
-    return updated_order
+    await session.commit()
+    return order
 
-@router.patch("/{id}/confirm-payment", response_model=OrderRead)
-def confirm_payment(
-    id: UUID,
-    current_user: User = Depends(deps.get_current_user),
-    session: Session = Depends(deps.get_session)
-):
-    order = session.get(Order, id)
-    if not order:
-        raise HTTPException(status_code=404, detail="Order not found")
-        
-    if order.freelancer_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Only freelancer can confirm payment")
-
-    # Update Payment Proof verified status? Maybe in service or separate.
-    # For now, just change order status.
-    updated_order = change_order_status(session, order, OrderStatus.PAYMENT_CONFIRMED)
-    return updated_order
-
-@router.patch("/{id}/submit-work", response_model=OrderRead)
-def submit_work(
-    id: UUID,
-    current_user: User = Depends(deps.get_current_user),
-    session: Session = Depends(deps.get_session)
-):
-    order = session.get(Order, id)
-    if not order:
-        raise HTTPException(status_code=404, detail="Order not found")
-        
-    if order.freelancer_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
-    updated_order = change_order_status(session, order, OrderStatus.SUBMITTED)
-    return updated_order
-
-@router.patch("/{id}/approve", response_model=OrderRead)
-def approve_work(
-    id: UUID,
-    current_user: User = Depends(deps.get_current_user),
-    session: Session = Depends(deps.get_session)
-):
-    order = session.get(Order, id)
-    if not order:
-        raise HTTPException(status_code=404, detail="Order not found")
-        
-    if order.client_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
-    updated_order = change_order_status(session, order, OrderStatus.COMPLETED)
-    return updated_order
-
-@router.patch("/{id}/revision", response_model=OrderRead)
-def request_revision(
-    id: UUID, 
-    current_user: User = Depends(deps.get_current_user),
-    session: Session = Depends(deps.get_session)
-):
-    order = session.get(Order, id)
-    if not order:
-        raise HTTPException(status_code=404, detail="Order not found")
-        
-    if order.client_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
-    updated_order = change_order_status(session, order, OrderStatus.REVISION_REQUESTED)
-    return updated_order
+def register_transition(action: str):
+    """Adds PATCH /{id}/<action> for an entry of the order state machine."""
+    async def transition_order(
+        id: UUID,
+        version: Optional[int] = Query(None, description="Fail with 409 unless the order is still at this version"),
+        current_user: User = Depends(deps.get_current_user),
+        session: AsyncSession = Depends(deps.get_async_session)
+    ):
+        return await apply_transition(session, id, action, current_user.id, version)
+
+    transition_order.__name__ = action.replace("-", "_")
+    router.add_api_route(f"/{{id}}/{action}", transition_order, methods=["PATCH"], response_model=OrderRead)
+
+# submit-payment carries a body and its own rate limit (above); every other action is table-driven
+for action in TRANSITIONS:
+    if action != "submit-payment":
+        register_transition(action)
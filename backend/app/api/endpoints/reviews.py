@@ -1,21 +1,26 @@
+from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.api import deps
+from app.schemas.rating import RatingSummaryRead
 from app.schemas.review import ReviewCreate, ReviewRead
 from app.models.review import Review
 from app.models.order import Order, OrderStatus
+from app.models.rating import UserRatingSummary
 from app.models.user import User
+from app.services import outbox, rating_service
 
 router = APIRouter()
 
 @router.post("/", response_model=ReviewRead)
-def create_review(
+async def create_review(
     review_in: ReviewCreate,
     current_user: User = Depends(deps.get_current_user),
-    session: Session = Depends(deps.get_session)
+    session: AsyncSession = Depends(deps.get_async_session)
 ):
     # 1. Fetch Order
-    order = session.get(Order, review_in.order_id)
+    order = await session.get(Order, review_in.order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     
@@ -36,12 +41,12 @@ def create_review(
     
     # 4. Duplicate Check
     # Check if this user has already reviewed this order
-    existing_review = session.exec(
+    existing_review = (await session.exec(
         select(Review).where(
             Review.order_id == order.id,
             Review.reviewer_id == reviewer_id
         )
-    ).first()
+    )).first()
     
     if existing_review:
         raise HTTPException(status_code=400, detail="You have already reviewed this order")
@@ -56,6 +61,20 @@ def create_review(
     )
     
     session.add(review)
-    session.commit()
-    session.refresh(review)
+    # Same transaction as the review: the summary can never drift from the rows
+    await rating_service.record_review(session, reviewee_id, review.rating)
+    await outbox.record(session, [outbox.new_event(
+        "review", review.id, outbox.REVIEW_CREATED, ReviewRead.model_validate(review), [reviewee_id]
+    )])
+    await session.commit()
+    await session.refresh(review)
     return review
+
+@router.get("/summary/{user_id}", response_model=RatingSummaryRead)
+async def read_rating_summary(
+    user_id: UUID,
+    session: AsyncSession = Depends(deps.get_read_session)
+):
+    """Review count, average and star histogram of the reviews a user has received."""
+    summary = await session.get(UserRatingSummary, user_id)
+    return rating_service.to_read(user_id, summary)
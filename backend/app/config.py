@@ -3,9 +3,108 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+
+def env_bool(name: str, default: bool = False) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
 class Settings:
     DATABASE_URL = os.getenv("DATABASE_URL")
+    # Optional explicit URL for the async engine (e.g. postgresql+asyncpg://...).
+    # When unset it is derived from DATABASE_URL by swapping in the async driver.
+    ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+    # Comma-separated read replicas (sync URLs like DATABASE_URL; the async driver is swapped in).
+    # Safe GET handlers read from them round-robin, except within READ_YOUR_WRITES_SECONDS
+    # of the client's last write, when they read from the primary.
+    DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+    READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "10"))
     SECRET_KEY = os.getenv("SECRET_KEY", "changethis_secret_key_to_match_nextjs")
+    # Comma-separated browser origins allowed by CORS; cookie-authenticated WebSocket
+    # handshakes are only accepted from these origins as well
+    CORS_ALLOWED_ORIGINS = [
+        origin.strip()
+        for origin in os.getenv("CORS_ALLOWED_ORIGINS", "http://localhost:3000,http://127.0.0.1:3000").split(",")
+        if origin.strip()
+    ]
     ALGORITHM = os.getenv("ALGORITHM", "HS256")
 
+    # Authenticated principal cache (per worker). Entries never outlive the token's exp.
+    AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+    AUTH_CACHE_MAX_SIZE = int(os.getenv("AUTH_CACHE_MAX_SIZE", "10000"))
+    # Build the principal from JWT claims only, skipping the User lookup entirely
+    AUTH_PRINCIPAL_FROM_CLAIMS = env_bool("AUTH_PRINCIPAL_FROM_CLAIMS", False)
+
+    # WebSocket fan-out between workers: memory:// (single worker) or redis://host:port/db
+    WS_BACKPLANE_URL = os.getenv("WS_BACKPLANE_URL", "memory://")
+    # Per-socket outbound queue; on overflow: drop_oldest, drop_newest or close
+    WS_QUEUE_SIZE = int(os.getenv("WS_QUEUE_SIZE", "100"))
+    WS_OVERFLOW_POLICY = os.getenv("WS_OVERFLOW_POLICY", "drop_oldest")
+    WS_SEND_TIMEOUT = float(os.getenv("WS_SEND_TIMEOUT", "10"))
+    # Ping interval and the silence after which a socket is reaped (0 disables heartbeats)
+    WS_HEARTBEAT_INTERVAL = float(os.getenv("WS_HEARTBEAT_INTERVAL", "25"))
+    WS_HEARTBEAT_TIMEOUT = float(os.getenv("WS_HEARTBEAT_TIMEOUT", "60"))
+    # Messages sent over WebSockets are written in batches of up to N, or after the delay
+    WS_INGEST_BATCH_SIZE = int(os.getenv("WS_INGEST_BATCH_SIZE", "100"))
+    WS_INGEST_MAX_DELAY_MS = float(os.getenv("WS_INGEST_MAX_DELAY_MS", "10"))
+    WS_INGEST_QUEUE_SIZE = int(os.getenv("WS_INGEST_QUEUE_SIZE", "10000"))
+
+    # Transactional outbox: events are written with the change and delivered by a background dispatcher
+    OUTBOX_DISPATCHER_ENABLED = env_bool("OUTBOX_DISPATCHER_ENABLED", True)
+    OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "100"))
+    OUTBOX_POLL_INTERVAL_MS = float(os.getenv("OUTBOX_POLL_INTERVAL_MS", "500"))
+    # Failed deliveries back off exponentially from the base up to the max, then are given up on
+    OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "10"))
+    OUTBOX_RETRY_BASE_SECONDS = float(os.getenv("OUTBOX_RETRY_BASE_SECONDS", "1"))
+    OUTBOX_RETRY_MAX_SECONDS = float(os.getenv("OUTBOX_RETRY_MAX_SECONDS", "300"))
+    # Delivered events are deleted after this long (0 keeps them)
+    OUTBOX_RETENTION_HOURS = float(os.getenv("OUTBOX_RETENTION_HOURS", "24"))
+
+    # Rate limit counters: memory:// (per worker) or redis://host:port/db (shared between workers)
+    RATE_LIMIT_STORAGE_URL = os.getenv("RATE_LIMIT_STORAGE_URL", "memory://")
+    # sliding-window-counter (constant memory per key), moving-window (exact) or fixed-window
+    RATE_LIMIT_STRATEGY = os.getenv("RATE_LIMIT_STRATEGY", "sliding-window-counter")
+
+    # Read-through cache for the public gig catalog: memory:// (per worker) or redis://host:port/db
+    CACHE_URL = os.getenv("CACHE_URL", "memory://")
+    # 0 disables the catalog cache
+    CATALOG_CACHE_TTL_SECONDS = float(os.getenv("CATALOG_CACHE_TTL_SECONDS", "30"))
+    CATALOG_CACHE_MAX_SIZE = int(os.getenv("CATALOG_CACHE_MAX_SIZE", "1000"))
+
+    # Rows fetched per round trip (and held in memory) by streaming exports
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+    # Request metrics on /metrics (Prometheus text format) and optional Server-Timing headers
+    METRICS_ENABLED = env_bool("METRICS_ENABLED", True)
+    # Bearer token required by /metrics and the /health/* stats; unset, those endpoints are off.
+    # /health/live and /health/ready stay public for the load balancer.
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+    SERVER_TIMING_ENABLED = env_bool("SERVER_TIMING_ENABLED", False)
+    # Statements at least this slow are logged to the app.slow_query logger (0 disables)
+    SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+
+    # Engine / connection pool tuning (applied per engine, i.e. per worker process)
+    DB_ECHO = env_bool("DB_ECHO", False)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    # Off by default: it costs a round trip on every checkout, and DB_POOL_RECYCLE already
+    # retires connections before typical server/proxy idle timeouts. Enable it when
+    # something drops idle connections sooner (an aggressive firewall or load balancer).
+    DB_POOL_PRE_PING = env_bool("DB_POOL_PRE_PING", False)
+    # Server-side statement timeout in milliseconds (Postgres only, 0 disables)
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+    # Set when connecting through PgBouncer in transaction pooling mode
+    DB_PGBOUNCER = env_bool("DB_PGBOUNCER", False)
+
+    # The schema comes from `alembic upgrade head`; creating tables on startup is a local-development shortcut
+    DB_CREATE_ALL = env_bool("DB_CREATE_ALL", False)
+    # The first successful /health/ready probe opens this many pooled connections
+    # and replays these GET paths in-process, so caches are hot before traffic arrives
+    READINESS_WARM_CONNECTIONS = int(os.getenv("READINESS_WARM_CONNECTIONS", "2"))
+    READINESS_WARM_PATHS = [path.strip() for path in os.getenv("READINESS_WARM_PATHS", "/api/v1/gigs/").split(",") if path.strip()]
+
 settings = Settings()
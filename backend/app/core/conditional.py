@@ -0,0 +1,106 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Iterable, Optional
+from fastapi import Request, Response
+
+# Cache-Control per kind of route. Public catalog data may be reused briefly by
+# browsers and shared caches; per-user data must always be revalidated, which
+# is cheap because an unchanged resource answers 304 with no body.
+PUBLIC_CATALOG = "public, max-age=15"
+PRIVATE_REVALIDATE = "private, no-cache"
+
+# Per-user responses differ by credentials
+PRIVATE_VARY = "Cookie, Authorization"
+
+
+def etag_from_body(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_from_versions(*parts: Iterable[Any]) -> str:
+    """Strong ETag from row identities and versions, e.g. [(id, updated_at), ...]."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(repr(part).encode())
+        digest.update(b"\0")
+    return '"' + digest.hexdigest()[:32] + '"'
+
+
+def http_date(value: datetime) -> str:
+    # Naive datetimes in this codebase are UTC (datetime.utcnow)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def is_not_modified(request: Request, etag: Optional[str], last_modified: Optional[datetime] = None) -> bool:
+    """
+    Evaluates If-None-Match, or If-Modified-Since when no If-None-Match is sent
+    (RFC 9110 section 13.2.2). A GET compares ETags weakly.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if etag is None:
+            return False
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        modified = last_modified if last_modified.tzinfo else last_modified.replace(tzinfo=timezone.utc)
+        # HTTP dates have one-second resolution
+        return modified.replace(microsecond=0) <= since
+    return False
+
+
+def set_validators(
+    response: Response,
+    etag: Optional[str],
+    last_modified: Optional[datetime] = None,
+    cache_control: Optional[str] = None,
+    vary: Optional[str] = None,
+):
+    if etag:
+        response.headers["ETag"] = etag
+    if last_modified is not None:
+        response.headers["Last-Modified"] = http_date(last_modified)
+    if cache_control:
+        response.headers["Cache-Control"] = cache_control
+    if vary:
+        response.headers["Vary"] = vary
+
+
+def not_modified(
+    etag: Optional[str],
+    last_modified: Optional[datetime] = None,
+    cache_control: Optional[str] = None,
+    vary: Optional[str] = None,
+) -> Response:
+    response = Response(status_code=304)
+    set_validators(response, etag, last_modified, cache_control, vary)
+    return response
+
+
+def conditional_json(
+    request: Request,
+    body: bytes,
+    etag: Optional[str] = None,
+    last_modified: Optional[datetime] = None,
+    cache_control: Optional[str] = None,
+    vary: Optional[str] = None,
+    media_type: str = "application/json",
+) -> Response:
+    """A pre-serialized JSON response, or 304 when the client's copy is current."""
+    etag = etag or etag_from_body(body)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified, cache_control, vary)
+    response = Response(content=body, media_type=media_type)
+    set_validators(response, etag, last_modified, cache_control, vary)
+    return response
@@ -1,4 +1,85 @@
-from slowapi import Limiter
+import logging
+from typing import Any, Dict, Optional
+from fastapi import Request
+from slowapi import Limiter, _rate_limit_exceeded_handler
+from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
+from app.config import settings
+from app.core import metrics, principal_cache
+from app.core.security import token_from_request
 
-limiter = Limiter(key_func=get_remote_address)
+logger = logging.getLogger(__name__)
+
+
+def rate_limit_key(request: Request) -> str:
+    """
+    One bucket per authenticated user, so users behind a shared NAT do not
+    throttle each other; anonymous requests fall back to the client address.
+    The token is verified through the memoized decode, never the database.
+    """
+    token = token_from_request(request)
+    if token:
+        payload = principal_cache.decode_token(token)
+        if payload is not None and payload.get("sub"):
+            return f"user:{payload['sub']}"
+    return f"ip:{get_remote_address(request)}"
+
+
+# Counters live in RATE_LIMIT_STORAGE_URL: memory:// enforces limits per worker,
+# redis://host:port/db shares them between workers (atomic server-side scripts).
+# If the shared storage is unreachable, limits are enforced per worker in memory
+# until it recovers rather than failing requests.
+limiter = Limiter(
+    key_func=rate_limit_key,
+    storage_uri=settings.RATE_LIMIT_STORAGE_URL,
+    strategy=settings.RATE_LIMIT_STRATEGY,
+    in_memory_fallback_enabled=True,
+    key_prefix="devmart",
+)
+
+
+REJECTIONS = metrics.Counter(
+    "devmart_rate_limit_rejected", "Requests rejected with 429, by route template and kind of key (user / ip)",
+    ("route", "key_kind"),
+)
+
+
+class RateLimitStats:
+    def __init__(self):
+        self.rejected = 0
+        # Rejections per route and per kind of key (user / ip)
+        self.rejected_by_route: Dict[str, int] = {}
+        self.rejected_by_key_kind: Dict[str, int] = {}
+
+    def record(self, route: str, key: str):
+        self.rejected += 1
+        self.rejected_by_route[route] = self.rejected_by_route.get(route, 0) + 1
+        kind = key.partition(":")[0]
+        self.rejected_by_key_kind[kind] = self.rejected_by_key_kind.get(kind, 0) + 1
+        REJECTIONS.inc(route, kind)
+
+    def gauges(self) -> Dict[str, Any]:
+        """For /metrics; rejections are exported by the labelled REJECTIONS counter."""
+        return {"using_fallback": bool(getattr(limiter, "_storage_dead", False))}
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "storage": settings.RATE_LIMIT_STORAGE_URL.partition("://")[0],
+            "strategy": settings.RATE_LIMIT_STRATEGY,
+            # True while the shared storage is down and limits are per worker
+            "using_fallback": bool(getattr(limiter, "_storage_dead", False)),
+            "rejected": self.rejected,
+            "rejected_by_route": dict(self.rejected_by_route),
+            "rejected_by_key_kind": dict(self.rejected_by_key_kind),
+        }
+
+
+stats = RateLimitStats()
+
+
+def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
+    """slowapi's 429 response, counted per route and key kind."""
+    route = request.scope.get("route")
+    # The route template (never the raw path, which would give a series per id)
+    stats.record(getattr(route, "path", "unmatched"), rate_limit_key(request))
+    return _rate_limit_exceeded_handler(request, exc)
@@ -0,0 +1,298 @@
+import logging
+import math
+import re
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import event
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger("app.slow_query")
+
+# Latency buckets in seconds, tuned for API calls (5 ms .. 10 s)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+# A single invalid name makes Prometheus reject the whole exposition
+METRIC_NAME = re.compile(r"[a-zA-Z_:][a-zA-Z0-9_:]*")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """One metric family with a fixed set of label names (Prometheus text format)."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(f"{name}{labels} {_format_value(value)}" for name, labels, value in self.samples())
+        return lines
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = list(self._values.items())
+        return [(f"{self.name}_total", _format_labels(self.labelnames, labels), value) for labels, value in values]
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels: str, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+    def samples(self):
+        with self._lock:
+            values = list(self._values.items())
+        return [(self.name, _format_labels(self.labelnames, labels), value) for labels, value in values]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # Per label set: non-cumulative bucket counts, then sum and count
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *labels: str):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def samples(self):
+        with self._lock:
+            series = [(labels, list(values)) for labels, values in self._series.items()]
+        samples = []
+        for labels, values in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                samples.append((f"{self.name}_bucket", _format_labels(self.labelnames, labels, le), cumulative))
+            samples.append((f"{self.name}_sum", _format_labels(self.labelnames, labels), values[-2]))
+            samples.append((f"{self.name}_count", _format_labels(self.labelnames, labels), values[-1]))
+        return samples
+
+
+REGISTRY: List[Metric] = []
+
+# Existing per-subsystem stats (pool, cache, sockets, outbox, rate limits) exported as gauges
+_collectors: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+
+def register_collector(prefix: str, collect: Callable[[], Dict[str, Any]]):
+    """
+    Exposes the numeric values of `collect()` (nested dicts flattened) as
+    devmart_<prefix>_<key> gauges. Keys must be fixed identifiers: anything
+    data-dependent (routes, ids) belongs in a labelled Counter or Gauge instead.
+    """
+    _collectors[prefix] = collect
+
+
+def _flatten(prefix: str, values: Dict[str, Any]):
+    for key, value in values.items():
+        name = f"{prefix}_{key}".replace("-", "_").replace(".", "_")
+        if not METRIC_NAME.fullmatch(name):
+            logger.debug("Skipping metric with invalid name %r", name)
+            continue
+        if isinstance(value, dict):
+            yield from _flatten(name, value)
+        elif isinstance(value, (int, float)):
+            yield name, float(value)
+
+
+def render() -> str:
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    for prefix, collect in _collectors.items():
+        try:
+            values = collect()
+        except Exception:
+            logger.exception("Metrics collector %s failed", prefix)
+            continue
+        for name, value in _flatten(f"devmart_{prefix}", values):
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+# --- Request metrics ---
+
+REQUEST_LATENCY = Histogram(
+    "devmart_http_request_duration_seconds", "HTTP request latency by route template",
+    ("method", "route", "status"),
+)
+REQUESTS_IN_FLIGHT = Gauge("devmart_http_requests_in_flight", "HTTP requests currently being served")
+RESPONSE_SIZE = Histogram(
+    "devmart_http_response_size_bytes", "HTTP response body size", ("method", "route"), buckets=SIZE_BUCKETS,
+)
+REQUEST_QUERIES = Histogram(
+    "devmart_http_request_db_queries", "SQL statements executed per HTTP request", ("method", "route"),
+    buckets=QUERY_COUNT_BUCKETS,
+)
+REQUEST_DB_TIME = Histogram(
+    "devmart_http_request_db_duration_seconds", "Time spent in SQL per HTTP request", ("method", "route"),
+)
+QUERY_LATENCY = Histogram("devmart_db_query_duration_seconds", "SQL statement latency", ("engine",))
+SLOW_QUERIES = Counter("devmart_db_slow_queries", "SQL statements slower than SLOW_QUERY_THRESHOLD_MS", ("engine",))
+
+
+class RequestTimings:
+    """SQL work attributed to the current request."""
+
+    __slots__ = ("scope", "queries", "db_seconds")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.queries = 0
+        self.db_seconds = 0.0
+
+    @property
+    def route(self) -> str:
+        # The router records the matched route in the (shared) scope
+        return _route(self.scope)
+
+
+current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("current_timings", default=None)
+
+
+def instrument_engine(engine, name: str):
+    """Times every statement of a (sync or async) engine and logs slow ones."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _finish(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        QUERY_LATENCY.observe(elapsed, name)
+        timings = current_timings.get()
+        if timings is not None:
+            timings.queries += 1
+            timings.db_seconds += elapsed
+        threshold = settings.SLOW_QUERY_THRESHOLD_MS
+        if threshold > 0 and elapsed * 1000 >= threshold:
+            SLOW_QUERIES.inc(name)
+            slow_query_logger.warning(
+                "%.1f ms on %s (%s): %s", elapsed * 1000, name,
+                timings.route if timings is not None else "background", " ".join(statement.split())[:1000],
+            )
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _failed(context):
+        # The statement raised: drop its start time so the stack stays balanced
+        starts = context.connection.info.get("query_start") if context.connection is not None else None
+        if starts:
+            starts.pop()
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency, in-flight requests, response size and
+    per-request SQL counts by route template (never the raw path, which would
+    give a series per id). Adds a Server-Timing header when SERVER_TIMING_ENABLED is set.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        timings = RequestTimings(scope)
+        token = current_timings.set(timings)
+        server_timing = settings.SERVER_TIMING_ENABLED
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if server_timing:
+                    total = (time.perf_counter() - start) * 1000
+                    value = (f'db;dur={timings.db_seconds * 1000:.1f};desc="{timings.queries} queries", '
+                             f"app;dur={total:.1f}")
+                    message = {**message, "headers": [*message.get("headers", []), (b"server-timing", value.encode())]}
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            current_timings.reset(token)
+            method, route = scope["method"], _route(scope)
+            REQUEST_LATENCY.observe(time.perf_counter() - start, method, route, str(status))
+            RESPONSE_SIZE.observe(size, method, route)
+            REQUEST_QUERIES.observe(timings.queries, method, route)
+            REQUEST_DB_TIME.observe(timings.db_seconds, method, route)
+
+
+def _route(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
@@ -0,0 +1,97 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence, Tuple
+from uuid import UUID
+from fastapi import HTTPException, Request, Response
+from sqlalchemy.orm import aliased
+from sqlmodel import select, tuple_, union_all
+
+# Keyset (cursor) pagination over (sort column, id), newest first. The sort
+# column is `created_at` unless a listing orders by something else (e.g. the
+# inbox by `last_message_at`). The cursor is opaque to clients: urlsafe base64
+# of the last row's sort key.
+
+
+def encode_cursor(sort_value: datetime, id: UUID) -> str:
+    raw = json.dumps([sort_value.isoformat(), str(id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(sort_value), UUID(id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+def paginate(query, model, limit: int, skip: int = 0, cursor: Optional[str] = None, sort_key: str = "created_at"):
+    """
+    Orders `query` newest first and applies either keyset pagination (when a
+    cursor is given) or the legacy offset pagination. Both modes share the same
+    (sort_key, id) ordering, which the models' composite indexes cover.
+    """
+    sort_column = getattr(model, sort_key)
+    query = query.order_by(sort_column.desc(), model.id.desc())
+    if cursor:
+        sort_value, id = decode_cursor(cursor)
+        query = query.where(tuple_(sort_column, model.id) < tuple_(sort_value, id))
+    elif skip:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+
+def paginate_union(
+    model,
+    conditions: Sequence[Any],
+    limit: int,
+    skip: int = 0,
+    cursor: Optional[str] = None,
+    sort_key: str = "created_at",
+    columns: Optional[Sequence[str]] = None,
+):
+    """
+    Pages over an OR of predicates as a UNION ALL of per-predicate queries.
+    Each branch is an ordered index range scan that stops after one page, so
+    the database never sorts the full set of matches the way an OR would.
+
+    With `columns`, only those columns are selected (rows instead of models).
+    """
+    per_branch = limit if cursor else skip + limit
+    entities = [getattr(model, name) for name in columns] if columns else [model]
+    branches = [
+        select(paginate(select(*entities).where(condition), model, per_branch, cursor=cursor, sort_key=sort_key).subquery())
+        for condition in conditions
+    ]
+    merged_rows = union_all(*branches).subquery()
+    if columns:
+        query = select(*merged_rows.c).order_by(merged_rows.c[sort_key].desc(), merged_rows.c.id.desc())
+    else:
+        merged = aliased(model, merged_rows)
+        query = select(merged).order_by(getattr(merged, sort_key).desc(), merged.id.desc())
+    if skip and not cursor:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+
+def set_next_cursor(
+    request: Request, response: Response, items: Sequence[Any], limit: int, sort_key: str = "created_at"
+) -> Optional[str]:
+    """
+    Advertises the next page through a `Link: <...>; rel="next"` header (and
+    `X-Next-Cursor`) so list bodies keep their existing shape. Returns the cursor.
+    """
+    if limit <= 0 or len(items) < limit:
+        return None
+    last = items[-1]
+    cursor = encode_cursor(getattr(last, sort_key), last.id)
+    link_next_page(request, response, cursor, limit)
+    return cursor
+
+
+def link_next_page(request: Request, response: Response, cursor: str, limit: int):
+    next_url = request.url.remove_query_params("skip").include_query_params(cursor=cursor, limit=limit)
+    response.headers["Link"] = f'<{next_url}>; rel="next"'
+    response.headers["X-Next-Cursor"] = cursor
@@ -0,0 +1,138 @@
+import time
+from typing import Any, Dict, Optional, Union
+from uuid import uuid4
+from sqlalchemy import exc
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.config import settings
+
+
+class PoolMetrics:
+    """
+    Cumulative checkout statistics for one connection pool.
+    Live gauges (checked out, overflow) are read from the pool itself.
+    """
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def observe_wait(self, seconds: float):
+        self.checkouts += 1
+        self.wait_seconds_total += seconds
+        if seconds > self.wait_seconds_max:
+            self.wait_seconds_max = seconds
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_seconds_total": round(self.wait_seconds_total, 6),
+            "wait_seconds_max": round(self.wait_seconds_max, 6),
+            "wait_seconds_avg": round(self.wait_seconds_total / self.checkouts, 6) if self.checkouts else 0.0,
+        }
+
+
+class _MeteredPoolMixin:
+    """Times how long callers wait in `_do_get` for a connection."""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.observe_wait(time.perf_counter() - start)
+
+    def recreate(self):
+        # engine.dispose() builds a fresh pool; keep accumulating into the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class MeteredQueuePool(_MeteredPoolMixin, QueuePool):
+    pass
+
+
+class MeteredAsyncQueuePool(_MeteredPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def engine_options(url: Union[str, URL], is_async: bool = False) -> Dict[str, Any]:
+    """
+    Builds create_engine/create_async_engine keyword arguments from Settings.
+    SQLite keeps SQLAlchemy's default pool; sizing options only apply to server databases.
+    """
+    backend = make_url(url).get_backend_name()
+    options: Dict[str, Any] = {
+        "echo": settings.DB_ECHO,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if backend == "sqlite":
+        return options
+
+    options.update(
+        poolclass=MeteredAsyncQueuePool if is_async else MeteredQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+
+    connect_args: Dict[str, Any] = {}
+    if backend == "postgresql":
+        if settings.DB_PGBOUNCER:
+            # Transaction pooling hands each transaction to a different server
+            # connection, so named prepared statements must not be reused.
+            # Startup parameters are rejected by PgBouncer as well, so the
+            # statement timeout has to be configured on the role instead.
+            if is_async:
+                connect_args.update(
+                    statement_cache_size=0,
+                    prepared_statement_cache_size=0,
+                    prepared_statement_name_func=lambda: f"__asyncpg_{uuid4()}__",
+                )
+        elif settings.DB_STATEMENT_TIMEOUT_MS > 0:
+            timeout = str(settings.DB_STATEMENT_TIMEOUT_MS)
+            if is_async:
+                connect_args["server_settings"] = {"statement_timeout": timeout}
+            else:
+                connect_args["options"] = f"-c statement_timeout={timeout}"
+    if connect_args:
+        options["connect_args"] = connect_args
+    return options
+
+
+def attach_metrics(engine) -> Optional[PoolMetrics]:
+    """Binds a PoolMetrics instance to a (sync or async) engine's metered pool."""
+    pool = getattr(engine, "sync_engine", engine).pool
+    if not isinstance(pool, _MeteredPoolMixin):
+        return None
+    pool.metrics = PoolMetrics()
+    return pool.metrics
+
+
+def pool_status(engine) -> Dict[str, Any]:
+    """Live snapshot of an engine's pool: occupancy gauges plus checkout wait statistics."""
+    pool = getattr(engine, "sync_engine", engine).pool
+    status: Dict[str, Any] = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            # QueuePool counts overflow from -pool_size until the pool is full
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+        )
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        status.update(metrics.as_dict())
+    return status
@@ -0,0 +1,95 @@
+import hashlib
+import time
+from typing import Any, Dict, Optional
+from uuid import UUID
+from sqlalchemy import event
+from sqlalchemy.orm import make_transient_to_detached
+from app.config import settings
+from app.core.cache import TTLCache
+from app.core.security import verify_jwt
+from app.models.user import User
+
+# Verified JWT payloads keyed by token hash, so repeat requests skip the signature check
+_decoded_tokens = TTLCache(settings.AUTH_CACHE_MAX_SIZE, settings.AUTH_CACHE_TTL_SECONDS)
+
+# User column snapshots keyed by (sub, token hash)
+_principals = TTLCache(settings.AUTH_CACHE_MAX_SIZE, settings.AUTH_CACHE_TTL_SECONDS)
+
+
+def token_hash(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _seconds_until_expiry(payload: Dict[str, Any]) -> Optional[float]:
+    exp = payload.get("exp")
+    if exp is None:
+        return None
+    return float(exp) - time.time()
+
+
+def decode_token(token: str) -> Optional[dict]:
+    """
+    Memoized `verify_jwt`. A cached payload never outlives the token's own `exp`.
+    Invalid tokens are not cached.
+    """
+    key = token_hash(token)
+    payload = _decoded_tokens.get(key)
+    if payload is not None:
+        return payload
+
+    payload = verify_jwt(token)
+    if payload is not None:
+        _decoded_tokens.set(key, payload, ttl=_seconds_until_expiry(payload))
+    return payload
+
+
+def _detached_user(data: Dict[str, Any]) -> User:
+    # A fresh instance per request so callers never share mutable state; marking it
+    # detached (not transient) means session.add() would UPDATE rather than INSERT.
+    user = User(**data)
+    make_transient_to_detached(user)
+    return user
+
+
+def get_principal(sub: str, token: str) -> Optional[User]:
+    data = _principals.get((sub, token_hash(token)))
+    if data is None:
+        return None
+    return _detached_user(data)
+
+
+def cache_principal(sub: str, token: str, user: User, payload: Dict[str, Any]):
+    _principals.set((sub, token_hash(token)), user.model_dump(), ttl=_seconds_until_expiry(payload))
+
+
+def principal_from_claims(user_id: UUID, payload: Dict[str, Any]) -> User:
+    """
+    Lightweight principal built from token claims alone (AUTH_PRINCIPAL_FROM_CLAIMS).
+    Only `id` is guaranteed; profile fields are filled from optional claims.
+    """
+    return _detached_user({
+        "id": user_id,
+        "email": payload.get("email", ""),
+        "full_name": payload.get("name", ""),
+        "hashed_password": "",
+        "is_admin": bool(payload.get("is_admin", False)),
+    })
+
+
+def invalidate_user(user_id: Any):
+    """Drops every cached principal for a user (all of their tokens)."""
+    sub = str(user_id)
+    _principals.delete_where(lambda key: key[0] == sub)
+
+
+def clear():
+    _decoded_tokens.clear()
+    _principals.clear()
+
+
+# Invalidate on any ORM write to a user row. Writes made outside this process
+# (e.g. by the Next.js auth layer or another worker) are bounded by the TTL.
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_write(mapper, connection, target: User):
+    invalidate_user(target.id)
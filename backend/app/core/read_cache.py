@@ -0,0 +1,202 @@
+import asyncio
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from app.core.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend:
+    """Byte-oriented key/value store behind a ReadThroughCache."""
+
+    async def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        raise NotImplementedError
+
+    async def get_version(self, namespace: str) -> int:
+        raise NotImplementedError
+
+    async def bump_version(self, namespace: str) -> int:
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    Per-process LRU with TTL. Each worker has its own copy, so an invalidation
+    only reaches the worker that handled the write; others catch up within the TTL.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._entries = TTLCache(maxsize, ttl)
+        self._versions: Dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._entries.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        self._entries.set(key, value, ttl=ttl)
+
+    async def get_version(self, namespace: str) -> int:
+        return self._versions.get(namespace, 0)
+
+    async def bump_version(self, namespace: str) -> int:
+        version = self._versions.get(namespace, 0) + 1
+        self._versions[namespace] = version
+        # Entries under the old version can never be read again; free them now
+        prefix = f"{namespace}:v"
+        self._entries.delete_where(lambda key: key.startswith(prefix))
+        return version
+
+
+class RedisCacheBackend(CacheBackend):
+    """Shared between workers via Redis (install the `redis` package to use it)."""
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError as exc:
+            raise RuntimeError("CACHE_URL points to Redis but the 'redis' package is not installed") from exc
+        self._client = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        await self._client.set(key, value, px=max(1, int(ttl * 1000)))
+
+    async def get_version(self, namespace: str) -> int:
+        return int(await self._client.get(f"{namespace}:version") or 0)
+
+    async def bump_version(self, namespace: str) -> int:
+        # Old keys are left to expire on their own TTL
+        return await self._client.incr(f"{namespace}:version")
+
+    async def close(self):
+        await self._client.aclose()
+
+
+def create_cache_backend(url: Optional[str], maxsize: int, ttl: float) -> CacheBackend:
+    """`memory://` (default, per worker) or `redis://host:port/db` (shared)."""
+    if not url or url.startswith("memory://"):
+        return MemoryCacheBackend(maxsize, ttl)
+    if url.startswith(("redis://", "rediss://")):
+        return RedisCacheBackend(url)
+    raise ValueError(f"Unsupported CACHE_URL: {url}")
+
+
+class LoadAbandoned(Exception):
+    """Raised to coalesced waiters when the request running their shared load is cancelled."""
+
+
+class CacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        # Misses that waited for another request's load instead of querying themselves
+        self.coalesced = 0
+        self.errors = 0
+        self.invalidations = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+class ReadThroughCache:
+    """
+    Read-through cache for one namespace of serialized responses.
+
+    Keys are prefixed with the namespace's current version, so `invalidate()`
+    drops everything at once by bumping the version. Concurrent misses for the
+    same key share a single load (per worker). Backend failures degrade to
+    calling the loader directly.
+    """
+
+    def __init__(self, backend: CacheBackend, namespace: str, ttl: float):
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._inflight: Dict[str, "asyncio.Future[bytes]"] = {}
+
+    async def _versioned(self, key: str) -> str:
+        return f"{self.namespace}:v{await self.backend.get_version(self.namespace)}:{key}"
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[bytes]]) -> bytes:
+        if self.ttl <= 0:
+            return await loader()
+        try:
+            full_key = await self._versioned(key)
+            cached = await self.backend.get(full_key)
+        except Exception:
+            logger.exception("Cache backend read failed for %s", key)
+            self.stats.errors += 1
+            return await loader()
+        if cached is not None:
+            self.stats.hits += 1
+            return cached
+
+        pending = self._inflight.get(full_key)
+        if pending is not None:
+            self.stats.coalesced += 1
+            try:
+                return await asyncio.shield(pending)
+            except LoadAbandoned:
+                # The owning request went away mid-load; the first waiter to get here loads instead
+                return await self.get_or_load(key, loader)
+
+        self.stats.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[full_key] = future
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            # Only the owner was cancelled (client gone, timeout); its waiters are still live
+            future.set_exception(LoadAbandoned(key))
+            future.exception()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Waiters re-raise it; mark it retrieved so an unawaited future does not log
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(full_key, None)
+        future.set_result(value)
+        try:
+            await self.backend.set(full_key, value, self.ttl)
+        except Exception:
+            logger.exception("Cache backend write failed for %s", key)
+            self.stats.errors += 1
+        return value
+
+    async def invalidate(self):
+        self.stats.invalidations += 1
+        try:
+            await self.backend.bump_version(self.namespace)
+        except Exception:
+            logger.exception("Cache invalidation failed for %s", self.namespace)
+            self.stats.errors += 1
+
+
+def pack_response(body: bytes, headers: Optional[Dict[str, str]] = None) -> bytes:
+    """Stores a response body with the headers that must be replayed on a hit."""
+    return json.dumps(headers or {}).encode() + b"\n" + body
+
+
+def unpack_response(raw: bytes) -> Tuple[Dict[str, str], bytes]:
+    header_line, _, body = raw.partition(b"\n")
+    return json.loads(header_line), body
@@ -0,0 +1,78 @@
+import time
+from http.cookies import SimpleCookie
+from typing import Any, Dict
+from fastapi import Request
+from app.config import settings
+
+# Read-your-writes: after a successful write the client carries this cookie
+# (the epoch second until which it must read from the primary) for
+# READ_YOUR_WRITES_SECONDS, so its next reads see its own change even if the
+# replicas lag. Forging it can only send one's own reads to the primary.
+STICKY_COOKIE = "devmart_primary_until"
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class RoutingStats:
+    def __init__(self):
+        self.replica_reads = 0
+        self.primary_reads = 0
+        self.sticky_reads = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+            "sticky_reads": self.sticky_reads,
+        }
+
+
+stats = RoutingStats()
+
+
+def replicas_enabled() -> bool:
+    return bool(settings.DATABASE_REPLICA_URLS)
+
+
+def wants_primary(request: Request) -> bool:
+    """True while the client is inside the read-your-writes window of its last write."""
+    try:
+        until = float(request.cookies.get(STICKY_COOKIE, 0))
+    except ValueError:
+        return False
+    return until > time.time()
+
+
+class ReadYourWritesMiddleware:
+    """
+    ASGI middleware setting the stickiness cookie on every successful unsafe
+    request (POST, PATCH, PUT, DELETE). Does nothing when no replica is configured.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS or not replicas_enabled():
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                message = {**message, "headers": [*message.get("headers", []), _sticky_cookie(scope)]}
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def _sticky_cookie(scope):
+    window = settings.READ_YOUR_WRITES_SECONDS
+    cookie = SimpleCookie()
+    cookie[STICKY_COOKIE] = str(int(time.time() + window) + 1)
+    morsel = cookie[STICKY_COOKIE]
+    morsel["max-age"] = int(window) + 1
+    morsel["path"] = "/"
+    morsel["httponly"] = True
+    morsel["samesite"] = "Lax"
+    if scope.get("scheme") == "https":
+        morsel["secure"] = True
+    return (b"set-cookie", morsel.OutputString().encode())
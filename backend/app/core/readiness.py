@@ -0,0 +1,103 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+from sqlalchemy import text
+from app import database
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ReadinessProbe:
+    """
+    Backs /health/ready. Startup touches no database, so the first successful
+    probe warms the worker instead: it opens READINESS_WARM_CONNECTIONS pooled
+    connections and replays READINESS_WARM_PATHS through the app in-process,
+    filling the catalog cache and SQLAlchemy's compiled statement cache before
+    the load balancer routes traffic here. Later probes only ping the database.
+    """
+
+    def __init__(self):
+        self.warmed = False
+        self.checks = 0
+        self.failures = 0
+        self.warm_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def check(self, app) -> bool:
+        self.checks += 1
+        try:
+            if self.warmed:
+                await self._ping(1)
+            else:
+                if self._lock is None:
+                    self._lock = asyncio.Lock()
+                async with self._lock:
+                    if not self.warmed:
+                        await self._warm(app)
+        except Exception as exc:
+            self.failures += 1
+            self.last_error = repr(exc)[:500]
+            logger.warning("Readiness check failed: %r", exc)
+            return False
+        self.last_error = None
+        return True
+
+    async def _ping(self, connections: int):
+        # Held at the same time, so the pool really grows to `connections`
+        opened = []
+        try:
+            for _ in range(max(1, connections)):
+                connection = await database.async_engine.connect()
+                opened.append(connection)
+                await connection.execute(text("SELECT 1"))
+        finally:
+            for connection in opened:
+                await connection.close()
+
+    async def _warm(self, app):
+        start = time.perf_counter()
+        await self._ping(settings.READINESS_WARM_CONNECTIONS)
+        for path in settings.READINESS_WARM_PATHS:
+            status = await _asgi_get(app, path)
+            if status >= 500:
+                raise RuntimeError(f"Warm-up request GET {path} answered {status}")
+        self.warm_seconds = time.perf_counter() - start
+        self.warmed = True
+        logger.info("Worker warmed in %.3fs", self.warm_seconds)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "ready": self.warmed and self.last_error is None,
+            "checks": self.checks,
+            "failures": self.failures,
+            "warm_seconds": round(self.warm_seconds, 3) if self.warm_seconds is not None else None,
+            "last_error": self.last_error,
+        }
+
+
+async def _asgi_get(app, path: str) -> int:
+    """Sends one GET through the full ASGI stack and returns the status code."""
+    route, _, query = path.partition("?")
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": route, "raw_path": route.encode(), "root_path": "", "query_string": query.encode(),
+        "headers": [(b"host", b"localhost")], "client": ("127.0.0.1", 0), "server": ("localhost", 80),
+    }
+    status = 500
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+readiness = ReadinessProbe()
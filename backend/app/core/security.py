@@ -1,5 +1,6 @@
 from datetime import datetime, timedelta
 from typing import Optional, Union, Any
+from fastapi import Request
 from jose import jwt, JWTError
 from app.config import settings
 
@@ -13,6 +14,15 @@ def create_access_token(subject: Union[str, Any], expires_delta: Optional[timede
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
+def token_from_request(request: Request) -> Optional[str]:
+    """The access token from the `access_token` cookie or an `Authorization: Bearer` header."""
+    token = request.cookies.get("access_token")
+    if not token:
+        auth_header = request.headers.get("Authorization")
+        if auth_header and auth_header.startswith("Bearer "):
+            token = auth_header.split(" ")[1]
+    return token
+
 def verify_jwt(token: str) -> Optional[dict]:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
@@ -0,0 +1,96 @@
+import csv
+import io
+from typing import Any, Dict, List, Sequence, Tuple, Type
+from fastapi import Request
+from pydantic import BaseModel, TypeAdapter
+from sqlmodel import select
+from typing_extensions import TypedDict
+
+# Opt-in compact list format, negotiated with the Accept header:
+#   {"version": 1, "columns": ["id", ...], "rows": [["…", ...], ...]}
+# Field names are sent once per page instead of once per item. `version` bumps
+# whenever the meaning of a column changes, so clients can refuse what they do not know.
+COLUMNAR_MEDIA_TYPE = "application/vnd.devmart.columnar+json"
+COLUMNAR_VERSION = 1
+
+
+def dump_json(adapter: TypeAdapter, objects: Any) -> bytes:
+    """
+    Serializes ORM objects through a read schema. Validating first matters:
+    dumping a table model directly would emit its own fields, not the schema's.
+    """
+    return adapter.dump_json(adapter.validate_python(objects, from_attributes=True))
+
+
+def wants_columnar(request: Request) -> bool:
+    return COLUMNAR_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+class RowSerializer:
+    """
+    Fast path for list responses of a flat read schema: selects only the
+    schema's columns as row tuples and dumps a whole page in one call through
+    precompiled serializers, without building ORM objects or validating rows
+    the database has already typed.
+
+    Statements may select extra columns after the schema's (e.g. `updated_at`
+    for ETags); they are left out of the body.
+    """
+
+    def __init__(self, schema: Type[BaseModel], model: Any):
+        self.schema = schema
+        self.fields: List[str] = list(schema.model_fields)
+        self.columns = [getattr(model, name) for name in self.fields]
+        annotations = {name: field.annotation for name, field in schema.model_fields.items()}
+        row_type = TypedDict(f"{schema.__name__}Row", annotations)
+        self._row = TypeAdapter(row_type)
+        self._objects = TypeAdapter(List[row_type])
+        page_type = TypedDict(f"{schema.__name__}ColumnarPage", {
+            "version": int,
+            "columns": List[str],
+            "rows": List[Tuple[tuple(annotations.values())]],
+        })
+        self._columnar = TypeAdapter(page_type)
+
+    def select(self, *extra_columns):
+        return select(*self.columns, *extra_columns)
+
+    def dump(self, rows: Sequence[Any], columnar: bool = False) -> bytes:
+        """JSON body for `rows`: a list of objects shaped like the schema, or the columnar page."""
+        width = len(self.fields)
+        if columnar:
+            return self._columnar.dump_json({
+                "version": COLUMNAR_VERSION,
+                "columns": self.fields,
+                "rows": [tuple(row[:width]) for row in rows],
+            })
+        fields = self.fields
+        return self._objects.dump_json([dict(zip(fields, row)) for row in rows])
+
+    def dump_ndjson(self, rows: Sequence[Any]) -> bytes:
+        """One JSON object per line, for streamed exports."""
+        fields, dump = self.fields, self._row.dump_json
+        return b"".join(dump(dict(zip(fields, row))) + b"\n" for row in rows)
+
+    def dump_csv(self, rows: Sequence[Any], header: bool = False) -> bytes:
+        """CSV lines with the schema's fields as columns, values as in the JSON body."""
+        fields = self.fields
+        values = self._objects.dump_python([dict(zip(fields, row)) for row in rows], mode="json")
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if header:
+            writer.writerow(fields)
+        writer.writerows([item[name] for name in fields] for item in values)
+        return buffer.getvalue().encode()
+
+    @staticmethod
+    def media_type(columnar: bool) -> str:
+        return COLUMNAR_MEDIA_TYPE if columnar else "application/json"
+
+
+def columnar_to_objects(page: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Expands a columnar page back into a list of objects (clients, tests)."""
+    if page.get("version") != COLUMNAR_VERSION:
+        raise ValueError(f"Unsupported columnar version: {page.get('version')!r}")
+    columns = page["columns"]
+    return [dict(zip(columns, row)) for row in page["rows"]]
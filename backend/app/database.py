@@ -1,33 +1,192 @@
+import itertools
+import threading
+from fastapi import Request
 from sqlmodel import create_engine, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.engine import make_url, URL
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
-import os
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
+from app.config import settings
+from app.core import read_routing
+from app.core.metrics import instrument_engine
+from app.core.pool import attach_metrics, engine_options, pool_status
 
 # Use DATABASE_URL from environment variables
-DATABASE_URL = os.getenv("DATABASE_URL")
+DATABASE_URL = settings.DATABASE_URL
+
+# Sync drivers and the async driver that replaces them for the async engine
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(url: str) -> URL:
+    """
+    Derives an async driver URL from a sync one.
+    asyncpg does not understand libpq query options, so `sslmode` is mapped
+    to its `ssl` argument and `channel_binding` is dropped.
+    """
+    parsed = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    query = dict(parsed.query)
+    if drivername == "postgresql+asyncpg":
+        if "sslmode" in query:
+            query["ssl"] = query.pop("sslmode")
+        query.pop("channel_binding", None)
+    return parsed.set(drivername=drivername, query=query)
+
+
+def _database_url() -> str:
+    if not DATABASE_URL:
+        raise ValueError("DATABASE_URL environment variable is not set")
+    return DATABASE_URL
+
+
+# Engines and session factories are built on first use (module __getattr__),
+# not at import: importing the app neither loads a database driver nor needs
+# a valid DATABASE_URL, so workers boot fast and a bad URL fails the first
+# query (and /health/ready) instead of the import.
+
+def _async_database_url():
+    return settings.ASYNC_DATABASE_URL or to_async_url(_database_url())
+
+
+def _engine():
+    # Pool sizing, pre-ping, recycle, statement timeout and echo come from Settings
+    # (see app/core/pool.py); SQL echo is off unless DB_ECHO is set.
+    url = _database_url()
+    sync_engine = create_engine(url, **engine_options(url))
+    attach_metrics(sync_engine)
+    # Statement timings, per-request query counts and the slow-query log
+    instrument_engine(sync_engine, "sync")
+    return sync_engine
+
+
+def _async_engine():
+    # Async engine used by the API routers so DB waits never block the event loop
+    url = _lazy("ASYNC_DATABASE_URL")
+    engine = create_async_engine(url, **engine_options(url, is_async=True))
+    attach_metrics(engine)
+    instrument_engine(engine, "async")
+    return engine
+
+
+def _replica_engines():
+    # Replicas only ever serve reads through the async engine
+    engines = []
+    for i, url in enumerate(settings.DATABASE_REPLICA_URLS):
+        async_url = to_async_url(url)
+        engine = create_async_engine(async_url, **engine_options(async_url, is_async=True))
+        attach_metrics(engine)
+        instrument_engine(engine, f"replica{i}")
+        engines.append(engine)
+    return engines
+
+
+def _session_local():
+    return sessionmaker(autocommit=False, autoflush=False, bind=_lazy("engine"))
+
+
+def _async_session_local():
+    # expire_on_commit is disabled because an expired attribute would need an
+    # implicit (blocking) refresh on next access.
+    return async_sessionmaker(_lazy("async_engine"), class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 
-if not DATABASE_URL:
-    raise ValueError("DATABASE_URL environment variable is not set")
+def _replica_session_locals():
+    return [
+        async_sessionmaker(engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+        for engine in _lazy("replica_engines")
+    ]
 
-# Create engine with echo=True for debugging
-# Ensure arguments are compatible with the connection string (e.g., check_same_thread for sqlite)
-engine = create_engine(DATABASE_URL, echo=True)
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+_LAZY = {
+    "ASYNC_DATABASE_URL": _async_database_url,
+    "engine": _engine,
+    "async_engine": _async_engine,
+    "SessionLocal": _session_local,
+    "AsyncSessionLocal": _async_session_local,
+    "replica_engines": _replica_engines,
+    "ReplicaSessionLocals": _replica_session_locals,
+}
+# Reentrant: building a session factory builds its engine first
+_lazy_lock = threading.RLock()
+
+
+def _lazy(name: str):
+    value = globals().get(name)
+    if value is None:
+        with _lazy_lock:
+            value = globals().get(name)
+            if value is None:
+                value = globals()[name] = _LAZY[name]()
+    return value
+
+
+def __getattr__(name: str):
+    if name in _LAZY:
+        return _lazy(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_session():
     """Dependency for getting DB session"""
-    with Session(engine) as session:
+    with Session(_lazy("engine")) as session:
+        yield session
+
+
+async def get_async_session():
+    """Dependency for getting an async DB session"""
+    async with _lazy("AsyncSessionLocal")() as session:
+        yield session
+
+
+def get_async_session_factory():
+    """
+    Dependency for handlers that open their own sessions, e.g. streaming
+    responses whose body is produced after the handler has returned.
+    """
+    return _lazy("AsyncSessionLocal")
+
+
+_next_replica = itertools.count()
+
+
+def get_read_session_factory(request: Request):
+    """
+    Session factory for safe reads: the next replica in turn, or the primary
+    when there are no replicas or the client wrote within READ_YOUR_WRITES_SECONDS.
+    Writes (and reads that lead to a write) must keep using get_async_session.
+    """
+    replicas = _lazy("ReplicaSessionLocals")
+    if not replicas:
+        read_routing.stats.primary_reads += 1
+        return _lazy("AsyncSessionLocal")
+    if read_routing.wants_primary(request):
+        read_routing.stats.sticky_reads += 1
+        return _lazy("AsyncSessionLocal")
+    read_routing.stats.replica_reads += 1
+    return replicas[next(_next_replica) % len(replicas)]
+
+
+async def get_read_session(request: Request):
+    """Dependency for an async session of a read-only GET handler (see get_read_session_factory)."""
+    async with get_read_session_factory(request)() as session:
         yield session
 
 
 # Alternative dependency using SQLModel's Session
 def get_sqlmodel_session():
     """SQLModel session dependency"""
-    with Session(engine) as session:
-        yield session
\ No newline at end of file
+    with Session(_lazy("engine")) as session:
+        yield session
+
+
+def get_pool_stats():
+    """Live pool metrics for the engines this worker has created so far."""
+    engines = {"sync": globals().get("engine"), "async": globals().get("async_engine")}
+    engines.update((f"replica{i}", engine) for i, engine in enumerate(globals().get("replica_engines") or []))
+    return {name: pool_status(engine) for name, engine in engines.items() if engine is not None}
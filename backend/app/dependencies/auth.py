@@ -1,42 +1,96 @@
-from fastapi import Depends, HTTPException, status, Request
+import hmac
+from typing import Optional
+from fastapi import Depends, HTTPException, status, Request, WebSocket
 from jose import JWTError
-from sqlmodel import Session, select
-from app.database import get_session
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.config import settings
+from app.core import principal_cache
+from app.core.security import token_from_request
+from app import database
+from app.database import get_async_session
 from app.models.user import User
-from app.core.security import verify_jwt
 from uuid import UUID
 
-def get_current_user(request: Request, db: Session = Depends(get_session)) -> User:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    
-    token = request.cookies.get("access_token")
-    if not token:
-        auth_header = request.headers.get("Authorization")
-        if auth_header and auth_header.startswith("Bearer "):
-            token = auth_header.split(" ")[1]
-    
+async def resolve_user(token: Optional[str], db: AsyncSession) -> Optional[User]:
+    """
+    Returns the user a token belongs to, or None if it is missing or invalid.
+    The session only checks out a connection if the principal cache misses.
+    """
     if not token:
-        raise credentials_exception
+        return None
 
-    payload = verify_jwt(token)
+    payload = principal_cache.decode_token(token)
     if payload is None:
-        raise credentials_exception
+        return None
     
     user_id_str: str = payload.get("sub")
     if user_id_str is None:
-        raise credentials_exception
+        return None
         
     try:
         user_uuid = UUID(user_id_str)
     except ValueError:
-        raise credentials_exception
-        
-    user = db.exec(select(User).where(User.id == user_uuid)).first()
+        return None
+
+    if settings.AUTH_PRINCIPAL_FROM_CLAIMS:
+        return principal_cache.principal_from_claims(user_uuid, payload)
+
+    user = principal_cache.get_principal(user_id_str, token)
+    if user is not None:
+        return user
+
+    user = (await db.exec(select(User).where(User.id == user_uuid))).first()
+    if user is None:
+        return None
+
+    principal_cache.cache_principal(user_id_str, token, user, payload)
+    return user
+
+
+async def get_current_user(request: Request, db: AsyncSession = Depends(get_async_session)) -> User:
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    
+    user = await resolve_user(token_from_request(request), db)
     if user is None:
         raise credentials_exception
-        
     return user
+
+
+def require_metrics_token(request: Request) -> None:
+    """
+    Guards the operational endpoints, which expose per-worker internals. They are
+    hidden (404) unless METRICS_TOKEN is set, and then need it as a Bearer token.
+    """
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), settings.METRICS_TOKEN.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+async def authenticate_websocket(websocket: WebSocket) -> Optional[User]:
+    """
+    Handshake authentication from a `?token=` query parameter or the `access_token`
+    cookie. Browsers cannot set headers on a WebSocket, hence the query parameter.
+    The session is closed before returning, so an open socket holds no DB connection.
+
+    Browsers send cookies with cross-site WebSocket handshakes and CORS does not
+    apply to them, so the cookie is only trusted when the Origin is one of
+    CORS_ALLOWED_ORIGINS; otherwise any page could open a socket as its visitor.
+    """
+    token = websocket.query_params.get("token")
+    if not token:
+        if websocket.headers.get("origin") not in settings.CORS_ALLOWED_ORIGINS:
+            return None
+        token = websocket.cookies.get("access_token")
+    async with database.AsyncSessionLocal() as db:
+        return await resolve_user(token, db)
@@ -1,48 +1,81 @@
 from fastapi import FastAPI, Depends, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from sqlmodel import SQLModel
-from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
+from app.core.conditional import PRIVATE_REVALIDATE, PRIVATE_VARY, conditional_json
+from app.core import limiter as rate_limits
+from app.core import metrics, read_routing
+from app.core.readiness import readiness
 from app.core.limiter import limiter
-from app.database import engine
+from app import database
+from app.database import get_pool_stats
 from app.models import User, Gig, Order, Message, Review, PaymentProof
-from app.dependencies.auth import get_current_user
+from app.dependencies.auth import get_current_user, require_metrics_token
+from app.schemas.user import UserRead
 from app.api.api import api_router
+from app.services import gig_catalog, outbox
+from app.websocket.connection_manager import manager
+from app.websocket.ingest import message_writer
+from app.websocket.notifications import push_event
 from app.config import settings
 
 # Initialize Rate Limiter
-# (limiter is now initialized in app/core/limiter.py)
+# (limiter is now initialized in app/core/limiter.py; keys are per user, storage per RATE_LIMIT_STORAGE_URL)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Create tables on startup
-    SQLModel.metadata.create_all(engine)
+    # No database work on boot: the schema is managed with `alembic upgrade head`,
+    # and /health/ready warms the pool and caches on the first probe
+    if settings.DB_CREATE_ALL:
+        SQLModel.metadata.create_all(database.engine)
+    # Join the WebSocket backplane so messages published by other workers reach our sockets
+    await manager.start()
+    message_writer.start()
+    # Deliver committed outbox events (order, message and review notifications) to sockets
+    outbox.dispatcher.subscribe(push_event)
+    if settings.OUTBOX_DISPATCHER_ENABLED:
+        outbox.dispatcher.start()
     yield
+    # Flush messages still waiting in the ingest queue before the sockets go away
+    await message_writer.stop()
+    await outbox.dispatcher.stop()
+    await manager.stop()
 
 app = FastAPI(lifespan=lifespan, title="DevMarket API", version="1.0.0")
 
 # Add Rate Limiting Error Handler
 app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+app.add_exception_handler(RateLimitExceeded, rate_limits.rate_limit_exceeded_handler)
 
 # HARDENED CORS: Restrict to production-ready origins
-# Read from settings if available, else fallback to dev
-allowed_origins = [
-    "http://localhost:3000",
-    "http://127.0.0.1:3000",
-    # Add your production domain here
-]
-
+# (CORS_ALLOWED_ORIGINS; add your production domain there)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=allowed_origins,
+    allow_origins=settings.CORS_ALLOWED_ORIGINS,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PATCH", "DELETE", "OPTIONS"],
     allow_headers=["Content-Type", "Authorization", "Cookie"],
     max_age=3600, # Cache preflight requests for 1 hour
 )
 
+# Pins a client's reads to the primary for a short while after each of its writes
+app.add_middleware(read_routing.ReadYourWritesMiddleware)
+
+# Outermost, so latency covers every other middleware
+if settings.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+
+# Per-worker subsystem stats, also served as JSON under /health, exported on /metrics
+metrics.register_collector("pool", get_pool_stats)
+metrics.register_collector("websockets", manager.get_stats)
+metrics.register_collector("catalog_cache", gig_catalog.catalog_cache.stats.as_dict)
+metrics.register_collector("outbox", outbox.dispatcher.stats.as_dict)
+metrics.register_collector("rate_limit", rate_limits.stats.gauges)
+metrics.register_collector("readiness", readiness.as_dict)
+metrics.register_collector("read_routing", read_routing.stats.as_dict)
+
 # Include the main API router
 app.include_router(api_router, prefix="/api/v1")
 
@@ -51,7 +84,54 @@ app.include_router(api_router, prefix="/api/v1")
 def read_root(request: Request):
     return {"message": "Welcome to DevMarket API"}
 
-@app.get("/me", response_model=User)
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False, dependencies=[Depends(require_metrics_token)])
+def read_metrics():
+    # Prometheus text exposition format; each worker reports its own series
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/health/pool", dependencies=[Depends(require_metrics_token)])
+def read_pool_stats():
+    # Per-worker connection pool occupancy and checkout wait times
+    return get_pool_stats()
+
+@app.get("/health/websockets", dependencies=[Depends(require_metrics_token)])
+def read_websocket_stats():
+    # Per-worker socket counts, outbound queue depth and dropped frames
+    return manager.get_stats()
+
+@app.get("/health/cache", dependencies=[Depends(require_metrics_token)])
+def read_cache_stats():
+    # Per-worker hit/miss counters of the gig catalog cache
+    return gig_catalog.catalog_cache.stats.as_dict()
+
+@app.get("/health/rate-limits", dependencies=[Depends(require_metrics_token)])
+def read_rate_limit_stats():
+    # Per-worker rejection counters; the limits themselves are shared when storage is Redis
+    return rate_limits.stats.as_dict()
+
+@app.get("/health/outbox", dependencies=[Depends(require_metrics_token)])
+async def read_outbox_stats():
+    # Per-worker dispatcher counters plus the backlog still in the table
+    async with database.AsyncSessionLocal() as session:
+        return {**outbox.dispatcher.stats.as_dict(), **await outbox.backlog(session)}
+
+@app.get("/health/live")
+def read_liveness():
+    # Process liveness only; touches nothing, so a struggling database does not get it restarted
+    return {"status": "ok"}
+
+@app.get("/health/ready")
+async def read_readiness():
+    # Load balancer readiness: 503 until the database answers; the first success warms the worker
+    ready = await readiness.check(app)
+    return JSONResponse(readiness.as_dict(), status_code=200 if ready else 503)
+
+@app.get("/me", response_model=UserRead)
 @limiter.limit("30/minute")
-def read_users_me(request: Request, current_user: User = Depends(get_current_user)):
-    return current_user
\ No newline at end of file
+async def read_users_me(request: Request, current_user: User = Depends(get_current_user)):
+    # Usually served from the principal cache; the ETag spares re-sending an unchanged profile.
+    # The schema fixes the field order, so a cached and a freshly loaded user hash the same.
+    return conditional_json(
+        request, UserRead.model_validate(current_user).model_dump_json().encode(),
+        cache_control=PRIVATE_REVALIDATE, vary=PRIVATE_VARY,
+    )
\ No newline at end of file
@@ -3,4 +3,7 @@ from .gig import Gig
 from .order import Order
 from .message import Message
 from .review import Review
-from .payment import PaymentProof
\ No newline at end of file
+from .payment import PaymentProof
+from .conversation import Conversation
+from .rating import UserRatingSummary
+from .outbox import OutboxEvent
@@ -0,0 +1,30 @@
+from typing import Optional
+from uuid import UUID, uuid4
+from datetime import datetime
+from sqlmodel import SQLModel, Field, Index, UniqueConstraint
+
+
+class Conversation(SQLModel, table=True):
+    """
+    One row per pair of users who have exchanged messages, keyed by the ordered
+    pair (user_a_id < user_b_id). The last message and per-participant unread
+    counters are denormalized here and updated in the same transaction as each
+    new Message, so the inbox never aggregates the message table.
+    """
+    __table_args__ = (
+        UniqueConstraint("user_a_id", "user_b_id"),
+        # The inbox is a union of both sides, each ordered by latest activity
+        Index("ix_conversation_user_a_last_message_at_id", "user_a_id", "last_message_at", "id"),
+        Index("ix_conversation_user_b_last_message_at_id", "user_b_id", "last_message_at", "id"),
+    )
+
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    user_a_id: UUID = Field(foreign_key="user.id")
+    user_b_id: UUID = Field(foreign_key="user.id")
+    last_message_id: Optional[UUID] = Field(default=None, foreign_key="message.id")
+    last_sender_id: Optional[UUID] = Field(default=None, foreign_key="user.id")
+    last_message_preview: str = Field(default="")
+    last_message_at: datetime = Field(default_factory=datetime.utcnow)
+    unread_a: int = Field(default=0)
+    unread_b: int = Field(default=0)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
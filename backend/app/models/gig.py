@@ -2,7 +2,8 @@ from typing import Optional, List, TYPE_CHECKING
 from uuid import UUID, uuid4
 from decimal import Decimal
 from datetime import datetime
-from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import DDL, event, func, literal_column
+from sqlmodel import SQLModel, Field, Relationship, Index
 
 if TYPE_CHECKING:
     from .user import User
@@ -10,15 +11,67 @@ if TYPE_CHECKING:
 
 
 class Gig(SQLModel, table=True):
+    # Covers the marketplace feed: active gigs, newest first, keyset on (created_at, id)
+    __table_args__ = (Index("ix_gig_active_created_at_id", "is_active", "created_at", "id"),)
+
     id: UUID = Field(default_factory=uuid4, primary_key=True)
-    freelancer_id: UUID = Field(foreign_key="user.id")
+    freelancer_id: UUID = Field(foreign_key="user.id", index=True)
     title: str
     description: str
     price: Decimal = Field(default=Decimal("0"), max_digits=10, decimal_places=2)
     delivery_days: int
     is_active: bool = Field(default=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    # Bumped on every UPDATE; the row version behind ETag / Last-Modified
+    updated_at: datetime = Field(default_factory=datetime.utcnow, sa_column_kwargs={"onupdate": datetime.utcnow})
 
     # Relationships
     freelancer: "User" = Relationship(back_populates="gigs")
-    orders: List["Order"] = Relationship(back_populates="gig")
\ No newline at end of file
+    orders: List["Order"] = Relationship(back_populates="gig")
+
+# --- Full-text search (queried by app/services/gig_search.py) ---
+
+SEARCH_CONFIG = "english"
+
+
+def search_document(title, description):
+    """Weighted tsvector of a gig: title terms rank above description terms."""
+    # Constants are inlined (not bound) so queries repeat the indexed expression verbatim
+    config, empty = literal_column(f"'{SEARCH_CONFIG}'::regconfig"), literal_column("''")
+    return func.setweight(func.to_tsvector(config, func.coalesce(title, empty)), literal_column("'A'")).op("||")(
+        func.setweight(func.to_tsvector(config, func.coalesce(description, empty)), literal_column("'B'"))
+    )
+
+
+# Postgres: expression GIN index, maintained by the database on every write
+Gig.__table__.append_constraint(
+    Index(
+        "ix_gig_search_document",
+        search_document(Gig.__table__.c.title, Gig.__table__.c.description),
+        postgresql_using="gin",
+    ).ddl_if(dialect="postgresql")
+)
+
+# SQLite: FTS5 table keyed by the gig's UUID (an UNINDEXED column), kept in sync
+# by triggers. Not external-content on gig's implicit rowid: a table with a UUID
+# primary key may have its rowids renumbered by VACUUM, which would silently
+# point the index at the wrong gigs.
+SEARCH_INDEX_TABLE = "gig_fts"
+SQLITE_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS gig_fts USING fts5("
+    "gig_id UNINDEXED, title, description, tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS gig_fts_ai AFTER INSERT ON gig BEGIN "
+    "INSERT INTO gig_fts(gig_id, title, description) VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS gig_fts_ad AFTER DELETE ON gig BEGIN "
+    "DELETE FROM gig_fts WHERE gig_id = old.id; END",
+    "CREATE TRIGGER IF NOT EXISTS gig_fts_au AFTER UPDATE OF title, description ON gig BEGIN "
+    "DELETE FROM gig_fts WHERE gig_id = old.id; "
+    "INSERT INTO gig_fts(gig_id, title, description) VALUES (new.id, new.title, new.description); END",
+]
+SQLITE_FTS_DROP = ["DROP TRIGGER IF EXISTS gig_fts_au", "DROP TRIGGER IF EXISTS gig_fts_ad",
+                   "DROP TRIGGER IF EXISTS gig_fts_ai", "DROP TABLE IF EXISTS gig_fts"]
+
+for statement in SQLITE_FTS_DDL:
+    event.listen(Gig.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+for statement in SQLITE_FTS_DROP:
+    event.listen(Gig.__table__, "before_drop", DDL(statement).execute_if(dialect="sqlite"))
@@ -1,7 +1,7 @@
 from typing import Optional, List, TYPE_CHECKING
 from uuid import UUID, uuid4
 from datetime import datetime
-from sqlmodel import SQLModel, Field, Relationship
+from sqlmodel import SQLModel, Field, Relationship, Index
 
 if TYPE_CHECKING:
     from .user import User
@@ -9,6 +9,9 @@ if TYPE_CHECKING:
 
 
 class Message(SQLModel, table=True):
+    # Each direction of a conversation is a range scan ordered for keyset paging
+    __table_args__ = (Index("ix_message_pair_created_at_id", "sender_id", "receiver_id", "created_at", "id"),)
+
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     sender_id: UUID = Field(foreign_key="user.id")
     receiver_id: UUID = Field(foreign_key="user.id")
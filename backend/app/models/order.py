@@ -1,7 +1,7 @@
 from typing import Optional, List, TYPE_CHECKING
 from uuid import UUID, uuid4
 from datetime import datetime
-from sqlmodel import SQLModel, Field, Relationship
+from sqlmodel import SQLModel, Field, Relationship, Index
 
 if TYPE_CHECKING:
     from .user import User
@@ -30,14 +30,24 @@ class PaymentStatus:
 
 
 class Order(SQLModel, table=True):
+    # One index per side of the client OR freelancer listing, ordered for keyset paging
+    __table_args__ = (
+        Index("ix_order_client_created_at_id", "client_id", "created_at", "id"),
+        Index("ix_order_freelancer_created_at_id", "freelancer_id", "created_at", "id"),
+    )
+
     id: UUID = Field(default_factory=uuid4, primary_key=True)
-    gig_id: UUID = Field(foreign_key="gig.id")
+    gig_id: UUID = Field(foreign_key="gig.id", index=True)
     client_id: UUID = Field(foreign_key="user.id")
     freelancer_id: UUID = Field(foreign_key="user.id")
     # Default status should align with the start of the flow
     status: str = Field(default=OrderStatus.PENDING_PAYMENT)
     payment_status: str = Field(default=PaymentStatus.PENDING)
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    # Bumped on every UPDATE; the row version behind ETag / Last-Modified
+    updated_at: datetime = Field(default_factory=datetime.utcnow, sa_column_kwargs={"onupdate": datetime.utcnow})
+    # Optimistic concurrency: incremented by every status transition
+    version: int = Field(default=1, sa_column_kwargs={"server_default": "1"})
 
     # Relationships
     gig: "Gig" = Relationship(back_populates="orders")
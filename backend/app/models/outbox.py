@@ -0,0 +1,40 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+from uuid import UUID
+from sqlalchemy import JSON, Column
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import SQLModel, Field, Index
+
+
+class OutboxEvent(SQLModel, table=True):
+    """
+    A domain event written in the same transaction as the change it describes
+    and delivered afterwards by the outbox dispatcher (app/services/outbox.py).
+    A dispatcher delivers events in id order and holds back an aggregate's later
+    events while an earlier one waits for a retry. Across workers that ordering
+    only holds on Postgres, where an advisory lock lets one dispatcher drain at
+    a time. On SQLite, or with several workers on another backend, concurrent
+    dispatchers may interleave or repeat deliveries, so run a single dispatcher
+    (OUTBOX_DISPATCHER_ENABLED on one worker) there; with the memory://
+    backplane its WebSocket pushes then only reach that worker's sockets.
+    """
+    __table_args__ = (
+        # The dispatcher's scan: undelivered events in id order
+        Index("ix_outboxevent_dispatched_at_id", "dispatched_at", "id"),
+        # Per-aggregate ordering check (an earlier event of the same aggregate still pending)
+        Index("ix_outboxevent_aggregate_id_id", "aggregate_id", "id"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    aggregate_type: str = Field(max_length=32)
+    aggregate_id: UUID
+    event_type: str = Field(max_length=64)
+    payload: Dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False))
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    # Not delivered before this time; pushed back after each failed attempt
+    available_at: datetime = Field(default_factory=datetime.utcnow)
+    attempts: int = Field(default=0)
+    last_error: Optional[str] = None
+    dispatched_at: Optional[datetime] = None
+    # Set once max attempts are exhausted; the event is then skipped for good
+    failed_at: Optional[datetime] = None
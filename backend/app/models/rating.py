@@ -0,0 +1,21 @@
+from datetime import datetime
+from uuid import UUID
+from sqlmodel import SQLModel, Field
+
+
+class UserRatingSummary(SQLModel, table=True):
+    """
+    Running totals of the reviews a user has received, updated in the same
+    transaction as each new Review so ratings are read without aggregating
+    the review table. Rebuilt from scratch by `python rebuild_ratings.py`.
+    """
+    user_id: UUID = Field(foreign_key="user.id", primary_key=True)
+    review_count: int = Field(default=0)
+    rating_sum: int = Field(default=0)
+    # Star histogram
+    stars_1: int = Field(default=0)
+    stars_2: int = Field(default=0)
+    stars_3: int = Field(default=0)
+    stars_4: int = Field(default=0)
+    stars_5: int = Field(default=0)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
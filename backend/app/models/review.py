@@ -14,7 +14,7 @@ class Review(SQLModel, table=True):
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     order_id: UUID = Field(foreign_key="order.id")
     reviewer_id: UUID = Field(foreign_key="user.id")
-    reviewee_id: UUID = Field(foreign_key="user.id")
+    reviewee_id: UUID = Field(foreign_key="user.id", index=True)
     rating: int = Field(ge=1, le=5)
     comment: str
     created_at: datetime = Field(default_factory=datetime.utcnow)
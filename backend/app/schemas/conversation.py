@@ -0,0 +1,14 @@
+from uuid import UUID
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+class ConversationRead(BaseModel):
+    """A conversation as seen by one participant."""
+    id: UUID
+    peer_id: UUID
+    last_message_id: Optional[UUID] = None
+    last_sender_id: Optional[UUID] = None
+    last_message_preview: str
+    last_message_at: datetime
+    unread_count: int
@@ -3,6 +3,7 @@ from typing import Optional
 from uuid import UUID
 from pydantic import BaseModel
 from datetime import datetime
+from app.schemas.user import UserSummary
 
 class GigBase(BaseModel):
     title: str
@@ -28,3 +29,15 @@ class GigRead(GigBase):
     
     class Config:
         from_attributes = True
+
+class GigSummary(BaseModel):
+    id: UUID
+    title: str
+    price: Decimal
+    delivery_days: int
+    
+    class Config:
+        from_attributes = True
+
+class GigExpandedRead(GigRead):
+    freelancer: UserSummary
@@ -1,8 +1,10 @@
 from uuid import UUID
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
 from datetime import datetime
 from decimal import Decimal
+from app.schemas.gig import GigSummary
+from app.schemas.user import UserSummary
 
 class OrderBase(BaseModel):
     gig_id: UUID
@@ -18,6 +20,7 @@ class OrderRead(BaseModel):
     status: str
     payment_status: str
     created_at: datetime
+    version: int = 1
     
     class Config:
         from_attributes = True
@@ -27,3 +30,42 @@ class PaymentProofCreate(BaseModel):
     proof_reference: str
     payer_name: str
     amount: Decimal
+
+class PaymentProofRead(BaseModel):
+    id: UUID
+    proof_reference: str
+    payer_name: str
+    amount: Decimal
+    submitted_at: datetime
+    verified: bool
+    
+    class Config:
+        from_attributes = True
+
+class OrderExpandedRead(OrderRead):
+    gig: GigSummary
+    # The other party from the viewer's point of view
+    counterpart: UserSummary
+    payment_proof: Optional[PaymentProofRead] = None
+
+# Upper bound on the ids accepted by one bulk request
+MAX_BULK_ORDERS = 500
+
+class BulkOrderTransition(BaseModel):
+    order_ids: List[UUID] = Field(min_length=1, max_length=MAX_BULK_ORDERS)
+    # Target status; the action, required role and allowed sources follow from it
+    status: str
+
+class BulkPaymentConfirmation(BaseModel):
+    order_ids: List[UUID] = Field(min_length=1, max_length=MAX_BULK_ORDERS)
+
+class BulkOrderResult(BaseModel):
+    id: UUID
+    outcome: Literal["updated", "unchanged", "not_found", "forbidden", "conflict"]
+    order: Optional[OrderRead] = None
+    detail: Optional[str] = None
+
+class BulkOrderTransitionRead(BaseModel):
+    status: str
+    updated: int
+    results: List[BulkOrderResult]
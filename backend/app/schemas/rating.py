@@ -0,0 +1,14 @@
+from typing import Dict, Optional
+from uuid import UUID
+from pydantic import BaseModel
+
+class RatingSummaryRead(BaseModel):
+    user_id: UUID
+    review_count: int = 0
+    average_rating: Optional[float] = None
+    # Number of reviews per star value, "1" through "5"
+    histogram: Dict[str, int]
+
+class GigRatingRead(RatingSummaryRead):
+    # A gig is rated through its freelancer
+    gig_id: UUID
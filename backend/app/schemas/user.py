@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from pydantic import BaseModel
+
+class UserSummary(BaseModel):
+    # Public profile fields embedded in other resources
+    id: UUID
+    full_name: str
+    avatar_url: Optional[str] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class UserRead(UserSummary):
+    # The signed-in user's own profile (never the password hash)
+    email: str
+    bio: Optional[str] = None
+    is_admin: bool
+    created_at: datetime
@@ -0,0 +1,112 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models.conversation import Conversation
+from app.models.message import Message
+from app.schemas.conversation import ConversationRead
+
+# Characters of the latest message kept on the conversation row for inbox rendering
+PREVIEW_LENGTH = 140
+
+
+def ordered_pair(user_id: UUID, other_id: UUID) -> Tuple[UUID, UUID]:
+    """Canonical (user_a_id, user_b_id) for a pair of users."""
+    return (user_id, other_id) if user_id <= other_id else (other_id, user_id)
+
+
+def pair_filter(user_id: UUID, other_id: UUID):
+    user_a_id, user_b_id = ordered_pair(user_id, other_id)
+    return (Conversation.user_a_id == user_a_id) & (Conversation.user_b_id == user_b_id)
+
+
+def to_read(conversation: Conversation, viewer_id: UUID) -> ConversationRead:
+    """Projects a conversation row onto one participant's point of view."""
+    is_a = conversation.user_a_id == viewer_id
+    return ConversationRead(
+        id=conversation.id,
+        peer_id=conversation.user_b_id if is_a else conversation.user_a_id,
+        last_message_id=conversation.last_message_id,
+        last_sender_id=conversation.last_sender_id,
+        last_message_preview=conversation.last_message_preview,
+        last_message_at=conversation.last_message_at,
+        unread_count=conversation.unread_a if is_a else conversation.unread_b,
+    )
+
+
+async def record_message(session: AsyncSession, message: Message):
+    """Folds a single new message into its conversation; see record_messages."""
+    await record_messages(session, [message])
+
+
+async def record_messages(session: AsyncSession, messages: Sequence[Message]):
+    """
+    Folds new messages into their conversation rows inside the caller's transaction.
+    The messages must already be flushed (the rows reference them). A batch costs
+    one UPDATE per distinct pair, however many messages it holds.
+    """
+    by_pair: Dict[Tuple[UUID, UUID], List[Message]] = {}
+    for message in messages:
+        by_pair.setdefault(ordered_pair(message.sender_id, message.receiver_id), []).append(message)
+
+    for (user_a_id, user_b_id), group in by_pair.items():
+        last = max(group, key=lambda message: (message.created_at, str(message.id)))
+        unread = {"unread_a": 0, "unread_b": 0}
+        for message in group:
+            if message.sender_id != message.receiver_id:
+                unread["unread_b" if message.receiver_id == user_b_id else "unread_a"] += 1
+        await _fold(session, user_a_id, user_b_id, last, {field: n for field, n in unread.items() if n})
+
+
+async def _fold(session: AsyncSession, user_a_id: UUID, user_b_id: UUID, last: Message, unread: Dict[str, int]):
+    """
+    Receivers' unread counters are incremented in SQL, so concurrent senders never
+    lose an update. The first message of a pair inserts the row inside a savepoint;
+    if a concurrent request created it first, we fall back to the update.
+    """
+    values = {
+        "last_message_id": last.id,
+        "last_sender_id": last.sender_id,
+        "last_message_preview": last.content[:PREVIEW_LENGTH],
+        "last_message_at": last.created_at,
+    }
+    increments = {field: getattr(Conversation, field) + n for field, n in unread.items()}
+
+    statement = update(Conversation).where(
+        Conversation.user_a_id == user_a_id,
+        Conversation.user_b_id == user_b_id,
+        # Never let a late, older message overwrite a newer one
+        Conversation.last_message_at <= last.created_at,
+    ).values(**values, **increments)
+    result = await session.exec(statement)
+    if result.rowcount:
+        return
+
+    existing = (await session.exec(select(Conversation.id).where(pair_filter(user_a_id, user_b_id)))).first()
+    if existing is not None:
+        # Out-of-order messages: only the unread counters move
+        if increments:
+            await session.exec(update(Conversation).where(Conversation.id == existing).values(**increments))
+        return
+
+    try:
+        async with session.begin_nested():
+            session.add(Conversation(user_a_id=user_a_id, user_b_id=user_b_id, **values, **unread))
+    except IntegrityError:
+        await _fold(session, user_a_id, user_b_id, last, unread)
+
+
+async def exists(session: AsyncSession, user_id: UUID, other_id: UUID) -> bool:
+    """Whether the pair has exchanged messages (one unique-index lookup)."""
+    return (await session.exec(select(Conversation.id).where(pair_filter(user_id, other_id)))).first() is not None
+
+
+async def mark_read(session: AsyncSession, viewer_id: UUID, peer_id: UUID) -> Optional[Conversation]:
+    """Resets the viewer's unread counter; returns the conversation (None if the pair never chatted)."""
+    user_a_id, _ = ordered_pair(viewer_id, peer_id)
+    unread_field = "unread_a" if viewer_id == user_a_id else "unread_b"
+    await session.exec(update(Conversation).where(pair_filter(viewer_id, peer_id)).values(**{unread_field: 0}))
+    conversation = (await session.exec(select(Conversation).where(pair_filter(viewer_id, peer_id)))).first()
+    await session.commit()
+    return conversation
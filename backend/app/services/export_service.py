@@ -0,0 +1,78 @@
+from datetime import datetime
+from typing import Any, AsyncIterator, List, Literal, Optional
+from uuid import UUID
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from sqlmodel import select, tuple_
+from app.config import settings
+from app.core.serialization import RowSerializer
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+
+def export_statement(
+    serializer: RowSerializer,
+    model,
+    conditions: List[Any],
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    resume_from: Optional[Any] = None,
+):
+    """
+    The export's rows, oldest first by (created_at, id) so an interrupted
+    export resumes by appending. `resume_from` is the (created_at, id) of the
+    last row the client received.
+    """
+    statement = serializer.select().where(*conditions)
+    if since is not None:
+        statement = statement.where(model.created_at >= since)
+    if until is not None:
+        statement = statement.where(model.created_at < until)
+    if resume_from is not None:
+        statement = statement.where(tuple_(model.created_at, model.id) > tuple_(*resume_from))
+    return statement.order_by(model.created_at, model.id)
+
+
+async def resume_point(sessions, model, after: Optional[UUID], conditions: List[Any]):
+    """
+    (created_at, id) of the row an export resumes after, checked before the
+    response starts so a bad cursor is still a 400. The session is closed
+    again before any data is streamed.
+    """
+    if after is None:
+        return None
+    async with sessions() as session:
+        row = (await session.exec(select(model.created_at, model.id).where(model.id == after, *conditions))).first()
+    if row is None:
+        raise HTTPException(status_code=400, detail="Unknown export cursor")
+    return tuple(row)
+
+
+async def stream_rows(sessions, statement, serializer: RowSerializer, format: ExportFormat) -> AsyncIterator[bytes]:
+    """
+    Streams the statement's rows in batches through a server-side cursor.
+    The session lives inside the generator: it is opened when the first chunk
+    is pulled and closed when the export ends or the client goes away, and at
+    most one batch is held in memory.
+    """
+    batch_size = settings.EXPORT_BATCH_SIZE
+    async with sessions() as session:
+        result = await session.stream(statement.execution_options(yield_per=batch_size))
+        if format == "csv":
+            yield serializer.dump_csv([], header=True)
+        async for rows in result.partitions():
+            yield serializer.dump_csv(rows) if format == "csv" else serializer.dump_ndjson(rows)
+
+
+def export_response(sessions, statement, serializer: RowSerializer, format: ExportFormat, name: str) -> StreamingResponse:
+    filename = f"{name}-{datetime.utcnow():%Y%m%dT%H%M%S}.{format}"
+    return StreamingResponse(
+        stream_rows(sessions, statement, serializer, format),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Cache-Control": "no-store",
+        },
+    )
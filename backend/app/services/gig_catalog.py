@@ -0,0 +1,53 @@
+from typing import Awaitable, Callable, List, Optional
+from fastapi import Request
+from pydantic import TypeAdapter
+from app.config import settings
+from app.core import read_routing
+from app.core.read_cache import ReadThroughCache, create_cache_backend
+from app.core.serialization import RowSerializer
+from app.models.gig import Gig
+from app.schemas.gig import GigExpandedRead, GigRead
+
+# Gig list pages and single gigs, serialized once and replayed from cache.
+# Any gig write bumps the namespace version, which invalidates every entry.
+catalog_cache = ReadThroughCache(
+    create_cache_backend(settings.CACHE_URL, settings.CATALOG_CACHE_MAX_SIZE, settings.CATALOG_CACHE_TTL_SECONDS),
+    namespace="devmart:gigs",
+    ttl=settings.CATALOG_CACHE_TTL_SECONDS,
+)
+
+gig_expanded_list_adapter = TypeAdapter(List[GigExpandedRead])
+gig_rows = RowSerializer(GigRead, Gig)
+
+
+def _format(expand: bool, columnar: bool) -> str:
+    return "expanded" if expand else "columnar" if columnar else "list"
+
+
+def list_key(active_only: bool, skip: int, limit: int, cursor: Optional[str], expand: bool = False, columnar: bool = False) -> str:
+    return f"{_format(expand, columnar)}:{int(active_only)}:{skip}:{limit}:{cursor or ''}"
+
+
+def search_key(terms, skip: int, limit: int, columnar: bool = False, **filters) -> str:
+    parts = [" ".join(terms), str(skip), str(limit)] + [f"{name}={filters[name]}" for name in sorted(filters)]
+    return f"search{':columnar' if columnar else ''}:" + "|".join(parts)
+
+
+def detail_key(gig_id) -> str:
+    return f"gig:{gig_id}"
+
+
+async def get_or_load(request: Request, key: str, loader: Callable[[], Awaitable[bytes]]) -> bytes:
+    """
+    Cached catalog response, except for a client inside its read-your-writes
+    window: its session is on the primary, and the shared entry may have been
+    filled from a lagging replica after the write invalidated the cache.
+    """
+    if read_routing.replicas_enabled() and read_routing.wants_primary(request):
+        return await loader()
+    return await catalog_cache.get_or_load(key, loader)
+
+
+async def invalidate():
+    """Call after every committed gig write."""
+    await catalog_cache.invalidate()
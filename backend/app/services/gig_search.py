@@ -0,0 +1,88 @@
+import re
+from decimal import Decimal
+from typing import Optional, Sequence
+from sqlalchemy import column, func, literal_column, or_, table, text
+from sqlmodel import select
+from app.models.gig import SEARCH_CONFIG, Gig, search_document
+from app.models.rating import UserRatingSummary
+
+# Search terms are reduced to word tokens; quoting, operators and column
+# filters in user input never reach the FTS engine.
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+MAX_TERMS = 16
+
+# The SQLite FTS5 table created alongside gig (see app/models/gig.py)
+gig_fts = table("gig_fts", column("gig_id"))
+
+
+def search_terms(q: str):
+    return _TOKEN.findall(q.lower())[:MAX_TERMS]
+
+
+# Both backends match every term and the last one as a prefix, so results
+# follow the user's typing ("logo des" finds "Logo design") the same way.
+# Terms are stemmed on both (porter / the english config) before matching.
+
+def fts5_query(terms) -> str:
+    """FTS5 MATCH input; each term is quoted, so nothing in it acts as an operator."""
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def tsquery_text(terms) -> str:
+    """Input for to_tsquery; safe to build by hand because terms are word tokens only."""
+    quoted = [f"'{term}'" for term in terms]
+    quoted[-1] += ":*"
+    return " & ".join(quoted)
+
+
+def apply_filters(
+    query,
+    min_price: Optional[Decimal] = None,
+    max_price: Optional[Decimal] = None,
+    max_delivery_days: Optional[int] = None,
+    min_rating: Optional[float] = None,
+):
+    query = query.where(Gig.is_active == True)
+    if min_price is not None:
+        query = query.where(Gig.price >= min_price)
+    if max_price is not None:
+        query = query.where(Gig.price <= max_price)
+    if max_delivery_days is not None:
+        query = query.where(Gig.delivery_days <= max_delivery_days)
+    if min_rating is not None:
+        # Precomputed per-freelancer totals: a primary-key join instead of averaging reviews
+        query = query.join(UserRatingSummary, UserRatingSummary.user_id == Gig.freelancer_id).where(
+            UserRatingSummary.review_count > 0,
+            UserRatingSummary.rating_sum >= UserRatingSummary.review_count * min_rating,
+        )
+    return query
+
+
+def search_statement(dialect: str, terms, limit: int, skip: int = 0, columns: Optional[Sequence] = None, **filters):
+    """
+    Active gigs matching every term, best match first. Uses the GIN expression
+    index on Postgres, the gig_fts FTS5 table on SQLite and a LIKE scan elsewhere.
+    Selects `columns` (rows) instead of whole gigs when given.
+    """
+    entities = columns or [Gig]
+    if dialect == "postgresql":
+        document = search_document(Gig.title, Gig.description)
+        tsquery = func.to_tsquery(literal_column(f"'{SEARCH_CONFIG}'::regconfig"), tsquery_text(terms))
+        query = select(*entities).where(document.op("@@")(tsquery)) \
+            .order_by(func.ts_rank_cd(document, tsquery).desc(), Gig.created_at.desc(), Gig.id)
+    elif dialect == "sqlite":
+        # bm25() is lower-is-better; the title column counts ten times the description (gig_id is unindexed)
+        query = select(*entities).join(gig_fts, gig_fts.c.gig_id == Gig.id) \
+            .where(text("gig_fts MATCH :fts_query").bindparams(fts_query=fts5_query(terms))) \
+            .order_by(text("bm25(gig_fts, 0.0, 10.0, 1.0)"), Gig.created_at.desc(), Gig.id)
+    else:
+        query = select(*entities)
+        for term in terms:
+            pattern = f"%{term}%"
+            query = query.where(or_(Gig.title.ilike(pattern), Gig.description.ilike(pattern)))
+        query = query.order_by(Gig.created_at.desc(), Gig.id)
+
+    query = apply_filters(query, **filters)
+    return query.offset(skip).limit(limit)
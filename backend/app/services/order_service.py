@@ -1,7 +1,14 @@
-from typing import Dict, List, Optional
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
 from fastapi import HTTPException
-from sqlmodel import Session
-from app.models.order import Order
+from sqlmodel import select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models.order import Order, OrderStatus, PaymentStatus
+from app.models.payment import PaymentProof
+from app.schemas.order import BulkOrderResult, OrderExpandedRead, OrderRead
+from app.services import outbox
 
 # VALID_TRANSITIONS defines the allowed state machine for an Order.
 # Each key is a current status, and the value is a list of allowed next statuses.
@@ -15,6 +22,36 @@ VALID_TRANSITIONS: Dict[str, List[str]] = {
     "REVISION_REQUESTED": ["IN_PROGRESS"],
 }
 
+# Who may request each target status (a participant's role on the order)
+CLIENT = "client"
+FREELANCER = "freelancer"
+
+@dataclass(frozen=True)
+class Transition:
+    """One user-facing action on an order (the last path segment of its PATCH route)."""
+    action: str
+    target: str
+    role: str
+    # Also marks the order's payment (and its proof) verified
+    verifies_payment: bool = False
+
+    @property
+    def sources(self) -> List[str]:
+        # Statuses this action may start from, derived from VALID_TRANSITIONS
+        return [status for status, allowed in VALID_TRANSITIONS.items() if self.target in allowed]
+
+TRANSITIONS: Dict[str, Transition] = {t.action: t for t in [
+    Transition("submit-payment", OrderStatus.PAYMENT_SUBMITTED, CLIENT),
+    Transition("confirm-payment", OrderStatus.PAYMENT_CONFIRMED, FREELANCER, verifies_payment=True),
+    Transition("start-work", OrderStatus.IN_PROGRESS, FREELANCER),
+    Transition("submit-work", OrderStatus.SUBMITTED, FREELANCER),
+    Transition("approve", OrderStatus.COMPLETED, CLIENT),
+    Transition("revision", OrderStatus.REVISION_REQUESTED, CLIENT),
+]}
+
+# Every target status is reached by exactly one action
+TRANSITIONS_BY_TARGET: Dict[str, Transition] = {t.target: t for t in TRANSITIONS.values()}
+
 def validate_transition(current_status: str, new_status: str) -> bool:
     """
     Checks if a status transition is valid according to the VALID_TRANSITIONS map.
@@ -22,36 +59,191 @@ def validate_transition(current_status: str, new_status: str) -> bool:
     allowed_next_statuses = VALID_TRANSITIONS.get(current_status, [])
     return new_status in allowed_next_statuses
 
-def change_order_status(session: Session, order: Order, new_status: str) -> Order:
+def role_column(role: str):
+    return Order.client_id if role == CLIENT else Order.freelancer_id
+
+def transition_statement(transition: Transition, order_ids: List[UUID], user_id: UUID, expected_version: Optional[int] = None):
+    """
+    The whole transition as one conditional, set-based statement:
+
+        UPDATE order SET status=:target, version=version+1
+        WHERE id IN (:ids) AND <role>_id=:user AND status IN (:sources) [AND version=:expected]
+        RETURNING *
+
+    The status check and the write are a single atomic step, so of two
+    concurrent conflicting actions exactly one matches a row.
+    """
+    conditions = [
+        Order.id.in_(order_ids),
+        role_column(transition.role) == user_id,
+        Order.status.in_(transition.sources),
+    ]
+    if expected_version is not None:
+        conditions.append(Order.version == expected_version)
+    values = {"status": transition.target, "version": Order.version + 1, "updated_at": datetime.utcnow()}
+    if transition.verifies_payment:
+        values["payment_status"] = PaymentStatus.VERIFIED
+    return update(Order).where(*conditions).values(**values) \
+        .returning(Order).execution_options(synchronize_session=False)
+
+async def mark_proofs_verified(session: AsyncSession, order_ids: List[UUID]):
+    if order_ids:
+        await session.exec(
+            update(PaymentProof).where(PaymentProof.order_id.in_(order_ids)).values(verified=True)
+            .execution_options(synchronize_session=False)
+        )
+
+def status_changed_event(order: Order):
+    return outbox.new_event(
+        "order", order.id, outbox.ORDER_STATUS_CHANGED, OrderRead.model_validate(order),
+        [order.client_id, order.freelancer_id],
+    )
+
+async def try_transition(
+    session: AsyncSession,
+    order_id: UUID,
+    action: str,
+    user_id: UUID,
+    expected_version: Optional[int] = None,
+) -> Optional[Order]:
     """
-    Updates the order status after validating the transition.
-    
-    Args:
-        session (Session): The database session.
-        order (Order): The order object to update.
-        new_status (str): The target status.
+    Runs the conditional UPDATE and records the outbox event (not committed).
+    None when no row matched.
+    """
+    transition = TRANSITIONS[action]
+    order = (await session.exec(transition_statement(transition, [order_id], user_id, expected_version))).scalar_one_or_none()
+    if order is not None:
+        if transition.verifies_payment:
+            await mark_proofs_verified(session, [order.id])
+        await outbox.record(session, [status_changed_event(order)])
+    return order
+
+def conflict_reason(
+    current: Optional[Order],
+    transition: Transition,
+    user_id: UUID,
+    expected_version: Optional[int] = None,
+) -> Optional[Tuple[int, str]]:
+    """
+    Why a transition matched no row, as (HTTP status, detail); None when the
+    action had already taken effect, which is not an error.
+    """
+    if current is None:
+        return 404, "Order not found"
+    if getattr(current, f"{transition.role}_id") != user_id:
+        return 403, "Not authorized"
+    if expected_version is not None and current.version != expected_version:
+        return 409, f"Order was modified (current version {current.version})"
+    if current.status == transition.target:
+        return None
+    return 409, f"Invalid status transition from '{current.status}' to '{transition.target}'"
+
+async def explain_conflict(
+    session: AsyncSession,
+    order_id: UUID,
+    action: str,
+    user_id: UUID,
+    expected_version: Optional[int] = None,
+) -> Order:
+    """
+    Works out why a transition matched no row. Only reached on the failure path,
+    so a successful transition never pays for this read.
 
     Raises:
-        HTTPException: If the transition is invalid (400 Bad Request).
-    
+        HTTPException: 404 if the order does not exist, 403 if the user does not
+        hold the required role, 409 if the order's status (or version) does not
+        allow the action.
+
     Returns:
-        Order: The updated and refreshed order object.
-    """
-    current_status = order.status
-    
-    # Idempotency check: if status is already set, do nothing.
-    if current_status == new_status:
-        return order
-
-    if not validate_transition(current_status, new_status):
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid status transition from '{current_status}' to '{new_status}'"
-        )
-    
-    order.status = new_status
-    session.add(order)
-    session.commit()
-    session.refresh(order)
-    
+        Order: The unchanged order when the action had already taken effect.
+    """
+    current = await session.get(Order, order_id)
+    reason = conflict_reason(current, TRANSITIONS[action], user_id, expected_version)
+    if reason is not None:
+        raise HTTPException(status_code=reason[0], detail=reason[1])
+    return current
+
+async def apply_transition(
+    session: AsyncSession,
+    order_id: UUID,
+    action: str,
+    user_id: UUID,
+    expected_version: Optional[int] = None,
+) -> Order:
+    """
+    Applies an order action with one round-trip and commits it.
+
+    Returns:
+        Order: The updated order.
+    """
+    order = await try_transition(session, order_id, action, user_id, expected_version)
+    if order is None:
+        return await explain_conflict(session, order_id, action, user_id, expected_version)
+    await session.commit()
     return order
+
+# Per-item outcomes of a bulk transition, keyed by the status explain_conflict would raise
+BULK_OUTCOMES = {404: "not_found", 403: "forbidden", 409: "conflict"}
+
+async def apply_bulk_transition(
+    session: AsyncSession,
+    order_ids: List[UUID],
+    target: str,
+    user_id: UUID,
+) -> List[BulkOrderResult]:
+    """
+    Moves many orders to `target` in one transaction: a single set-based UPDATE
+    for every order whose current status allows it (per VALID_TRANSITIONS) and
+    whose required role the user holds, then one SELECT to explain the rest.
+    Orders that fail are reported per item and do not block the others.
+
+    Raises:
+        HTTPException: 400 if no action leads to `target`.
+
+    Returns:
+        List[BulkOrderResult]: One result per distinct id, in request order.
+    """
+    transition = TRANSITIONS_BY_TARGET.get(target)
+    if transition is None:
+        raise HTTPException(status_code=400, detail=f"No transition leads to status '{target}'")
+    order_ids = list(dict.fromkeys(order_ids))
+
+    updated = {order.id: order for order in (await session.exec(transition_statement(transition, order_ids, user_id))).scalars()}
+    if transition.verifies_payment:
+        await mark_proofs_verified(session, list(updated))
+    await outbox.record(session, [status_changed_event(order) for order in updated.values()])
+
+    remaining = [order_id for order_id in order_ids if order_id not in updated]
+    current = {}
+    if remaining:
+        current = {order.id: order for order in (await session.exec(select(Order).where(Order.id.in_(remaining)))).all()}
+    await session.commit()
+
+    results = []
+    for order_id in order_ids:
+        if order_id in updated:
+            results.append(BulkOrderResult(id=order_id, outcome="updated", order=updated[order_id]))
+            continue
+        order = current.get(order_id)
+        reason = conflict_reason(order, transition, user_id)
+        if reason is None:
+            results.append(BulkOrderResult(id=order_id, outcome="unchanged", order=order))
+        else:
+            # The current order is only echoed back to a participant who holds the role
+            outcome = BULK_OUTCOMES[reason[0]]
+            results.append(BulkOrderResult(id=order_id, outcome=outcome, detail=reason[1],
+                                           order=order if outcome == "conflict" else None))
+    return results
+
+def to_expanded_read(order: Order, viewer_id: UUID) -> OrderExpandedRead:
+    """
+    Projects an order with eagerly loaded gig, client, freelancer and payment
+    proof onto the viewer's dashboard row.
+    """
+    counterpart = order.freelancer if order.client_id == viewer_id else order.client
+    return OrderExpandedRead.model_validate({
+        **order.model_dump(),
+        "gig": order.gig,
+        "counterpart": counterpart,
+        "payment_proof": order.payment_proof,
+    }, from_attributes=True)
@@ -0,0 +1,269 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from uuid import UUID
+from pydantic import BaseModel
+from sqlalchemy import event, exists
+from sqlalchemy.orm import Session, aliased
+from sqlmodel import delete, func, insert, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.config import settings
+from app import database
+from app.models.message import Message
+from app.models.outbox import OutboxEvent
+from app.schemas.message import MessageRead
+
+logger = logging.getLogger(__name__)
+
+# Event types
+ORDER_STATUS_CHANGED = "order.status_changed"
+MESSAGE_CREATED = "message.created"
+REVIEW_CREATED = "review.created"
+
+# Key of the Postgres advisory lock held while draining, so one worker dispatches at a time
+DISPATCH_LOCK_KEY = 0x6F757462  # "outb"
+
+Consumer = Callable[[OutboxEvent], Awaitable[None]]
+
+
+def new_event(aggregate_type: str, aggregate_id: UUID, event_type: str, data: BaseModel, recipients: List[UUID]) -> Dict[str, Any]:
+    """Column values of one outbox row; `recipients` are the users to notify."""
+    return {
+        "aggregate_type": aggregate_type,
+        "aggregate_id": aggregate_id,
+        "event_type": event_type,
+        "payload": {"data": data.model_dump(mode="json"), "recipients": [str(user_id) for user_id in recipients]},
+        "created_at": datetime.utcnow(),
+        "available_at": datetime.utcnow(),
+    }
+
+
+def message_event(message: Message) -> Dict[str, Any]:
+    # Keyed by sender so one sender's messages are delivered in the order they were written
+    return new_event("message", message.sender_id, MESSAGE_CREATED, MessageRead.model_validate(message), [message.receiver_id])
+
+
+async def record(session: AsyncSession, events: List[Dict[str, Any]]):
+    """
+    Adds events to the caller's transaction (one multi-row INSERT). They become
+    visible to the dispatcher only if, and when, that transaction commits.
+    """
+    if not events:
+        return
+    await session.exec(insert(OutboxEvent), params=events)
+    session.info["outbox_pending"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_dispatcher(session):
+    # Saves the dispatcher a polling interval when this worker has just written events
+    if session.info.pop("outbox_pending", False):
+        dispatcher.wake()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_events(session):
+    session.info.pop("outbox_pending", None)
+
+
+class DispatcherStats:
+    def __init__(self):
+        self.batches = 0
+        self.dispatched = 0
+        self.retried = 0
+        self.failed = 0
+        # Seconds between an event's commit and its delivery
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.lock_contended = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "dispatched": self.dispatched,
+            "retried": self.retried,
+            "failed": self.failed,
+            "last_lag_seconds": round(self.last_lag, 3),
+            "max_lag_seconds": round(self.max_lag, 3),
+            "lock_contended": self.lock_contended,
+        }
+
+
+def deliverable_statement(now: datetime, limit: int):
+    """
+    Undelivered events in id order, skipping any whose aggregate still has an
+    earlier event waiting for a retry, so one aggregate's events are never
+    delivered out of order. Earlier events that are due sort ahead in the same batch.
+    """
+    earlier = aliased(OutboxEvent)
+    blocked = exists().where(
+        earlier.aggregate_id == OutboxEvent.aggregate_id,
+        earlier.id < OutboxEvent.id,
+        earlier.dispatched_at.is_(None),
+        earlier.failed_at.is_(None),
+        earlier.available_at > now,
+    )
+    return select(OutboxEvent).where(
+        OutboxEvent.dispatched_at.is_(None),
+        OutboxEvent.failed_at.is_(None),
+        OutboxEvent.available_at <= now,
+        ~blocked,
+    ).order_by(OutboxEvent.id).limit(limit)
+
+
+class OutboxDispatcher:
+    """
+    Drains the outbox in batches and hands each event to every subscribed
+    consumer (WebSocket push today; email or webhooks later). Delivery is
+    at-least-once: an event is marked dispatched after all consumers succeed,
+    and retried with exponential backoff when one fails.
+    """
+
+    def __init__(
+        self,
+        session_factory=None,
+        batch_size: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        retry_base: Optional[float] = None,
+    ):
+        # Default resolved on first use, so creating the dispatcher does not build the engine
+        self._session_factory = session_factory
+        self.batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+        self.poll_interval = poll_interval if poll_interval is not None else settings.OUTBOX_POLL_INTERVAL_MS / 1000
+        self.max_attempts = max_attempts or settings.OUTBOX_MAX_ATTEMPTS
+        self.retry_base = retry_base if retry_base is not None else settings.OUTBOX_RETRY_BASE_SECONDS
+        self.consumers: List[Consumer] = []
+        self.stats = DispatcherStats()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._last_purge = datetime.min
+
+    @property
+    def session_factory(self):
+        return self._session_factory or database.AsyncSessionLocal
+
+    def subscribe(self, consumer: Consumer):
+        if consumer not in self.consumers:
+            self.consumers.append(consumer)
+
+    def wake(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._wakeup = None
+
+    async def _run(self):
+        while True:
+            try:
+                delivered = await self.dispatch_once()
+            except Exception:
+                logger.exception("Outbox dispatch failed")
+                delivered = 0
+            # A full batch means more is probably waiting
+            if delivered < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+
+    async def dispatch_once(self) -> int:
+        """Delivers one batch; returns the number of events that were attempted."""
+        async with self.session_factory() as session:
+            if session.bind.dialect.name == "postgresql":
+                # Transaction-scoped: released by the commit below
+                locked = (await session.exec(select(func.pg_try_advisory_xact_lock(DISPATCH_LOCK_KEY)))).one()
+                if not locked:
+                    self.stats.lock_contended += 1
+                    return 0
+            now = datetime.utcnow()
+            events = (await session.exec(deliverable_statement(now, self.batch_size))).all()
+            if not events:
+                await self._purge(session, now)
+                await session.commit()
+                return 0
+
+            delivered, failed_aggregates = [], set()
+            for outbox_event in events:
+                # An earlier event of this aggregate failed in this batch: keep the rest behind it
+                if outbox_event.aggregate_id in failed_aggregates:
+                    continue
+                try:
+                    for consumer in self.consumers:
+                        await consumer(outbox_event)
+                except Exception as exc:
+                    failed_aggregates.add(outbox_event.aggregate_id)
+                    self._schedule_retry(outbox_event, exc, now)
+                    continue
+                delivered.append(outbox_event)
+
+            if delivered:
+                dispatched_at = datetime.utcnow()
+                await session.exec(
+                    update(OutboxEvent).where(OutboxEvent.id.in_([e.id for e in delivered]))
+                    .values(dispatched_at=dispatched_at).execution_options(synchronize_session=False)
+                )
+                lags = [(dispatched_at - e.created_at).total_seconds() for e in delivered]
+                self.stats.last_lag = lags[-1]
+                self.stats.max_lag = max(self.stats.max_lag, *lags)
+                self.stats.dispatched += len(delivered)
+            self.stats.batches += 1
+            await session.commit()
+            return len(events)
+
+    def _schedule_retry(self, outbox_event: OutboxEvent, exc: Exception, now: datetime):
+        # Changes are flushed by the batch commit
+        outbox_event.attempts += 1
+        outbox_event.last_error = repr(exc)[:500]
+        if outbox_event.attempts >= self.max_attempts:
+            outbox_event.failed_at = now
+            self.stats.failed += 1
+            logger.error("Outbox event %s (%s) failed %d times, giving up: %r",
+                         outbox_event.id, outbox_event.event_type, outbox_event.attempts, exc)
+        else:
+            delay = min(self.retry_base * 2 ** (outbox_event.attempts - 1), settings.OUTBOX_RETRY_MAX_SECONDS)
+            outbox_event.available_at = now + timedelta(seconds=delay)
+            self.stats.retried += 1
+            logger.warning("Outbox event %s (%s) failed, retrying in %.1fs: %r",
+                           outbox_event.id, outbox_event.event_type, delay, exc)
+
+    async def _purge(self, session: AsyncSession, now: datetime):
+        """Deletes delivered events past the retention window, at most once a minute."""
+        if settings.OUTBOX_RETENTION_HOURS <= 0 or now - self._last_purge < timedelta(minutes=1):
+            return
+        self._last_purge = now
+        cutoff = now - timedelta(hours=settings.OUTBOX_RETENTION_HOURS)
+        await session.exec(delete(OutboxEvent).where(OutboxEvent.dispatched_at < cutoff))
+
+
+async def backlog(session: AsyncSession) -> Dict[str, Any]:
+    """Undelivered events and the age of the oldest one: the dispatcher's lag as seen from the table."""
+    pending, oldest = (await session.exec(
+        select(func.count(), func.min(OutboxEvent.created_at))
+        .where(OutboxEvent.dispatched_at.is_(None), OutboxEvent.failed_at.is_(None))
+    )).one()
+    failed = (await session.exec(select(func.count()).where(OutboxEvent.failed_at.is_not(None)))).one()
+    return {
+        "pending": pending,
+        "oldest_pending_age_seconds": round((datetime.utcnow() - oldest).total_seconds(), 3) if oldest else 0.0,
+        "failed": failed,
+    }
+
+
+dispatcher = OutboxDispatcher()
@@ -0,0 +1,75 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from sqlalchemy import case, delete, func, insert, literal
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models.rating import UserRatingSummary
+from app.models.review import Review
+from app.schemas.rating import RatingSummaryRead
+
+STARS = range(1, 6)
+
+
+def star_column(rating: int):
+    return getattr(UserRatingSummary, f"stars_{rating}")
+
+
+async def record_review(session: AsyncSession, reviewee_id: UUID, rating: int):
+    """
+    Adds one review to the reviewee's summary inside the caller's transaction.
+    Counters are incremented in SQL so concurrent reviews never lose an update;
+    the first review of a user inserts the row inside a savepoint and falls
+    back to the update if a concurrent request created it first.
+    """
+    statement = update(UserRatingSummary).where(UserRatingSummary.user_id == reviewee_id).values(
+        review_count=UserRatingSummary.review_count + 1,
+        rating_sum=UserRatingSummary.rating_sum + rating,
+        updated_at=datetime.utcnow(),
+        **{f"stars_{rating}": star_column(rating) + 1},
+    )
+    result = await session.exec(statement)
+    if result.rowcount:
+        return
+
+    try:
+        async with session.begin_nested():
+            session.add(UserRatingSummary(
+                user_id=reviewee_id, review_count=1, rating_sum=rating, **{f"stars_{rating}": 1}
+            ))
+    except IntegrityError:
+        await record_review(session, reviewee_id, rating)
+
+
+def to_read(user_id: UUID, summary: Optional[UserRatingSummary]) -> RatingSummaryRead:
+    """Users without reviews get an empty summary rather than a 404."""
+    if summary is None or not summary.review_count:
+        return RatingSummaryRead(user_id=user_id, histogram={str(star): 0 for star in STARS})
+    return RatingSummaryRead(
+        user_id=user_id,
+        review_count=summary.review_count,
+        average_rating=round(summary.rating_sum / summary.review_count, 2),
+        histogram={str(star): getattr(summary, f"stars_{star}") for star in STARS},
+    )
+
+
+def rebuild_statements():
+    """DELETE + INSERT ... SELECT that recompute every summary from the review table."""
+    aggregates = select(
+        Review.reviewee_id,
+        func.count(),
+        func.sum(Review.rating),
+        *[func.sum(case((Review.rating == star, 1), else_=0)) for star in STARS],
+        literal(datetime.utcnow()),
+    ).group_by(Review.reviewee_id)
+    columns = ["user_id", "review_count", "rating_sum", *[f"stars_{star}" for star in STARS], "updated_at"]
+    return [delete(UserRatingSummary), insert(UserRatingSummary).from_select(columns, aggregates)]
+
+
+def rebuild_summaries(session: Session) -> int:
+    """Recomputes all summaries in one transaction; returns how many users have reviews."""
+    for statement in rebuild_statements():
+        session.exec(statement)
+    session.commit()
+    return session.exec(select(func.count()).select_from(UserRatingSummary)).one()
@@ -0,0 +1,13 @@
+from app.core.serialization import RowSerializer
+from app.models.message import Message
+from app.models.order import Order
+from app.models.review import Review
+from app.schemas.message import MessageRead
+from app.schemas.order import OrderRead
+from app.schemas.review import ReviewRead
+
+# One serializer per resource, shared by its list endpoint and its export, so
+# both always emit the same columns (the gig catalog's lives in gig_catalog).
+order_rows = RowSerializer(OrderRead, Order)
+message_rows = RowSerializer(MessageRead, Message)
+review_rows = RowSerializer(ReviewRead, Review)
@@ -0,0 +1,207 @@
+import asyncio
+import logging
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Called with (user_id, message) to hand a message to this worker's local sockets
+Deliver = Callable[[str, str], Awaitable[None]]
+
+
+class Backplane:
+    """
+    Routes a message addressed to a user to whichever worker(s) hold that user's
+    sockets. The ConnectionManager publishes every outbound message through its
+    backplane and the backplane calls `deliver` on the worker(s) that subscribed
+    to that user.
+    """
+
+    def __init__(self):
+        self._deliver: Optional[Deliver] = None
+
+    def attach(self, deliver: Deliver):
+        self._deliver = deliver
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    async def subscribe(self, user_id: str):
+        """Called when the first local socket of `user_id` connects."""
+
+    async def unsubscribe(self, user_id: str):
+        """Called when the last local socket of `user_id` disconnects."""
+
+    async def publish(self, user_id: str, message: str):
+        raise NotImplementedError
+
+
+class InProcessBackplane(Backplane):
+    """Single-worker deployments: publishing is a direct local delivery."""
+
+    async def publish(self, user_id: str, message: str):
+        await self._deliver(user_id, message)
+
+
+class PubSubBackplane(Backplane):
+    """
+    Fan-out through a pub/sub broker with one channel per user. A worker only
+    subscribes to the users connected to it, so it only receives their traffic.
+    """
+
+    def __init__(self, broker: "Broker", channel_prefix: str = "devmart:ws:"):
+        super().__init__()
+        self.broker = broker
+        self.channel_prefix = channel_prefix
+        self._listener: Optional[asyncio.Task] = None
+
+    def _channel(self, user_id: str) -> str:
+        return f"{self.channel_prefix}{user_id}"
+
+    async def start(self):
+        await self.broker.connect()
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        await self.broker.close()
+
+    async def subscribe(self, user_id: str):
+        await self.broker.subscribe(self._channel(user_id))
+
+    async def unsubscribe(self, user_id: str):
+        await self.broker.unsubscribe(self._channel(user_id))
+
+    async def publish(self, user_id: str, message: str):
+        await self.broker.publish(self._channel(user_id), message)
+
+    async def _listen(self):
+        async for channel, message in self.broker.listen():
+            if not channel.startswith(self.channel_prefix):
+                continue
+            try:
+                await self._deliver(channel[len(self.channel_prefix):], message)
+            except Exception:
+                # One bad socket must not stop delivery for everyone else on this worker
+                logger.exception("Backplane delivery failed for %s", channel)
+
+
+class Broker:
+    """Minimal pub/sub client interface used by PubSubBackplane."""
+
+    async def connect(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def publish(self, channel: str, message: str):
+        raise NotImplementedError
+
+    async def subscribe(self, channel: str):
+        raise NotImplementedError
+
+    async def unsubscribe(self, channel: str):
+        raise NotImplementedError
+
+    def listen(self) -> AsyncIterator[Tuple[str, str]]:
+        raise NotImplementedError
+
+
+class LocalBroker:
+    """
+    In-memory stand-in for a pub/sub server (tests, local development).
+    Each `client()` behaves like a separate worker's connection to the broker.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set["LocalBrokerClient"]] = {}
+
+    def client(self) -> "LocalBrokerClient":
+        return LocalBrokerClient(self)
+
+    def _publish(self, channel: str, message: str):
+        for client in self._subscribers.get(channel, ()):
+            client._queue.put_nowait((channel, message))
+
+
+class LocalBrokerClient(Broker):
+    def __init__(self, hub: LocalBroker):
+        self._hub = hub
+        self._queue: "asyncio.Queue[Tuple[str, str]]" = asyncio.Queue()
+
+    async def publish(self, channel: str, message: str):
+        self._hub._publish(channel, message)
+
+    async def subscribe(self, channel: str):
+        self._hub._subscribers.setdefault(channel, set()).add(self)
+
+    async def unsubscribe(self, channel: str):
+        subscribers = self._hub._subscribers.get(channel)
+        if subscribers is not None:
+            subscribers.discard(self)
+            if not subscribers:
+                del self._hub._subscribers[channel]
+
+    async def listen(self) -> AsyncIterator[Tuple[str, str]]:
+        while True:
+            yield await self._queue.get()
+
+
+class RedisBroker(Broker):
+    """Redis pub/sub via redis.asyncio (install the `redis` package to use it)."""
+
+    # Subscribed at start so the pubsub connection exists before any user connects
+    CONTROL_CHANNEL = "devmart:ws:_control"
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError as exc:
+            raise RuntimeError("WS_BACKPLANE_URL points to Redis but the 'redis' package is not installed") from exc
+        self._client = redis.from_url(url, decode_responses=True)
+        self._pubsub = self._client.pubsub()
+
+    async def connect(self):
+        await self._pubsub.subscribe(self.CONTROL_CHANNEL)
+
+    async def close(self):
+        await self._pubsub.aclose()
+        await self._client.aclose()
+
+    async def publish(self, channel: str, message: str):
+        await self._client.publish(channel, message)
+
+    async def subscribe(self, channel: str):
+        await self._pubsub.subscribe(channel)
+
+    async def unsubscribe(self, channel: str):
+        await self._pubsub.unsubscribe(channel)
+
+    async def listen(self) -> AsyncIterator[Tuple[str, str]]:
+        async for item in self._pubsub.listen():
+            if item["type"] == "message":
+                yield item["channel"], item["data"]
+
+
+def create_backplane(url: Optional[str]) -> Backplane:
+    """
+    Builds the backplane named by WS_BACKPLANE_URL:
+    `memory://` (default, single worker), `local://` (in-memory broker, for tests)
+    or `redis://host:port/db`.
+    """
+    if not url or url.startswith("memory://"):
+        return InProcessBackplane()
+    if url.startswith("local://"):
+        return PubSubBackplane(LocalBroker().client())
+    if url.startswith(("redis://", "rediss://")):
+        return PubSubBackplane(RedisBroker(url))
+    raise ValueError(f"Unsupported WS_BACKPLANE_URL: {url}")
@@ -1,25 +1,215 @@
-from typing import Dict
+import asyncio
+import json
+import time
+from typing import Awaitable, Callable, Dict, Optional, Set
 from uuid import UUID
 from fastapi import WebSocket
+from app.config import settings
+from app.websocket.backplane import Backplane, create_backplane
+from app.websocket.protocol import JsonCodec
+
+# Overflow policies for a client's outbound queue
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+CLOSE = "close"
+
+# Close code 1013 ("try again later") when a client cannot keep up; 1011 for a dead peer
+CLOSE_CODE_OVERLOADED = 1013
+CLOSE_CODE_TIMEOUT = 1011
+
+PING_FRAME = json.dumps({"type": "ping"})
+
+
+class ConnectionStats:
+    """Counters shared by every connection on this worker."""
 
-class ConnectionManager:
     def __init__(self):
-        # Maps user_id (as string) to their active WebSocket connection
-        self.active_connections: Dict[str, WebSocket] = {}
+        self.frames_sent = 0
+        self.frames_dropped = 0
+        self.closed_overflow = 0
+        self.reaped = 0
+
+
+class ClientConnection:
+    """
+    One socket with its own bounded outbound queue drained by a writer task.
+    Producers only ever enqueue, so a slow client never blocks whoever sends to it.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        user_id: str,
+        stats: ConnectionStats,
+        on_close: Callable[["ClientConnection"], Awaitable[None]],
+        codec: Optional[JsonCodec] = None,
+        queue_size: Optional[int] = None,
+        overflow_policy: Optional[str] = None,
+        send_timeout: Optional[float] = None,
+        pending: Optional[Set[asyncio.Task]] = None,
+    ):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.stats = stats
+        # Frames are queued as JSON text and converted to the socket's wire format on send
+        self.codec = codec or JsonCodec()
+        self.overflow_policy = overflow_policy or settings.WS_OVERFLOW_POLICY
+        self.send_timeout = send_timeout or settings.WS_SEND_TIMEOUT
+        self.queue: "asyncio.Queue[str]" = asyncio.Queue(maxsize=queue_size or settings.WS_QUEUE_SIZE)
+        self.last_seen = time.monotonic()
+        self.closed = False
+        # Peers this socket may send typing notices to, checked against the database once each
+        self.typing_peers: Set[UUID] = set()
+        self._on_close = on_close
+        self._writer: Optional[asyncio.Task] = None
+        # Tasks the connection spawns for itself; the manager awaits whatever is left on shutdown
+        self._pending = pending if pending is not None else set()
+
+    def start(self):
+        self._writer = asyncio.create_task(self._write_loop())
+
+    def touch(self):
+        """Records inbound activity (any frame, including pongs)."""
+        self.last_seen = time.monotonic()
+
+    def enqueue(self, message: str) -> bool:
+        """Queues a frame without waiting. Returns False if it (or an older frame) was dropped."""
+        if self.closed:
+            return False
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            pass
 
-    async def connect(self, websocket: WebSocket, user_id: UUID):
-        await websocket.accept()
-        self.active_connections[str(user_id)] = websocket
+        self.stats.frames_dropped += 1
+        if self.overflow_policy == DROP_OLDEST:
+            self.queue.get_nowait()
+            self.queue.put_nowait(message)
+        elif self.overflow_policy == CLOSE:
+            self.stats.closed_overflow += 1
+            task = asyncio.create_task(self.close(CLOSE_CODE_OVERLOADED))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+        return False
 
-    def disconnect(self, user_id: UUID):
+    async def _write_loop(self):
+        try:
+            while True:
+                payload = self.codec.encode(await self.queue.get())
+                send = self.websocket.send_bytes(payload) if isinstance(payload, bytes) else self.websocket.send_text(payload)
+                await asyncio.wait_for(send, self.send_timeout)
+                self.stats.frames_sent += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Send timed out or the socket is gone; either way this connection is finished
+            await self.close(CLOSE_CODE_TIMEOUT)
+
+    async def close(self, code: int = 1000):
+        if self.closed:
+            return
+        self.closed = True
+        if self._writer is not None and self._writer is not asyncio.current_task():
+            self._writer.cancel()
+        try:
+            await self.websocket.close(code=code)
+        except Exception:
+            pass
+        await self._on_close(self)
+
+
+class ConnectionManager:
+    def __init__(self, backplane: Optional[Backplane] = None):
+        # Maps user_id (as string) to every socket that user has open on this worker
+        self.active_connections: Dict[str, Set[ClientConnection]] = {}
+        self.stats = ConnectionStats()
+        # Cross-worker fan-out; messages reach local sockets through deliver_local
+        self.backplane = backplane or create_backplane(settings.WS_BACKPLANE_URL)
+        self.backplane.attach(self.deliver_local)
+        self._heartbeat: Optional[asyncio.Task] = None
+        # Overload closes scheduled by connections, kept referenced until they finish
+        self._pending: Set[asyncio.Task] = set()
+
+    async def start(self):
+        await self.backplane.start()
+        if settings.WS_HEARTBEAT_INTERVAL > 0:
+            self._heartbeat = asyncio.create_task(self._heartbeat_loop())
+
+    async def stop(self):
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            await asyncio.gather(self._heartbeat, return_exceptions=True)
+            self._heartbeat = None
+        for connection in [c for conns in self.active_connections.values() for c in conns]:
+            await connection.close(1001)
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        await self.backplane.stop()
+
+    async def connect(self, websocket: WebSocket, user_id: UUID, codec: Optional[JsonCodec] = None) -> ClientConnection:
+        codec = codec or JsonCodec()
+        await websocket.accept(subprotocol=codec.subprotocol)
         user_str = str(user_id)
-        if user_str in self.active_connections:
-            del self.active_connections[user_str]
+        connection = ClientConnection(websocket, user_str, self.stats, on_close=self.disconnect, codec=codec, pending=self._pending)
+        connection.start()
+        connections = self.active_connections.setdefault(user_str, set())
+        connections.add(connection)
+        if len(connections) == 1:
+            await self.backplane.subscribe(user_str)
+        return connection
+
+    async def disconnect(self, connection: ClientConnection):
+        connections = self.active_connections.get(connection.user_id)
+        if not connections or connection not in connections:
+            return
+        connections.discard(connection)
+        last = not connections
+        if last:
+            del self.active_connections[connection.user_id]
+        # Stop the writer (with no close handshake if the client went away on its own) and wait
+        # for it, unless this is the writer itself reporting a failed send
+        connection.closed = True
+        writer = connection._writer
+        if writer is not None and writer is not asyncio.current_task():
+            writer.cancel()
+            await asyncio.gather(writer, return_exceptions=True)
+        # The user may have reconnected (and resubscribed) while the writer was winding down
+        if last and connection.user_id not in self.active_connections:
+            await self.backplane.unsubscribe(connection.user_id)
 
     async def send_personal_message(self, message: str, user_id: UUID):
-        user_str = str(user_id)
-        if user_str in self.active_connections:
-            websocket = self.active_connections[user_str]
-            await websocket.send_text(message)
+        # Published rather than sent directly: the user may be connected to another worker
+        await self.backplane.publish(str(user_id), message)
+
+    async def deliver_local(self, user_str: str, message: str):
+        for connection in list(self.active_connections.get(user_str, ())):
+            connection.enqueue(message)
+
+    async def _heartbeat_loop(self):
+        """Pings every socket and reaps those that have been silent past the timeout."""
+        while True:
+            await asyncio.sleep(settings.WS_HEARTBEAT_INTERVAL)
+            deadline = time.monotonic() - settings.WS_HEARTBEAT_TIMEOUT
+            for connection in [c for conns in self.active_connections.values() for c in conns]:
+                if connection.last_seen < deadline:
+                    self.stats.reaped += 1
+                    await connection.close(CLOSE_CODE_TIMEOUT)
+                else:
+                    connection.enqueue(PING_FRAME)
+
+    def get_stats(self) -> Dict[str, int]:
+        connections = [c for conns in self.active_connections.values() for c in conns]
+        depths = [c.queue.qsize() for c in connections]
+        return {
+            "users": len(self.active_connections),
+            "connections": len(connections),
+            "queue_depth_total": sum(depths),
+            "queue_depth_max": max(depths, default=0),
+            "frames_sent": self.stats.frames_sent,
+            "frames_dropped": self.stats.frames_dropped,
+            "closed_overflow": self.stats.closed_overflow,
+            "reaped": self.stats.reaped,
+        }
 
 manager = ConnectionManager()
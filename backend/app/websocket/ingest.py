@@ -0,0 +1,175 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import List, NamedTuple, Optional
+from uuid import UUID, uuid4
+from sqlmodel import insert, select
+from app.config import settings
+from app import database
+from app.models.message import Message
+from app.models.user import User
+from app.schemas.message import MessageRead
+from app.services import conversation_service, outbox
+from app.websocket import protocol
+from app.websocket.connection_manager import ClientConnection, manager
+
+logger = logging.getLogger(__name__)
+
+
+class PendingMessage(NamedTuple):
+    sender_id: UUID
+    frame: protocol.SendFrame
+    connection: ClientConnection
+
+
+class MessageWriter:
+    """
+    Collects chat messages sent over WebSockets and writes them in micro-batches:
+    one multi-row INSERT, one conversation update per pair and one commit per
+    batch. Each sender gets an ack carrying its client_id once the batch commits.
+    """
+
+    def __init__(
+        self,
+        session_factory=None,
+        batch_size: Optional[int] = None,
+        max_delay: Optional[float] = None,
+        queue_size: Optional[int] = None,
+    ):
+        # Default resolved on first use, so creating the writer does not build the engine
+        self._session_factory = session_factory
+        self.batch_size = batch_size or settings.WS_INGEST_BATCH_SIZE
+        self.max_delay = max_delay if max_delay is not None else settings.WS_INGEST_MAX_DELAY_MS / 1000
+        self.queue: "asyncio.Queue[PendingMessage]" = asyncio.Queue(maxsize=queue_size or settings.WS_INGEST_QUEUE_SIZE)
+        self.batches_written = 0
+        self.messages_written = 0
+        self._task: Optional[asyncio.Task] = None
+        self._flushing: Optional[asyncio.Future] = None
+
+    @property
+    def session_factory(self):
+        return self._session_factory or database.AsyncSessionLocal
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stops accepting work after flushing whatever is already queued."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if self._flushing is not None:
+            # Let an in-flight batch finish instead of losing it with the cancelled loop
+            await self._flushing
+        pending = []
+        while not self.queue.empty():
+            pending.append(self.queue.get_nowait())
+        if pending:
+            await self._flush(pending)
+
+    def submit(self, sender_id: UUID, frame: protocol.SendFrame, connection: ClientConnection):
+        """Queues a message without waiting for the database."""
+        self.start()
+        try:
+            self.queue.put_nowait(PendingMessage(sender_id, frame, connection))
+        except asyncio.QueueFull:
+            connection.enqueue(protocol.encode(protocol.ErrorFrame(client_id=frame.client_id, detail="Server busy, retry")))
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            self._flushing = asyncio.ensure_future(self._flush(batch))
+            await asyncio.shield(self._flushing)
+            self._flushing = None
+
+    async def _flush(self, batch: List[PendingMessage]):
+        try:
+            written, rejected = await self._write(batch)
+        except Exception:
+            logger.exception("Failed to write a batch of %d messages", len(batch))
+            for item in batch:
+                item.connection.enqueue(protocol.encode(
+                    protocol.ErrorFrame(client_id=item.frame.client_id, detail="Message could not be saved")
+                ))
+            return
+
+        for item in rejected:
+            item.connection.enqueue(protocol.encode(
+                protocol.ErrorFrame(client_id=item.frame.client_id, detail="Receiver not found")
+            ))
+        # Receivers are notified by the outbox dispatcher, from the events committed with the batch
+        for item, message in written:
+            read = MessageRead.model_validate(message)
+            item.connection.enqueue(protocol.encode(protocol.AckFrame(client_id=item.frame.client_id, message=read)))
+
+    async def _write(self, batch: List[PendingMessage]):
+        # A short-lived session per batch: no connection is held between batches
+        async with self.session_factory() as session:
+            receiver_ids = {item.frame.receiver_id for item in batch}
+            existing = set((await session.exec(select(User.id).where(User.id.in_(receiver_ids)))).all())
+
+            written, rejected = [], []
+            for item in batch:
+                if item.frame.receiver_id not in existing:
+                    rejected.append(item)
+                    continue
+                written.append((item, Message(
+                    id=uuid4(),
+                    sender_id=item.sender_id,
+                    receiver_id=item.frame.receiver_id,
+                    order_id=item.frame.order_id,
+                    content=item.frame.content,
+                    created_at=datetime.utcnow(),
+                )))
+
+            if written:
+                messages = [message for _, message in written]
+                # Executed as a multi-row INSERT (insertmanyvalues) rather than one statement per row
+                await session.exec(insert(Message), params=[message.model_dump() for message in messages])
+                await conversation_service.record_messages(session, messages)
+                await outbox.record(session, [outbox.message_event(message) for message in messages])
+                await session.commit()
+                self.batches_written += 1
+                self.messages_written += len(messages)
+            return written, rejected
+
+
+message_writer = MessageWriter()
+
+
+async def handle_frame(connection: ClientConnection, user_id: UUID, frame):
+    """Dispatches one validated inbound frame from `user_id`."""
+    if isinstance(frame, protocol.SendFrame):
+        message_writer.submit(user_id, frame, connection)
+    elif isinstance(frame, protocol.TypingFrame):
+        # Only peers the user already talks to, so typing frames cannot probe or pester arbitrary ids.
+        # Misses are not remembered: the first message creates the conversation.
+        if frame.receiver_id not in connection.typing_peers:
+            async with database.AsyncSessionLocal() as session:
+                if not await conversation_service.exists(session, user_id, frame.receiver_id):
+                    return
+            connection.typing_peers.add(frame.receiver_id)
+        await manager.send_personal_message(protocol.encode(protocol.TypingNotice(sender_id=user_id)), frame.receiver_id)
+    elif isinstance(frame, protocol.ReadFrame):
+        async with database.AsyncSessionLocal() as session:
+            conversation = await conversation_service.mark_read(session, user_id, frame.peer_id)
+        if conversation is not None:
+            receipt = protocol.ReadReceipt(reader_id=user_id, read_at=datetime.utcnow())
+            await manager.send_personal_message(protocol.encode(receipt), frame.peer_id)
+    # PongFrame: nothing to do, the receive loop already touched the connection
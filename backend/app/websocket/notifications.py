@@ -0,0 +1,21 @@
+from uuid import UUID
+from app.models.outbox import OutboxEvent
+from app.schemas.message import MessageRead
+from app.services import outbox
+from app.websocket import protocol
+from app.websocket.connection_manager import manager
+
+
+def to_frame(event: OutboxEvent) -> str:
+    data = event.payload["data"]
+    if event.event_type == outbox.MESSAGE_CREATED:
+        # Same frame as a message sent over the socket
+        return protocol.encode(protocol.MessageFrame(message=MessageRead.model_validate(data)))
+    return protocol.encode(protocol.EventFrame(event=event.event_type, data=data))
+
+
+async def push_event(event: OutboxEvent):
+    """Outbox consumer: sends the event to each recipient's sockets, on whichever worker they are."""
+    frame = to_frame(event)
+    for recipient in event.payload.get("recipients", ()):
+        await manager.send_personal_message(frame, UUID(recipient))
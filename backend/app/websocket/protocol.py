@@ -0,0 +1,109 @@
+import json
+from datetime import datetime
+from typing import Any, Dict, Literal, Optional, Union
+from uuid import UUID
+from pydantic import BaseModel, Field, TypeAdapter
+from typing_extensions import Annotated
+from app.schemas.message import MessageRead
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional; clients then only get JSON
+    msgpack = None
+
+# --- Client -> server frames ---
+
+class SendFrame(BaseModel):
+    type: Literal["send"]
+    # Client-generated id echoed back in the ack so the client can match it
+    client_id: str = Field(max_length=64)
+    receiver_id: UUID
+    content: str
+    order_id: Optional[UUID] = None
+
+class TypingFrame(BaseModel):
+    type: Literal["typing"]
+    receiver_id: UUID
+
+class ReadFrame(BaseModel):
+    type: Literal["read"]
+    peer_id: UUID
+
+class PongFrame(BaseModel):
+    type: Literal["pong"]
+
+InboundFrame = Annotated[Union[SendFrame, TypingFrame, ReadFrame, PongFrame], Field(discriminator="type")]
+inbound_adapter = TypeAdapter(InboundFrame)
+
+# --- Server -> client frames ---
+
+class MessageFrame(BaseModel):
+    type: Literal["message"] = "message"
+    message: MessageRead
+
+class AckFrame(BaseModel):
+    type: Literal["ack"] = "ack"
+    client_id: str
+    message: MessageRead
+
+class ErrorFrame(BaseModel):
+    type: Literal["error"] = "error"
+    client_id: Optional[str] = None
+    detail: str
+
+class TypingNotice(BaseModel):
+    type: Literal["typing"] = "typing"
+    sender_id: UUID
+
+class ReadReceipt(BaseModel):
+    type: Literal["read"] = "read"
+    reader_id: UUID
+    read_at: datetime
+
+class EventFrame(BaseModel):
+    """A domain event from the outbox, e.g. `order.status_changed` with the order as data."""
+    type: Literal["event"] = "event"
+    event: str
+    data: Dict[str, Any]
+
+
+def parse_inbound(data: Any) -> InboundFrame:
+    """Validates a decoded client frame; raises pydantic.ValidationError if malformed."""
+    return inbound_adapter.validate_python(data)
+
+
+def encode(frame: BaseModel) -> str:
+    # Frames travel through the backplane as JSON text; codecs convert per socket
+    return frame.model_dump_json()
+
+
+class JsonCodec:
+    subprotocol: Optional[str] = None
+
+    def decode(self, event: Dict[str, Any]) -> Any:
+        raw = event.get("text")
+        if raw is None:
+            raw = event.get("bytes") or b""
+        return json.loads(raw)
+
+    def encode(self, frame_json: str) -> Union[str, bytes]:
+        return frame_json
+
+
+class MsgpackCodec(JsonCodec):
+    subprotocol = "msgpack"
+
+    def decode(self, event: Dict[str, Any]) -> Any:
+        if event.get("bytes") is not None:
+            return msgpack.unpackb(event["bytes"])
+        return super().decode(event)
+
+    def encode(self, frame_json: str) -> Union[str, bytes]:
+        return msgpack.packb(json.loads(frame_json))
+
+
+def negotiate_codec(requested_subprotocols) -> JsonCodec:
+    """msgpack when the client asks for it (Sec-WebSocket-Protocol: msgpack) and it is installed."""
+    if msgpack is not None and MsgpackCodec.subprotocol in (requested_subprotocols or ()):
+        return MsgpackCodec()
+    return JsonCodec()
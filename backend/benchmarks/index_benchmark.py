@@ -0,0 +1,118 @@
+"""
+Query plans and latencies for the hot read paths, without and with the
+composite indexes from migration 0002.
+
+    python -m benchmarks.index_benchmark                       # 1M rows into ./bench_indexes.db
+    python -m benchmarks.index_benchmark --scale small --repeat 50
+    python -m benchmarks.index_benchmark --url postgresql://localhost/devmart_bench
+
+The target database is dropped and re-seeded, so never point it at real data.
+"""
+import argparse
+import os
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from sqlalchemy import create_engine, or_, select, text
+from sqlmodel import SQLModel
+
+from app.core.pagination import paginate, paginate_union
+from app.models import Gig, Message, Order, Review
+from benchmarks.seed import SCALES, SeedResult, seed
+
+
+def hot_queries(data: SeedResult) -> Dict[str, object]:
+    """The statements issued by read_gigs, read_orders, get_chat_history and review lookups."""
+    user = data.busiest_pair[1]
+    a, b = data.busiest_pair
+    return {
+        "gigs feed (first page)": paginate(select(Gig).where(Gig.is_active == True), Gig, 100),
+        "orders for user": paginate_union(Order, [Order.client_id == user, Order.freelancer_id == user], 100),
+        "chat history": paginate_union(Message, [
+            (Message.sender_id == a) & (Message.receiver_id == b),
+            (Message.sender_id == b) & (Message.receiver_id == a),
+        ], 50),
+        "chat history (OR)": select(Message).where(or_(
+            (Message.sender_id == a) & (Message.receiver_id == b),
+            (Message.sender_id == b) & (Message.receiver_id == a),
+        )).order_by(Message.created_at.desc(), Message.id.desc()).limit(50),
+        "reviews received": select(Review).where(Review.reviewee_id == user),
+    }
+
+
+def explain(conn, statement) -> List[str]:
+    sql = str(statement.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    return [" | ".join(str(col) for col in row) for row in conn.exec_driver_sql(prefix + sql)]
+
+
+def measure(conn, statement, repeat: int) -> Dict[str, float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(statement).all()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        "p50_ms": statistics.median(timings),
+        "p95_ms": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+    }
+
+
+def run_phase(engine, queries, repeat: int, label: str, report: Callable[[str], None]) -> Dict[str, Dict[str, float]]:
+    results = {}
+    report(f"\n=== {label} ===")
+    with engine.connect() as conn:
+        for name, statement in queries.items():
+            results[name] = measure(conn, statement, repeat)
+            report(f"\n-- {name}: p50 {results[name]['p50_ms']:.2f} ms, p95 {results[name]['p95_ms']:.2f} ms")
+            for line in explain(conn, statement):
+                report(f"   {line}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="sqlite:///bench_indexes.db")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="1m")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    if engine.dialect.name == "sqlite" and engine.url.database and os.path.exists(engine.url.database):
+        os.remove(engine.url.database)
+    SQLModel.metadata.drop_all(engine)
+
+    scale = SCALES[args.scale]
+    print(f"Seeding {scale.total:,} rows into {engine.url.render_as_string(hide_password=True)} ...")
+    start = time.perf_counter()
+    data = seed(engine, scale)
+    print(f"Seeded in {time.perf_counter() - start:.1f}s")
+
+    # Everything except primary keys and unique constraints is a hot-path index
+    hot_indexes = [ix for table in SQLModel.metadata.sorted_tables for ix in table.indexes if not ix.unique]
+    with engine.begin() as conn:
+        for ix in hot_indexes:
+            ix.drop(conn)
+        if engine.dialect.name == "postgresql":
+            conn.execute(text("ANALYZE"))
+
+    queries = hot_queries(data)
+    before = run_phase(engine, queries, args.repeat, "without hot-path indexes", print)
+
+    with engine.begin() as conn:
+        for ix in hot_indexes:
+            ix.create(conn)
+        conn.execute(text("ANALYZE"))
+    after = run_phase(engine, queries, args.repeat, "with hot-path indexes", print)
+
+    print("\n=== summary (p50 ms) ===")
+    print(f"{'query':<28}{'before':>10}{'after':>10}{'speedup':>10}")
+    for name in queries:
+        b, a = before[name]["p50_ms"], after[name]["p50_ms"]
+        print(f"{name:<28}{b:>10.2f}{a:>10.2f}{b / a if a else float('inf'):>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
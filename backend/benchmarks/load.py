@@ -0,0 +1,249 @@
+"""
+Load test of the DevMart API: seeds a database deterministically, drives the
+app in-process with concurrent virtual users running the scripted scenarios
+(benchmarks/scenarios.py), and reports throughput, latency percentiles and
+SQL statements per request.
+
+    python -m benchmarks.load                                   # tiny scale, SQLite ./bench_load.db
+    python -m benchmarks.load --scale small --concurrency 8 --iterations 200
+    python -m benchmarks.load --url postgresql://localhost/devmart_bench
+    python -m benchmarks.load --save-baseline baseline.json      # on main
+    python -m benchmarks.load --baseline baseline.json           # on the branch: exit 1 on regression
+
+With --baseline the run exits non-zero when a scenario got slower or lower in
+throughput beyond --tolerance, or when any operation issues more statements
+per request than before. Statement counts do not depend on the machine;
+latencies do, so compare against a baseline recorded on the same kind of host.
+
+The target database is dropped and re-seeded, so never point it at real data.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+from benchmarks.seed import SCALES
+
+PERCENTILES = (50, 90, 95, 99)
+# Cache hits make per-request statement counts vary a little between concurrent
+# runs; an N+1 or an extra round trip adds at least one statement per request.
+QUERY_TOLERANCE = 0.5
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(samples) -> Dict[str, object]:
+    latencies = sorted(sample.latency_ms for sample in samples)
+    queries = [sample.queries for sample in samples if sample.queries is not None]
+    summary = {
+        "requests": len(samples),
+        "errors": sum(not sample.ok for sample in samples),
+        "latency_ms": {f"p{p}": round(percentile(latencies, p), 3) for p in PERCENTILES},
+    }
+    summary["latency_ms"]["max"] = round(latencies[-1], 3) if latencies else 0.0
+    summary["latency_ms"]["mean"] = round(sum(latencies) / len(latencies), 3) if latencies else 0.0
+    if queries:
+        summary["queries_per_request"] = round(sum(queries) / len(queries), 3)
+    return summary
+
+
+def statements_executed() -> float:
+    """Statements run by this process so far, on every instrumented engine."""
+    from app.core.metrics import QUERY_LATENCY
+    return sum(value for name, _, value in QUERY_LATENCY.samples() if name.endswith("_count"))
+
+
+async def run_scenario(bench, scenario, iterations: int, concurrency: int, warmup: int) -> Dict[str, object]:
+    bench.recording = False
+    for _ in range(warmup):
+        await scenario(bench)
+    bench.samples = {}
+    bench.recording = True
+
+    remaining = iter(range(iterations))
+
+    async def virtual_user():
+        for _ in remaining:
+            await scenario(bench)
+
+    statements_before = statements_executed()
+    start = time.perf_counter()
+    await asyncio.gather(*(virtual_user() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    statements = statements_executed() - statements_before
+
+    everything = [sample for samples in bench.samples.values() for sample in samples]
+    result = summarize(everything)
+    result.update(
+        iterations=iterations,
+        seconds=round(elapsed, 3),
+        throughput_rps=round(len(everything) / elapsed, 2) if elapsed else 0.0,
+        # Includes background work the scenario caused (outbox dispatch, socket ingest)
+        statements_per_iteration=round(statements / iterations, 3) if iterations else 0.0,
+        operations={name: summarize(samples) for name, samples in sorted(bench.samples.items())},
+    )
+    return result
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Regressions of `current` against `baseline`, as human-readable lines."""
+    problems = []
+    for name, base in baseline.get("scenarios", {}).items():
+        now = current["scenarios"].get(name)
+        if now is None:
+            continue
+        base_p95, now_p95 = base["latency_ms"]["p95"], now["latency_ms"]["p95"]
+        if base_p95 and now_p95 > base_p95 * (1 + tolerance):
+            problems.append(f"{name}: p95 {now_p95:.2f} ms vs baseline {base_p95:.2f} ms")
+        if base["throughput_rps"] and now["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+            problems.append(f"{name}: {now['throughput_rps']:.1f} req/s vs baseline {base['throughput_rps']:.1f} req/s")
+        if now["errors"] > base["errors"]:
+            problems.append(f"{name}: {now['errors']} errors vs baseline {base['errors']}")
+        for operation, base_op in base.get("operations", {}).items():
+            now_op = now["operations"].get(operation)
+            if now_op is None or "queries_per_request" not in base_op or "queries_per_request" not in now_op:
+                continue
+            # Statement counts do not depend on the machine, so they get no relative tolerance
+            if now_op["queries_per_request"] > base_op["queries_per_request"] + QUERY_TOLERANCE:
+                problems.append(f"{name} / {operation}: {now_op['queries_per_request']} statements per request "
+                                f"vs baseline {base_op['queries_per_request']}")
+    return problems
+
+
+def print_report(result: Dict):
+    print(f"\n{'scenario / operation':<34}{'reqs':>7}{'err':>5}{'req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'queries':>9}")
+    for name, scenario in result["scenarios"].items():
+        latency = scenario["latency_ms"]
+        print(f"{name:<34}{scenario['requests']:>7}{scenario['errors']:>5}{scenario['throughput_rps']:>9.1f}"
+              f"{latency['p50']:>9.2f}{latency['p95']:>9.2f}{latency['p99']:>9.2f}{scenario['statements_per_iteration']:>9.1f}")
+        for operation, stats in scenario["operations"].items():
+            latency = stats["latency_ms"]
+            queries = stats.get("queries_per_request")
+            print(f"  {operation:<32}{stats['requests']:>7}{stats['errors']:>5}{'':>9}"
+                  f"{latency['p50']:>9.2f}{latency['p95']:>9.2f}{latency['p99']:>9.2f}"
+                  f"{queries if queries is not None else '-':>9}")
+    print("\nLatencies in ms. queries: statements per iteration (scenarios) or per request (operations).")
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def prepare_database(url: str):
+    from sqlalchemy import create_engine
+    from sqlmodel import SQLModel
+    engine = create_engine(url)
+    if engine.dialect.name == "sqlite" and engine.url.database and os.path.exists(engine.url.database):
+        os.remove(engine.url.database)
+    SQLModel.metadata.drop_all(engine)
+    return engine
+
+
+async def run(args) -> Dict:
+    # Imported after the environment is set: the app reads its settings at import
+    import httpx
+    from app.core.limiter import limiter
+    from app.database import async_engine
+    from app.main import app
+    from benchmarks.scenarios import SCENARIOS, Bench
+    from benchmarks.seed import seed
+
+    engine = prepare_database(args.url)
+    scale = SCALES[args.scale]
+    print(f"Seeding {scale.total:,} rows into {engine.url.render_as_string(hide_password=True)} ...")
+    start = time.perf_counter()
+    data = seed(engine, scale, seed=args.seed)
+    print(f"Seeded in {time.perf_counter() - start:.1f}s")
+    engine.dispose()
+
+    # The benchmark measures the work behind each request, not the per-user limits
+    limiter.enabled = False
+    result = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+            "revision": git_revision(),
+            "dialect": args.url.split(":", 1)[0],
+            "scale": args.scale,
+            "seed": args.seed,
+            "iterations": args.iterations,
+            "concurrency": args.concurrency,
+            "python": platform.python_version(),
+        },
+        "scenarios": {},
+    }
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name in args.scenarios:
+                bench = Bench(app=app, client=client, data=data, rng=random.Random(f"{args.seed}:{name}"))
+                print(f"Running {name} ...")
+                result["scenarios"][name] = await run_scenario(
+                    bench, SCENARIOS[name], args.iterations, args.concurrency, args.warmup,
+                )
+    # Close pooled connections while their event loop is still running
+    await async_engine.dispose()
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="sqlite:///bench_load.db")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="tiny")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--scenarios", nargs="+", default=["catalog", "orders", "chat_rest", "chat_ws", "reviews"])
+    parser.add_argument("--iterations", type=int, default=100, help="measured iterations per scenario")
+    parser.add_argument("--warmup", type=int, default=5, help="unmeasured iterations per scenario")
+    parser.add_argument("--concurrency", type=int, default=4, help="virtual users per scenario")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", help="fail if this run regresses against the given results file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative latency / throughput change")
+    parser.add_argument("--save-baseline", help="also write this run's results to the given baseline path")
+    args = parser.parse_args(argv)
+
+    os.environ["DATABASE_URL"] = args.url
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+    # Per-request statement counts come back in the Server-Timing header
+    os.environ["SERVER_TIMING_ENABLED"] = "true"
+    os.environ.setdefault("SLOW_QUERY_THRESHOLD_MS", "0")
+    os.environ.setdefault("CATALOG_CACHE_TTL_SECONDS", "30")
+
+    result = asyncio.run(run(args))
+    print_report(result)
+
+    for path in filter(None, [args.output, args.save_baseline]):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(result, f, indent=2, sort_keys=True)
+        print(f"Results written to {path}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        problems = compare(result, baseline, args.tolerance)
+        if problems:
+            print(f"\nRegressions against {args.baseline}:")
+            for problem in problems:
+                print(f"  {problem}")
+            return 1
+        print(f"\nNo regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
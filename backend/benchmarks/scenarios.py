@@ -0,0 +1,209 @@
+"""
+Scripted user journeys for the load runner (benchmarks/load.py).
+
+Each scenario is one iteration of a realistic flow against the in-process
+app: catalog browsing, the full order lifecycle, chat over REST and over a
+WebSocket, and leaving a review. Every HTTP call is recorded under a short
+operation name with its latency and the statement count the app reports in
+its Server-Timing header.
+"""
+import asyncio
+import json
+import random
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+from uuid import UUID
+
+import httpx
+
+from app.core.security import create_access_token
+from app.models.order import OrderStatus
+from benchmarks.seed import SeedResult
+
+SERVER_TIMING_QUERIES = re.compile(r'desc="(\d+) queries"')
+SEARCH_TERMS = ["logo", "web", "data", "copy", "video", "design", "pipeline", "modern seo"]
+
+
+@dataclass
+class Sample:
+    latency_ms: float
+    ok: bool
+    queries: Optional[int] = None
+
+
+@dataclass
+class Bench:
+    """State shared by every virtual user of a run."""
+    app: object
+    client: httpx.AsyncClient
+    data: SeedResult
+    rng: random.Random
+    samples: Dict[str, List[Sample]] = field(default_factory=dict)
+    recording: bool = True
+    _tokens: Dict[UUID, Dict[str, str]] = field(default_factory=dict)
+
+    def auth(self, user_id: UUID) -> Dict[str, str]:
+        headers = self._tokens.get(user_id)
+        if headers is None:
+            headers = self._tokens[user_id] = {"Authorization": "Bearer " + create_access_token(user_id)}
+        return headers
+
+    def record(self, operation: str, sample: Sample):
+        if self.recording:
+            self.samples.setdefault(operation, []).append(sample)
+
+    async def call(self, operation: str, method: str, url: str, user: Optional[UUID] = None, **kwargs) -> httpx.Response:
+        headers = self.auth(user) if user is not None else {}
+        start = time.perf_counter()
+        response = await self.client.request(method, url, headers=headers, **kwargs)
+        latency = (time.perf_counter() - start) * 1000
+        match = SERVER_TIMING_QUERIES.search(response.headers.get("server-timing", ""))
+        self.record(operation, Sample(latency, response.status_code < 400, int(match.group(1)) if match else None))
+        return response
+
+
+Scenario = Callable[[Bench], Awaitable[None]]
+
+
+async def catalog_browse(bench: Bench):
+    """An anonymous visitor: two feed pages, a gig, a search and the ratings strip."""
+    first = await bench.call("gigs feed", "GET", "/api/v1/gigs/?limit=20")
+    cursor = first.headers.get("x-next-cursor")
+    if cursor:
+        await bench.call("gigs feed (page 2)", "GET", "/api/v1/gigs/", params={"limit": 20, "cursor": cursor})
+    gigs = first.json() if first.status_code == 200 else []
+    if gigs:
+        await bench.call("gig detail", "GET", f"/api/v1/gigs/{bench.rng.choice(gigs)['id']}")
+        await bench.call("gig ratings", "GET", "/api/v1/gigs/ratings", params={"ids": [g["id"] for g in gigs]})
+    await bench.call("gig search", "GET", "/api/v1/gigs/search", params={"q": bench.rng.choice(SEARCH_TERMS), "limit": 20})
+
+
+async def order_lifecycle(bench: Bench):
+    """A client buys a gig and both sides walk it to COMPLETED, then the client opens the dashboard."""
+    gig_id, freelancer = bench.rng.choice(bench.data.active_gigs)
+    client = bench.rng.choice(bench.data.user_ids)
+    if client == freelancer:
+        return
+    created = await bench.call("create order", "POST", "/api/v1/orders/", user=client, json={"gig_id": str(gig_id)})
+    if created.status_code != 200:
+        return
+    order = created.json()["id"]
+    proof = {"proof_reference": f"bench-{order[:8]}", "payer_name": "Bench", "amount": "10.00"}
+    await bench.call("submit payment", "PATCH", f"/api/v1/orders/{order}/submit-payment", user=client, json=proof)
+    for action in ("confirm-payment", "start-work", "submit-work"):
+        await bench.call(action, "PATCH", f"/api/v1/orders/{order}/{action}", user=freelancer)
+    approved = await bench.call("approve", "PATCH", f"/api/v1/orders/{order}/approve", user=client)
+    if approved.status_code == 200 and approved.json()["status"] == OrderStatus.COMPLETED:
+        bench.data.reviewable.append((UUID(order), client, freelancer))
+    await bench.call("orders dashboard", "GET", "/api/v1/orders/expanded?limit=20", user=client)
+
+
+def _chat_pair(bench: Bench):
+    # Half the traffic on the seeded hot conversation, like a busy inbox
+    if bench.data.busiest_pair and bench.rng.random() < 0.5:
+        return bench.data.busiest_pair if bench.rng.random() < 0.5 else bench.data.busiest_pair[::-1]
+    return tuple(bench.rng.sample(bench.data.user_ids, 2))
+
+
+async def chat_rest(bench: Bench):
+    sender, receiver = _chat_pair(bench)
+    body = {"receiver_id": str(receiver), "content": f"bench {bench.rng.getrandbits(32)}"}
+    await bench.call("send message", "POST", "/api/v1/messages/", user=sender, json=body)
+    await bench.call("inbox", "GET", "/api/v1/messages/conversations?limit=20", user=receiver)
+    await bench.call("chat history", "GET", f"/api/v1/messages/{sender}?limit=50", user=receiver)
+
+
+MESSAGES_PER_SOCKET = 5
+
+
+async def chat_websocket(bench: Bench):
+    """Both users connect; the sender sends a few frames, timing the ack and the receiver's push."""
+    sender, receiver = _chat_pair(bench)
+    if sender == receiver:
+        return
+    start = time.perf_counter()
+    sender_socket = await AsgiWebSocket.connect(bench.app, f"/api/v1/messages/ws/{sender}", bench.auth(sender))
+    receiver_socket = await AsgiWebSocket.connect(bench.app, f"/api/v1/messages/ws/{receiver}", bench.auth(receiver))
+    bench.record("ws connect (pair)", Sample((time.perf_counter() - start) * 1000, True))
+    try:
+        for i in range(MESSAGES_PER_SOCKET):
+            start = time.perf_counter()
+            await sender_socket.send_json({"type": "send", "client_id": f"b{i}", "receiver_id": str(receiver), "content": f"ws bench {i}"})
+            ack = await sender_socket.receive_json(lambda frame: frame.get("type") in ("ack", "error"))
+            bench.record("ws send -> ack", Sample((time.perf_counter() - start) * 1000, ack["type"] == "ack"))
+            pushed = await receiver_socket.receive_json(lambda frame: frame.get("type") == "message")
+            bench.record("ws send -> push", Sample((time.perf_counter() - start) * 1000, pushed is not None))
+    finally:
+        await sender_socket.close()
+        await receiver_socket.close()
+
+
+async def leave_review(bench: Bench):
+    """A client reviews a completed order, then the freelancer's rating summary is read."""
+    if not bench.data.reviewable:
+        return
+    order_id, client, freelancer = bench.data.reviewable.pop()
+    body = {"order_id": str(order_id), "rating": bench.rng.randint(1, 5), "comment": "bench review"}
+    await bench.call("create review", "POST", "/api/v1/reviews/", user=client, json=body)
+    await bench.call("rating summary", "GET", f"/api/v1/reviews/summary/{freelancer}")
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "catalog": catalog_browse,
+    "orders": order_lifecycle,
+    "chat_rest": chat_rest,
+    "chat_ws": chat_websocket,
+    "reviews": leave_review,
+}
+
+
+class AsgiWebSocket:
+    """
+    Minimal in-process WebSocket client speaking ASGI to the app directly, so
+    socket scenarios run on the same event loop as the app's background tasks.
+    """
+
+    RECEIVE_TIMEOUT = 10.0
+
+    def __init__(self):
+        self._inbound: asyncio.Queue = asyncio.Queue()
+        self._outbound: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    async def connect(cls, app, path: str, headers: Dict[str, str]) -> "AsgiWebSocket":
+        socket = cls()
+        token = headers["Authorization"].split(" ", 1)[1]
+        scope = {
+            "type": "websocket", "asgi": {"version": "3.0"}, "scheme": "ws", "http_version": "1.1",
+            "path": path, "raw_path": path.encode(), "root_path": "", "query_string": f"token={token}".encode(),
+            "headers": [(b"host", b"bench")], "subprotocols": [], "client": ("127.0.0.1", 0), "server": ("bench", 80),
+        }
+        socket._task = asyncio.create_task(app(scope, socket._inbound.get, socket._outbound.put))
+        await socket._inbound.put({"type": "websocket.connect"})
+        accepted = await asyncio.wait_for(socket._outbound.get(), cls.RECEIVE_TIMEOUT)
+        if accepted["type"] != "websocket.accept":
+            raise ConnectionError(f"WebSocket {path} rejected: {accepted}")
+        return socket
+
+    async def send_json(self, frame: dict):
+        await self._inbound.put({"type": "websocket.receive", "text": json.dumps(frame)})
+
+    async def receive_json(self, accept: Callable[[dict], bool]) -> Optional[dict]:
+        """The next frame `accept` selects; pings and other frames in between are skipped."""
+        while True:
+            message = await asyncio.wait_for(self._outbound.get(), self.RECEIVE_TIMEOUT)
+            if message["type"] == "websocket.close":
+                return None
+            frame = json.loads(message.get("text") or message.get("bytes"))
+            if accept(frame):
+                return frame
+
+    async def close(self):
+        await self._inbound.put({"type": "websocket.disconnect", "code": 1000})
+        try:
+            await asyncio.wait_for(self._task, self.RECEIVE_TIMEOUT)
+        except Exception:
+            self._task.cancel()
@@ -0,0 +1,206 @@
+"""
+Deterministic data seeder for benchmarks.
+
+The same (scale, seed) pair always produces the same rows, ids and timestamps,
+so runs on different machines or branches query identical data.
+"""
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, List, Tuple
+from uuid import UUID
+
+from sqlalchemy import insert
+from sqlmodel import Session, SQLModel
+
+from app.models import Conversation, Gig, Message, Order, Review, User
+from app.models.order import OrderStatus
+from app.services import rating_service
+from app.services.conversation_service import PREVIEW_LENGTH, ordered_pair
+
+
+@dataclass(frozen=True)
+class Scale:
+    users: int
+    gigs: int
+    orders: int
+    messages: int
+    reviews: int
+
+    @property
+    def total(self) -> int:
+        return self.users + self.gigs + self.orders + self.messages + self.reviews
+
+
+SCALES: Dict[str, Scale] = {
+    "tiny": Scale(users=50, gigs=200, orders=500, messages=2_000, reviews=100),
+    "small": Scale(users=1_000, gigs=10_000, orders=30_000, messages=50_000, reviews=9_000),
+    "1m": Scale(users=10_000, gigs=100_000, orders=300_000, messages=500_000, reviews=90_000),
+}
+
+# Every seeded timestamp falls in the 365 days before this instant
+EPOCH = datetime(2025, 1, 1)
+
+
+@dataclass
+class SeedResult:
+    user_ids: List[UUID] = field(default_factory=list)
+    gig_ids: List[UUID] = field(default_factory=list)
+    order_ids: List[UUID] = field(default_factory=list)
+    # (client_id, freelancer_id) of the most active conversation
+    busiest_pair: tuple = ()
+    # (gig_id, freelancer_id) of active gigs, for scenarios that place orders
+    active_gigs: List[Tuple[UUID, UUID]] = field(default_factory=list)
+    # (order_id, client_id, freelancer_id) of completed orders the client has not reviewed yet
+    reviewable: List[Tuple[UUID, UUID, UUID]] = field(default_factory=list)
+
+
+def _uuid(rng: random.Random) -> UUID:
+    return UUID(int=rng.getrandbits(128), version=4)
+
+
+def _timestamp(rng: random.Random) -> datetime:
+    return EPOCH - timedelta(seconds=rng.randrange(365 * 24 * 3600), microseconds=rng.randrange(1_000_000))
+
+
+def _insert_batches(conn, model, rows: List[dict], batch_size: int):
+    for start in range(0, len(rows), batch_size):
+        conn.execute(insert(model), rows[start:start + batch_size])
+
+
+def seed(engine, scale: Scale, seed: int = 42, batch_size: int = 10_000, create_tables: bool = True) -> SeedResult:
+    """Inserts `scale` worth of rows with multi-row INSERTs and returns the generated ids."""
+    rng = random.Random(seed)
+    result = SeedResult()
+    if create_tables:
+        SQLModel.metadata.create_all(engine)
+
+    users = []
+    for i in range(scale.users):
+        user_id = _uuid(rng)
+        result.user_ids.append(user_id)
+        users.append({
+            "id": user_id,
+            "email": f"user{i}@bench.devmart",
+            "hashed_password": "x",
+            "full_name": f"Bench User {i}",
+            "is_admin": False,
+            "created_at": _timestamp(rng),
+        })
+
+    # The first fifth of the users sell; everyone buys
+    freelancers = result.user_ids[: max(1, scale.users // 5)]
+    gigs = []
+    gig_owner = {}
+    for i in range(scale.gigs):
+        gig_id = _uuid(rng)
+        owner = rng.choice(freelancers)
+        result.gig_ids.append(gig_id)
+        gig_owner[gig_id] = owner
+        gigs.append({
+            "id": gig_id,
+            "freelancer_id": owner,
+            "title": f"Gig {i} " + rng.choice(["logo design", "web app", "data pipeline", "copywriting", "video edit"]),
+            "description": "Benchmark gig " + " ".join(rng.choice(["fast", "clean", "modern", "scalable", "seo"]) for _ in range(8)),
+            "price": Decimal(rng.randrange(500, 100_000)) / 100,
+            "delivery_days": rng.randrange(1, 30),
+            "is_active": rng.random() < 0.9,
+            "created_at": _timestamp(rng),
+        })
+        if gigs[-1]["is_active"]:
+            result.active_gigs.append((gig_id, owner))
+
+    statuses = [
+        OrderStatus.PENDING_PAYMENT, OrderStatus.PAYMENT_SUBMITTED, OrderStatus.PAYMENT_CONFIRMED,
+        OrderStatus.IN_PROGRESS, OrderStatus.SUBMITTED, OrderStatus.COMPLETED,
+    ]
+    orders = []
+    for _ in range(scale.orders):
+        gig_id = rng.choice(result.gig_ids)
+        freelancer_id = gig_owner[gig_id]
+        client_id = rng.choice(result.user_ids)
+        if client_id == freelancer_id:
+            client_id = result.user_ids[(result.user_ids.index(client_id) + 1) % len(result.user_ids)]
+        order_id = _uuid(rng)
+        result.order_ids.append(order_id)
+        created_at = _timestamp(rng)
+        orders.append({
+            "id": order_id,
+            "gig_id": gig_id,
+            "client_id": client_id,
+            "freelancer_id": freelancer_id,
+            "status": rng.choice(statuses),
+            "payment_status": "pending",
+            "created_at": created_at,
+            "updated_at": created_at,
+            "version": 1,
+        })
+
+    # A quarter of the messages go to a single hot conversation so chat paging has depth
+    busiest = (orders[0]["client_id"], orders[0]["freelancer_id"]) if orders else (users[0]["id"], users[-1]["id"])
+    result.busiest_pair = busiest
+    messages = []
+    for _ in range(scale.messages):
+        if rng.random() < 0.25:
+            sender, receiver = busiest if rng.random() < 0.5 else busiest[::-1]
+        else:
+            sender, receiver = rng.sample(result.user_ids, 2)
+        messages.append({
+            "id": _uuid(rng),
+            "sender_id": sender,
+            "receiver_id": receiver,
+            "content": "bench message " + str(rng.getrandbits(32)),
+            "created_at": _timestamp(rng),
+        })
+
+    reviews = []
+    for order in orders[: min(scale.reviews, len(orders))]:
+        reviews.append({
+            "id": _uuid(rng),
+            "order_id": order["id"],
+            "reviewer_id": order["client_id"],
+            "reviewee_id": order["freelancer_id"],
+            "rating": rng.randint(1, 5),
+            "comment": "bench review",
+            "created_at": _timestamp(rng),
+        })
+
+    result.reviewable = [
+        (order["id"], order["client_id"], order["freelancer_id"]) for order in orders[len(reviews):]
+        if order["status"] == OrderStatus.COMPLETED
+    ]
+
+    with engine.begin() as conn:
+        _insert_batches(conn, User, users, batch_size)
+        _insert_batches(conn, Gig, gigs, batch_size)
+        _insert_batches(conn, Order, orders, batch_size)
+        _insert_batches(conn, Message, messages, batch_size)
+        _insert_batches(conn, Review, reviews, batch_size)
+        # Rows the API maintains alongside messages and reviews, so the inbox and ratings read seeded data
+        _insert_batches(conn, Conversation, conversations(messages, rng), batch_size)
+    with Session(engine) as session:
+        rating_service.rebuild_summaries(session)
+    return result
+
+
+def conversations(messages: List[dict], rng: random.Random) -> List[dict]:
+    """One Conversation row per pair, as record_messages would have left it (everything read)."""
+    latest: Dict[tuple, dict] = {}
+    for message in messages:
+        pair = ordered_pair(message["sender_id"], message["receiver_id"])
+        current = latest.get(pair)
+        if current is None or (message["created_at"], str(message["id"])) > (current["created_at"], str(current["id"])):
+            latest[pair] = message
+    return [{
+        "id": _uuid(rng),
+        "user_a_id": user_a_id,
+        "user_b_id": user_b_id,
+        "last_message_id": last["id"],
+        "last_sender_id": last["sender_id"],
+        "last_message_preview": last["content"][:PREVIEW_LENGTH],
+        "last_message_at": last["created_at"],
+        "unread_a": 0,
+        "unread_b": 0,
+        "created_at": last["created_at"],
+    } for (user_a_id, user_b_id), last in sorted(latest.items(), key=lambda item: (str(item[0][0]), str(item[0][1])))]
@@ -0,0 +1,50 @@
+"""hot path indexes
+
+Indexes for the predicates behind read_gigs, read_orders, get_chat_history
+and review lookups. On Postgres they are built CONCURRENTLY so existing
+tables stay writable; IF NOT EXISTS makes the migration safe on databases
+where create_all already added them.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:40:02.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns)
+INDEXES = [
+    ('ix_gig_active_created_at_id', 'gig', ['is_active', 'created_at', 'id']),
+    ('ix_gig_freelancer_id', 'gig', ['freelancer_id']),
+    ('ix_order_client_created_at_id', 'order', ['client_id', 'created_at', 'id']),
+    ('ix_order_freelancer_created_at_id', 'order', ['freelancer_id', 'created_at', 'id']),
+    ('ix_order_gig_id', 'order', ['gig_id']),
+    ('ix_message_pair_created_at_id', 'message', ['sender_id', 'receiver_id', 'created_at', 'id']),
+    ('ix_review_reviewee_id', 'review', ['reviewee_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
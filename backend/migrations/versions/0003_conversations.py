@@ -0,0 +1,103 @@
+"""conversations
+
+Adds the Conversation table behind the inbox and backfills one row per user
+pair from existing messages. Unread counters start at zero because no read
+state was tracked before this revision.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 09:58:41.507112
+
+"""
+from typing import Sequence, Union
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PREVIEW_LENGTH = 140
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    conversation = op.create_table('conversation',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('user_a_id', sa.Uuid(), nullable=False),
+    sa.Column('user_b_id', sa.Uuid(), nullable=False),
+    sa.Column('last_message_id', sa.Uuid(), nullable=True),
+    sa.Column('last_sender_id', sa.Uuid(), nullable=True),
+    sa.Column('last_message_preview', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('last_message_at', sa.DateTime(), nullable=False),
+    sa.Column('unread_a', sa.Integer(), nullable=False),
+    sa.Column('unread_b', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['last_message_id'], ['message.id'], ),
+    sa.ForeignKeyConstraint(['last_sender_id'], ['user.id'], ),
+    sa.ForeignKeyConstraint(['user_a_id'], ['user.id'], ),
+    sa.ForeignKeyConstraint(['user_b_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_a_id', 'user_b_id')
+    )
+    op.create_index('ix_conversation_user_a_last_message_at_id', 'conversation', ['user_a_id', 'last_message_at', 'id'], unique=False)
+    op.create_index('ix_conversation_user_b_last_message_at_id', 'conversation', ['user_b_id', 'last_message_at', 'id'], unique=False)
+
+    _backfill(op.get_bind(), conversation)
+
+
+def _backfill(bind, conversation) -> None:
+    message = sa.table('message',
+        sa.column('id', sa.Uuid()),
+        sa.column('sender_id', sa.Uuid()),
+        sa.column('receiver_id', sa.Uuid()),
+        sa.column('content', sa.String()),
+        sa.column('created_at', sa.DateTime()),
+    )
+    # One windowed pass over the message table: rank each pair's messages newest first
+    # and keep the top one. CASE rather than least()/greatest(), which SQLite lacks.
+    user_a_id = sa.case((message.c.sender_id <= message.c.receiver_id, message.c.sender_id), else_=message.c.receiver_id)
+    user_b_id = sa.case((message.c.sender_id <= message.c.receiver_id, message.c.receiver_id), else_=message.c.sender_id)
+    ranked = sa.select(
+        message.c.id,
+        message.c.sender_id,
+        message.c.content,
+        message.c.created_at,
+        user_a_id.label('user_a_id'),
+        user_b_id.label('user_b_id'),
+        sa.func.row_number().over(
+            partition_by=(user_a_id, user_b_id),
+            order_by=(message.c.created_at.desc(), message.c.id.desc()),
+        ).label('rank'),
+    ).subquery()
+    # The last message's id doubles as the conversation id: unique per pair and
+    # a valid UUID on every dialect, without a database-side UUID generator
+    latest = sa.select(
+        ranked.c.id,
+        ranked.c.user_a_id,
+        ranked.c.user_b_id,
+        ranked.c.id.label('last_message_id'),
+        ranked.c.sender_id,
+        sa.func.substr(ranked.c.content, 1, PREVIEW_LENGTH),
+        ranked.c.created_at,
+        sa.literal(0),
+        sa.literal(0),
+        sa.literal(datetime.utcnow(), sa.DateTime()),
+    ).where(ranked.c.rank == 1)
+    bind.execute(conversation.insert().from_select([
+        'id', 'user_a_id', 'user_b_id', 'last_message_id', 'last_sender_id', 'last_message_preview',
+        'last_message_at', 'unread_a', 'unread_b', 'created_at',
+    ], latest))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_conversation_user_b_last_message_at_id', table_name='conversation')
+    op.drop_index('ix_conversation_user_a_last_message_at_id', table_name='conversation')
+    op.drop_table('conversation')
@@ -0,0 +1,43 @@
+"""row updated_at
+
+Adds `updated_at` to gig and order so HTTP validators (ETag / Last-Modified)
+can be computed from row versions instead of serialized bodies. Existing rows
+start at their `created_at`.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 11:02:13.840215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('gig', 'order')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name in TABLES:
+        # Added nullable, backfilled, then tightened: SQLite cannot add a NOT NULL column without a constant default
+        with op.batch_alter_table(name) as batch_op:
+            batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+        table = sa.table(name, sa.column('created_at', sa.DateTime()), sa.column('updated_at', sa.DateTime()))
+        op.execute(table.update().values(updated_at=table.c.created_at))
+        with op.batch_alter_table(name) as batch_op:
+            batch_op.alter_column('updated_at', existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in reversed(TABLES):
+        with op.batch_alter_table(name) as batch_op:
+            batch_op.drop_column('updated_at')
@@ -0,0 +1,71 @@
+"""gig search
+
+Full-text search over gig title and description. Postgres gets a GIN index
+on the weighted tsvector expression (built CONCURRENTLY); SQLite gets an
+external-content FTS5 table kept in sync by triggers and filled from the
+existing rows.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 11:47:30.215906
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match app.models.gig.search_document so the planner can use the index
+SEARCH_DOCUMENT = (
+    "(setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'B'))"
+)
+
+SQLITE_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS gig_fts USING fts5("
+    "title, description, content='gig', content_rowid='rowid', tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS gig_fts_ai AFTER INSERT ON gig BEGIN "
+    "INSERT INTO gig_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS gig_fts_ad AFTER DELETE ON gig BEGIN "
+    "INSERT INTO gig_fts(gig_fts, rowid, title, description) VALUES ('delete', old.rowid, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS gig_fts_au AFTER UPDATE OF title, description ON gig BEGIN "
+    "INSERT INTO gig_fts(gig_fts, rowid, title, description) VALUES ('delete', old.rowid, old.title, old.description); "
+    "INSERT INTO gig_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description); END",
+    # Index the rows that existed before the triggers
+    "INSERT INTO gig_fts(gig_fts) VALUES ('rebuild')",
+]
+SQLITE_FTS_DROP = [
+    "DROP TRIGGER IF EXISTS gig_fts_au",
+    "DROP TRIGGER IF EXISTS gig_fts_ad",
+    "DROP TRIGGER IF EXISTS gig_fts_ai",
+    "DROP TABLE IF EXISTS gig_fts",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_gig_search_document ON gig USING gin ({SEARCH_DOCUMENT})")
+    elif dialect == 'sqlite':
+        for statement in SQLITE_FTS_DDL:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_gig_search_document")
+    elif dialect == 'sqlite':
+        for statement in SQLITE_FTS_DROP:
+            op.execute(statement)
@@ -0,0 +1,53 @@
+"""user rating summary
+
+Adds UserRatingSummary (review count, rating sum and star histogram per
+reviewee) and backfills it from existing reviews.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 12:20:54.663190
+
+"""
+from typing import Sequence, Union
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STARS = range(1, 6)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    summary = op.create_table('userratingsummary',
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('review_count', sa.Integer(), nullable=False),
+    sa.Column('rating_sum', sa.Integer(), nullable=False),
+    *[sa.Column(f'stars_{star}', sa.Integer(), nullable=False) for star in STARS],
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+    review = sa.table('review', sa.column('reviewee_id', sa.Uuid()), sa.column('rating', sa.Integer()))
+    aggregates = sa.select(
+        review.c.reviewee_id,
+        sa.func.count(),
+        sa.func.sum(review.c.rating),
+        *[sa.func.sum(sa.case((review.c.rating == star, 1), else_=0)) for star in STARS],
+        sa.literal(datetime.utcnow(), sa.DateTime()),
+    ).group_by(review.c.reviewee_id)
+    columns = ['user_id', 'review_count', 'rating_sum', *[f'stars_{star}' for star in STARS], 'updated_at']
+    op.execute(summary.insert().from_select(columns, aggregates))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('userratingsummary')
@@ -0,0 +1,34 @@
+"""order version
+
+Adds `version` to order for optimistic concurrency. Status transitions are a
+single conditional UPDATE that increments it; clients may send the version
+they last saw and get 409 if the order changed since.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 15:20:41.512903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, Sequence[str], None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('order') as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('order') as batch_op:
+        batch_op.drop_column('version')
@@ -0,0 +1,51 @@
+"""outbox event
+
+Adds the transactional outbox: events written in the same transaction as
+order transitions, messages and reviews, and delivered afterwards by the
+background dispatcher.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 16:05:12.204871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, Sequence[str], None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('outboxevent',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('aggregate_type', sqlmodel.sql.sqltypes.AutoString(length=32), nullable=False),
+    sa.Column('aggregate_id', sa.Uuid(), nullable=False),
+    sa.Column('event_type', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+    sa.Column('payload', sa.JSON().with_variant(postgresql.JSONB(), 'postgresql'), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('available_at', sa.DateTime(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('dispatched_at', sa.DateTime(), nullable=True),
+    sa.Column('failed_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_outboxevent_dispatched_at_id', 'outboxevent', ['dispatched_at', 'id'], unique=False)
+    op.create_index('ix_outboxevent_aggregate_id_id', 'outboxevent', ['aggregate_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_outboxevent_aggregate_id_id', table_name='outboxevent')
+    op.drop_index('ix_outboxevent_dispatched_at_id', table_name='outboxevent')
+    op.drop_table('outboxevent')
@@ -0,0 +1,71 @@
+"""gig search by id
+
+Rebuilds the SQLite FTS5 index so it is keyed by the gig's UUID (an
+UNINDEXED column) instead of gig's implicit rowid, which VACUUM may
+renumber on a table whose primary key is not an INTEGER. Postgres is
+unchanged: its GIN index is an expression over gig's own columns.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 19:12:44.508217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, Sequence[str], None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SQLITE_FTS_DROP = [
+    "DROP TRIGGER IF EXISTS gig_fts_au",
+    "DROP TRIGGER IF EXISTS gig_fts_ad",
+    "DROP TRIGGER IF EXISTS gig_fts_ai",
+    "DROP TABLE IF EXISTS gig_fts",
+]
+
+SQLITE_FTS_BY_ID = [
+    "CREATE VIRTUAL TABLE gig_fts USING fts5("
+    "gig_id UNINDEXED, title, description, tokenize='porter unicode61')",
+    "CREATE TRIGGER gig_fts_ai AFTER INSERT ON gig BEGIN "
+    "INSERT INTO gig_fts(gig_id, title, description) VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER gig_fts_ad AFTER DELETE ON gig BEGIN "
+    "DELETE FROM gig_fts WHERE gig_id = old.id; END",
+    "CREATE TRIGGER gig_fts_au AFTER UPDATE OF title, description ON gig BEGIN "
+    "DELETE FROM gig_fts WHERE gig_id = old.id; "
+    "INSERT INTO gig_fts(gig_id, title, description) VALUES (new.id, new.title, new.description); END",
+    "INSERT INTO gig_fts(gig_id, title, description) SELECT id, title, description FROM gig",
+]
+
+# As created by 0005
+SQLITE_FTS_BY_ROWID = [
+    "CREATE VIRTUAL TABLE gig_fts USING fts5("
+    "title, description, content='gig', content_rowid='rowid', tokenize='porter unicode61')",
+    "CREATE TRIGGER gig_fts_ai AFTER INSERT ON gig BEGIN "
+    "INSERT INTO gig_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description); END",
+    "CREATE TRIGGER gig_fts_ad AFTER DELETE ON gig BEGIN "
+    "INSERT INTO gig_fts(gig_fts, rowid, title, description) VALUES ('delete', old.rowid, old.title, old.description); END",
+    "CREATE TRIGGER gig_fts_au AFTER UPDATE OF title, description ON gig BEGIN "
+    "INSERT INTO gig_fts(gig_fts, rowid, title, description) VALUES ('delete', old.rowid, old.title, old.description); "
+    "INSERT INTO gig_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description); END",
+    "INSERT INTO gig_fts(gig_fts) VALUES ('rebuild')",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == 'sqlite':
+        for statement in SQLITE_FTS_DROP + SQLITE_FTS_BY_ID:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'sqlite':
+        for statement in SQLITE_FTS_DROP + SQLITE_FTS_BY_ROWID:
+            op.execute(statement)
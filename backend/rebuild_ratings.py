@@ -0,0 +1,16 @@
+from app.database import engine
+from sqlmodel import Session
+from app.services.rating_service import rebuild_summaries
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def rebuild():
+    # Backfills / repairs UserRatingSummary from the review table
+    with Session(engine) as session:
+        users = rebuild_summaries(session)
+    logger.info(f"Rebuilt rating summaries for {users} users.")
+
+if __name__ == "__main__":
+    rebuild()
@@ -0,0 +1,82 @@
+import os
+
+# The app's engines are only built on first use, but a few paths the fixtures do not
+# override (readiness probe, pool stats) still build them; give those a throwaway
+# in-memory database. Everything else runs on engines the fixtures create per test,
+# so each test starts from a fresh schema and can count its own statements.
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from contextlib import contextmanager
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core import principal_cache
+from app.core.read_cache import MemoryCacheBackend
+from app.database import get_async_session, get_async_session_factory, get_read_session, get_read_session_factory
+from app.main import app
+from app.services import gig_catalog
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'test.db'}"
+
+
+@pytest.fixture
+def db(db_url):
+    """A sync session on a fresh SQLite database with every table created, for seeding."""
+    engine = create_engine(db_url)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine, expire_on_commit=False) as session:
+        yield session
+    engine.dispose()
+
+
+@pytest.fixture
+def async_engine(db_url, db):
+    # NullPool: the TestClient may run each request on a different event loop
+    engine = create_async_engine(db_url.replace("sqlite://", "sqlite+aiosqlite://"), poolclass=NullPool)
+    yield engine
+
+
+@pytest.fixture
+def client(async_engine, monkeypatch):
+    """TestClient whose request sessions use the test database."""
+    sessions = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+    async def override_session():
+        async with sessions() as session:
+            yield session
+
+    app.dependency_overrides[get_async_session] = override_session
+    app.dependency_overrides[get_async_session_factory] = lambda: sessions
+    # One database plays primary and replica; test_read_replicas wires up two
+    app.dependency_overrides[get_read_session] = override_session
+    app.dependency_overrides[get_read_session_factory] = lambda: sessions
+    principal_cache.clear()
+    monkeypatch.setattr(gig_catalog.catalog_cache, "backend", MemoryCacheBackend(1000, 60))
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def count_queries(async_engine):
+    """`with count_queries() as statements:` collects the SQL run by request handlers."""
+    @contextmanager
+    def counter():
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+    return counter
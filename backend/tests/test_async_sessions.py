@@ -0,0 +1,37 @@
+from app.core.security import create_access_token
+from app.database import get_session, get_sqlmodel_session
+from app.main import app
+from app.models import User
+
+SYNC_SESSIONS = {get_session, get_sqlmodel_session}
+# First message of a pair (the worst case): receiver lookup, message insert, conversation
+# update, lookup and savepointed insert, outbox insert, refresh
+SEND_MESSAGE_MAX_QUERIES = 9
+
+
+def dependency_calls(dependant):
+    for dependency in dependant.dependencies:
+        yield dependency.call
+        yield from dependency_calls(dependency)
+
+
+def test_no_route_depends_on_a_sync_session():
+    routes = [route for route in app.routes if hasattr(route, "dependant")]
+    assert len(routes) > 20
+    offenders = [route.path for route in routes if SYNC_SESSIONS & set(dependency_calls(route.dependant))]
+    assert offenders == []
+
+
+def test_send_message_runs_on_the_async_engine(db, client, count_queries):
+    sender = User(email="s@x", hashed_password="x", full_name="S")
+    receiver = User(email="r@x", hashed_password="x", full_name="R")
+    db.add_all([sender, receiver])
+    db.commit()
+    headers = {"Authorization": "Bearer " + create_access_token(sender.id)}
+    client.get("/me", headers=headers)  # warm the principal cache
+
+    with count_queries() as statements:
+        sent = client.post("/api/v1/messages/", json={"receiver_id": str(receiver.id), "content": "hi"}, headers=headers)
+    assert sent.status_code == 200
+    assert any(statement.startswith("INSERT INTO message") for statement in statements)
+    assert len(statements) <= SEND_MESSAGE_MAX_QUERIES
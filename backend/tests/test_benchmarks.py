@@ -0,0 +1,40 @@
+from sqlmodel import create_engine
+from benchmarks.load import compare, percentile
+from benchmarks.seed import SCALES, seed
+
+
+def _result(p95=10.0, rps=100.0, errors=0, queries=2.0):
+    return {"scenarios": {"orders": {
+        "latency_ms": {"p95": p95}, "throughput_rps": rps, "errors": errors,
+        "operations": {"approve": {"queries_per_request": queries}},
+    }}}
+
+
+def test_seed_is_deterministic(tmp_path):
+    results = []
+    for name in ("a", "b"):
+        engine = create_engine(f"sqlite:///{tmp_path / name}.db")
+        results.append(seed(engine, SCALES["tiny"], seed=7))
+        engine.dispose()
+    first, second = results
+    assert first.user_ids == second.user_ids
+    assert first.active_gigs == second.active_gigs
+    assert first.reviewable == second.reviewable
+    assert first.busiest_pair == second.busiest_pair
+
+
+def test_percentile_is_nearest_rank():
+    values = sorted(float(i) for i in range(1, 101))
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([3.0], 95) == 3.0
+    assert percentile([], 95) == 0.0
+
+
+def test_compare_flags_regressions_beyond_tolerance():
+    baseline = _result()
+    assert compare(_result(p95=12.0, rps=90.0, queries=2.3), baseline, tolerance=0.25) == []
+
+    problems = compare(_result(p95=20.0, rps=50.0, errors=1, queries=3.0), baseline, tolerance=0.25)
+    assert len(problems) == 4
+    assert any("statements per request" in problem for problem in problems)
@@ -0,0 +1,49 @@
+from decimal import Decimal
+from uuid import uuid4
+from sqlmodel import select
+from app.core.security import create_access_token
+from app.models import Gig, Order, PaymentProof, User
+from app.models.order import OrderStatus
+
+
+def test_bulk_confirm_payment_reports_each_order(db, client, count_queries):
+    client_user = User(email="client@x", hashed_password="x", full_name="Client")
+    freelancer, other = User(email="f@x", hashed_password="x", full_name="F"), User(email="o@x", hashed_password="x", full_name="O")
+    db.add_all([client_user, freelancer, other])
+    gig = Gig(freelancer_id=freelancer.id, title="Gig", description="d", delivery_days=2)
+    other_gig = Gig(freelancer_id=other.id, title="Other", description="d", delivery_days=2)
+    db.add_all([gig, other_gig])
+    submitted = [Order(gig_id=gig.id, client_id=client_user.id, freelancer_id=freelancer.id, status=OrderStatus.PAYMENT_SUBMITTED) for _ in range(20)]
+    confirmed = Order(gig_id=gig.id, client_id=client_user.id, freelancer_id=freelancer.id, status=OrderStatus.PAYMENT_CONFIRMED)
+    pending = Order(gig_id=gig.id, client_id=client_user.id, freelancer_id=freelancer.id)
+    foreign = Order(gig_id=other_gig.id, client_id=client_user.id, freelancer_id=other.id, status=OrderStatus.PAYMENT_SUBMITTED)
+    db.add_all([*submitted, confirmed, pending, foreign])
+    db.add_all([PaymentProof(order_id=o.id, user_id=client_user.id, proof_reference="r", payer_name="C", amount=Decimal("5")) for o in submitted])
+    db.commit()
+    headers = {"Authorization": "Bearer " + create_access_token(freelancer.id)}
+    client.get("/me", headers=headers)  # warm the principal cache
+
+    missing = uuid4()
+    ids = [str(o.id) for o in [*submitted, confirmed, pending, foreign]] + [str(missing)]
+    with count_queries() as statements:
+        response = client.post("/api/v1/orders/bulk/confirm-payment", json={"order_ids": ids}, headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    # Statements do not grow with the batch: update orders, verify proofs, outbox events, explain the rest
+    assert len(statements) == 4
+    assert body["updated"] == 20
+    outcomes = [result["outcome"] for result in body["results"]]
+    assert outcomes == ["updated"] * 20 + ["unchanged", "conflict", "forbidden", "not_found"]
+    assert all(r["order"]["payment_status"] == "verified" for r in body["results"][:20])
+
+    db.expire_all()
+    assert all(proof.verified for proof in db.exec(select(PaymentProof)).all())
+
+
+def test_bulk_transition_rejects_unknown_status(db, client):
+    user = User(email="u@x", hashed_password="x", full_name="U")
+    db.add(user)
+    db.commit()
+    headers = {"Authorization": "Bearer " + create_access_token(user.id)}
+    response = client.post("/api/v1/orders/bulk/transition", json={"order_ids": [str(uuid4())], "status": "CANCELLED"}, headers=headers)
+    assert response.status_code == 400
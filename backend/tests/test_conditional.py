@@ -0,0 +1,60 @@
+from datetime import datetime
+from starlette.requests import Request
+from app.core import principal_cache
+from app.core.conditional import conditional_json, http_date
+from app.core.security import create_access_token
+from app.models import Gig, Order, User
+
+
+def make_request(**headers):
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+def test_matching_validators_answer_304_without_a_body():
+    modified = datetime(2026, 1, 2, 3, 4, 5, 678000)
+    first = conditional_json(make_request(), b'{"a":1}', last_modified=modified, cache_control="private, no-cache")
+    etag = first.headers["etag"]
+    assert first.status_code == 200 and first.headers["cache-control"] == "private, no-cache"
+
+    assert conditional_json(make_request(if_none_match=f'W/{etag}, "other"'), b'{"a":1}').status_code == 304
+    assert conditional_json(make_request(if_none_match=etag), b'{"a":2}').status_code == 200
+    revalidated = conditional_json(make_request(if_modified_since=http_date(modified)), b'{"a":1}', last_modified=modified)
+    assert revalidated.status_code == 304 and revalidated.body == b""
+
+
+def test_me_etag_is_stable_across_principal_cache_refreshes(db, client):
+    user = User(email="me@x", hashed_password="secret-hash", full_name="Me")
+    db.add(user)
+    db.commit()
+    headers = {"Authorization": "Bearer " + create_access_token(user.id)}
+
+    loaded = client.get("/me", headers=headers)  # from the database
+    cached = client.get("/me", headers=headers)  # rebuilt from the principal cache
+    assert "hashed_password" not in loaded.json() and loaded.json()["email"] == "me@x"
+    assert loaded.headers["etag"] == cached.headers["etag"]
+
+    principal_cache.clear()
+    revalidated = client.get("/me", headers={**headers, "If-None-Match": loaded.headers["etag"]})
+    assert revalidated.status_code == 304
+
+
+def test_order_list_probes_versions_only_on_revalidation(db, client, count_queries):
+    freelancer = User(email="f@x", hashed_password="x", full_name="F")
+    buyer = User(email="b@x", hashed_password="x", full_name="B")
+    db.add_all([freelancer, buyer])
+    gig = Gig(freelancer_id=freelancer.id, title="Gig", description="d", delivery_days=2)
+    db.add(gig)
+    db.add(Order(gig_id=gig.id, client_id=buyer.id, freelancer_id=freelancer.id))
+    db.commit()
+    headers = {"Authorization": "Bearer " + create_access_token(buyer.id)}
+    client.get("/me", headers=headers)  # warm the principal cache
+
+    with count_queries() as statements:
+        first = client.get("/api/v1/orders/", headers=headers)
+    assert first.status_code == 200 and len(first.json()) == 1
+    assert len(statements) == 1
+
+    with count_queries() as statements:
+        revalidated = client.get("/api/v1/orders/", headers={**headers, "If-None-Match": first.headers["etag"]})
+    assert revalidated.status_code == 304 and len(statements) == 1
@@ -0,0 +1,83 @@
+import asyncio
+from uuid import uuid4
+from app.websocket.backplane import InProcessBackplane
+from app.websocket.connection_manager import ConnectionManager
+
+
+class FakeWebSocket:
+    def __init__(self, stalled=False):
+        self.sent = []
+        self.closed_with = None
+        self._stalled = stalled
+
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, message):
+        if self._stalled:
+            await asyncio.Event().wait()
+        self.sent.append(message)
+
+    async def close(self, code=1000):
+        self.closed_with = code
+
+
+def test_every_tab_receives_the_message():
+    async def scenario():
+        manager = ConnectionManager(InProcessBackplane())
+        user = uuid4()
+        first, second = FakeWebSocket(), FakeWebSocket()
+        await manager.connect(first, user)
+        await manager.connect(second, user)
+
+        await manager.send_personal_message("hi", user)
+        await asyncio.sleep(0.01)
+        assert first.sent == ["hi"] and second.sent == ["hi"]
+        await manager.stop()
+
+    asyncio.run(scenario())
+
+
+def test_stalled_client_does_not_block_sender_and_drops_oldest():
+    async def scenario():
+        manager = ConnectionManager(InProcessBackplane())
+        user = uuid4()
+        stalled = FakeWebSocket(stalled=True)
+        connection = await manager.connect(stalled, user)
+        connection.queue = asyncio.Queue(maxsize=2)
+        connection.overflow_policy = "drop_oldest"
+
+        # The writer is stuck on the first frame; sends must still return immediately
+        for i in range(5):
+            await asyncio.wait_for(manager.send_personal_message(f"m{i}", user), 0.1)
+        await asyncio.sleep(0.01)
+
+        assert [connection.queue.get_nowait() for _ in range(2)] == ["m3", "m4"]
+        assert manager.get_stats()["frames_dropped"] == 2
+        await manager.stop()
+
+    asyncio.run(scenario())
+
+
+def test_shutdown_leaves_no_pending_tasks():
+    async def scenario():
+        manager = ConnectionManager(InProcessBackplane())
+        manager._heartbeat = asyncio.create_task(asyncio.Event().wait())
+        overloaded = await manager.connect(FakeWebSocket(stalled=True), uuid4())
+        overloaded.queue = asyncio.Queue(maxsize=1)
+        overloaded.overflow_policy = "close"
+        gone = await manager.connect(FakeWebSocket(stalled=True), uuid4())
+        await manager.connect(FakeWebSocket(stalled=True), uuid4())
+        await asyncio.sleep(0)
+
+        # Overflow schedules a close; a client dropping off cancels its writer
+        for i in range(3):
+            overloaded.enqueue(f"m{i}")
+        await manager.disconnect(gone)
+        assert gone._writer.done()
+
+        await manager.stop()
+        assert overloaded.websocket.closed_with == 1013
+        assert asyncio.all_tasks() == {asyncio.current_task()}
+
+    asyncio.run(scenario())
@@ -0,0 +1,42 @@
+from app.core.security import create_access_token
+from app.models import User
+
+
+def test_inbox_pages_by_latest_activity_with_unread_counters(db, client):
+    me = User(email="me@x", hashed_password="x", full_name="Me")
+    peers = [User(email=f"p{i}@x", hashed_password="x", full_name=f"P{i}") for i in range(4)]
+    db.add_all([me, *peers])
+    db.commit()
+    mine = {"Authorization": "Bearer " + create_access_token(me.id)}
+
+    def send(sender, receiver, content):
+        headers = {"Authorization": "Bearer " + create_access_token(sender.id)}
+        response = client.post("/api/v1/messages/", json={"receiver_id": str(receiver.id), "content": content}, headers=headers)
+        assert response.status_code == 200
+
+    for peer in peers:
+        send(peer, me, f"hi from {peer.full_name}")
+    send(peers[0], me, "again")
+    send(me, me, "note to self")
+
+    # Newest activity first; the notes-to-self conversation is listed once
+    first = client.get("/api/v1/messages/conversations?limit=3", headers=mine)
+    second = client.get(f"/api/v1/messages/conversations?limit=3&cursor={first.headers['X-Next-Cursor']}", headers=mine)
+    inbox = first.json() + second.json()
+    assert [c["last_message_preview"] for c in inbox] == ["note to self", "again", "hi from P3", "hi from P2", "hi from P1"]
+    assert "X-Next-Cursor" not in second.headers
+    assert [c["peer_id"] for c in inbox][:2] == [str(me.id), str(peers[0].id)]
+    assert [c["unread_count"] for c in inbox] == [0, 2, 1, 1, 1]
+
+    # The sender's side never counts its own messages as unread
+    p0 = {"Authorization": "Bearer " + create_access_token(peers[0].id)}
+    assert client.get("/api/v1/messages/conversations", headers=p0).json()[0]["unread_count"] == 0
+
+    read = client.post(f"/api/v1/messages/conversations/{peers[0].id}/read", headers=mine)
+    assert read.status_code == 200 and read.json()["unread_count"] == 0
+    assert client.get("/api/v1/messages/conversations?limit=2", headers=mine).json()[1]["unread_count"] == 0
+
+    stranger = User(email="s@x", hashed_password="x", full_name="S")
+    db.add(stranger)
+    db.commit()
+    assert client.post(f"/api/v1/messages/conversations/{stranger.id}/read", headers=mine).status_code == 404
@@ -0,0 +1,79 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+from app.config import settings
+from app.core.security import create_access_token
+from app.models import Gig, Message, Order, Review, User
+from app.models.order import OrderStatus
+
+
+def seed(db):
+    client = User(email="client@x", hashed_password="x", full_name="Client")
+    freelancers = [User(email=f"f{i}@x", hashed_password="x", full_name=f"F{i}") for i in range(2)]
+    outsider = User(email="o@x", hashed_password="x", full_name="O")
+    db.add_all([client, *freelancers, outsider])
+    gigs = [Gig(freelancer_id=f.id, title="Gig", description="d", delivery_days=2) for f in freelancers]
+    db.add_all(gigs)
+    start = datetime(2026, 1, 1)
+    orders = []
+    for i in range(12):
+        gig = gigs[i % 2]
+        status = OrderStatus.COMPLETED if i % 3 == 0 else OrderStatus.PENDING_PAYMENT
+        orders.append(Order(gig_id=gig.id, client_id=client.id, freelancer_id=gig.freelancer_id,
+                            status=status, created_at=start + timedelta(days=i)))
+    orders.append(Order(gig_id=gigs[0].id, client_id=outsider.id, freelancer_id=freelancers[0].id))
+    messages = [Message(sender_id=client.id if i % 2 else freelancers[0].id, receiver_id=freelancers[0].id if i % 2 else client.id,
+                        content=f"m{i}", created_at=start + timedelta(hours=i)) for i in range(7)]
+    messages.append(Message(sender_id=outsider.id, receiver_id=freelancers[0].id, content="other"))
+    reviews = [Review(order_id=orders[0].id, reviewer_id=client.id, reviewee_id=freelancers[0].id, rating=5, comment="great, fast")]
+    db.add_all([*orders, *messages, *reviews])
+    db.commit()
+    return client, freelancers, orders
+
+
+def ndjson(response):
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"] == "application/x-ndjson"
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_exports_stream_everything_in_batches_and_resume(db, client, monkeypatch):
+    user, freelancers, orders = seed(db)
+    headers = {"Authorization": "Bearer " + create_access_token(user.id)}
+    # Several round trips through the server-side cursor
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 5)
+
+    rows = ndjson(client.get("/api/v1/exports/orders", headers=headers))
+    assert [row["id"] for row in rows] == [str(order.id) for order in orders[:12]]
+    assert "attachment" in client.get("/api/v1/exports/orders", headers=headers).headers["content-disposition"]
+
+    resumed = ndjson(client.get(f"/api/v1/exports/orders?after={rows[6]['id']}", headers=headers))
+    assert resumed == rows[7:]
+    assert client.get(f"/api/v1/exports/orders?after={orders[12].id}", headers=headers).status_code == 400
+
+    messages = ndjson(client.get("/api/v1/exports/messages", headers=headers))
+    assert [m["content"] for m in messages] == [f"m{i}" for i in range(7)]
+
+    reviews = client.get("/api/v1/exports/reviews?format=csv&role=given", headers=headers)
+    assert reviews.headers["content-type"].startswith("text/csv")
+    table = list(csv.DictReader(io.StringIO(reviews.text)))
+    assert [(row["rating"], row["comment"]) for row in table] == [("5", "great, fast")]
+
+
+def test_export_filters(db, client):
+    user, freelancers, orders = seed(db)
+    headers = {"Authorization": "Bearer " + create_access_token(user.id)}
+
+    completed = ndjson(client.get("/api/v1/exports/orders", params={"status": OrderStatus.COMPLETED}, headers=headers))
+    assert len(completed) == 4 and {row["status"] for row in completed} == {OrderStatus.COMPLETED}
+
+    with_f1 = ndjson(client.get("/api/v1/exports/orders", params={"counterpart_id": str(freelancers[1].id)}, headers=headers))
+    assert len(with_f1) == 6 and {row["freelancer_id"] for row in with_f1} == {str(freelancers[1].id)}
+
+    window = ndjson(client.get("/api/v1/exports/orders", params={"since": "2026-01-03", "until": "2026-01-06"}, headers=headers))
+    assert [row["created_at"][:10] for row in window] == ["2026-01-03", "2026-01-04", "2026-01-05"]
+
+    assert ndjson(client.get("/api/v1/exports/orders?role=freelancer", headers=headers)) == []
+    conversation = ndjson(client.get("/api/v1/exports/messages", params={"counterpart_id": str(freelancers[1].id)}, headers=headers))
+    assert conversation == []
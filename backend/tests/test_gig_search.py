@@ -0,0 +1,67 @@
+from decimal import Decimal
+from uuid import uuid4
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlmodel import Session, SQLModel, create_engine
+from app.models import Gig, User
+from app.services.gig_search import fts5_query, search_statement, search_terms, tsquery_text
+
+
+def test_fts_index_follows_writes_and_ranks_title_matches_first():
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        user = User(id=uuid4(), email="f@x", hashed_password="x", full_name="F")
+        logo = Gig(freelancer_id=user.id, title="Logo design", description="Brand marks", price=Decimal("50"), delivery_days=3)
+        api = Gig(freelancer_id=user.id, title="API work", description="Backends, no logo", price=Decimal("300"), delivery_days=10)
+        session.add_all([user, logo, api])
+        session.commit()
+
+        def titles(q, **filters):
+            return [gig.title for gig in session.exec(search_statement("sqlite", search_terms(q), 10, **filters))]
+
+        assert titles("logo") == ["Logo design", "API work"]
+        assert titles("logo", max_price=Decimal("100")) == ["Logo design"]
+        assert titles('") OR title:*') == []
+
+        logo.title = "Illustration"
+        session.add(logo)
+        session.commit()
+        assert titles("illustr") == ["Illustration"]
+        session.delete(api)
+        session.commit()
+        assert titles("backends") == []
+
+
+def test_fts_index_does_not_depend_on_gig_rowids(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'search.db'}")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        user = User(id=uuid4(), email="f@x", hashed_password="x", full_name="F")
+        gigs = [Gig(freelancer_id=user.id, title=f"Gig {word}", description="d", delivery_days=1)
+                for word in ["alpha", "bravo", "charlie", "delta"]]
+        session.add_all([user, *gigs])
+        session.commit()
+        # What VACUUM may do to a table without an INTEGER PRIMARY KEY: renumber its rowids
+        session.exec(text("UPDATE gig SET rowid = -rowid"))
+        session.exec(text("UPDATE gig SET rowid = 5 + rowid"))
+        session.commit()
+
+        def titles(q):
+            return [gig.title for gig in session.exec(search_statement("sqlite", search_terms(q), 10))]
+
+        assert titles("alpha") == ["Gig alpha"] and titles("delta") == ["Gig delta"]
+        gigs[3].title = "Gig echo"
+        session.add(gigs[3])
+        session.commit()
+        assert titles("delta") == [] and titles("echo") == ["Gig echo"] and titles("bravo") == ["Gig bravo"]
+
+
+def test_backends_both_match_the_last_term_as_a_prefix():
+    terms = search_terms("Logo des")
+    assert fts5_query(terms) == '"logo" "des"*'
+    assert tsquery_text(terms) == "'logo' & 'des':*"
+
+    statement = search_statement("postgresql", terms, 10).compile(dialect=postgresql.dialect())
+    assert "to_tsquery('english'::regconfig" in str(statement)
+    assert "'logo' & 'des':*" in statement.params.values()
@@ -0,0 +1,47 @@
+import re
+from contextlib import contextmanager
+from sqlalchemy import event
+from app.core.security import create_access_token
+from app.models import Gig, Message, Order, User
+
+# "SCAN <table>" without an index is a full table scan
+FULL_SCAN = re.compile(r'SCAN "?(gig|order|message|review)"?$')
+
+
+@contextmanager
+def captured_selects(async_engine):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+
+def test_hot_reads_use_indexes_instead_of_table_scans(db, async_engine, client):
+    me, other = User(email="me@x", hashed_password="x", full_name="Me"), User(email="o@x", hashed_password="x", full_name="O")
+    db.add_all([me, other])
+    gigs = [Gig(freelancer_id=other.id, title=f"Gig {i}", description="d", delivery_days=1) for i in range(5)]
+    db.add_all(gigs)
+    db.add_all([Order(gig_id=gig.id, client_id=me.id, freelancer_id=other.id) for gig in gigs])
+    db.add_all([Message(sender_id=me.id, receiver_id=other.id, content=str(i)) for i in range(5)])
+    db.commit()
+    headers = {"Authorization": "Bearer " + create_access_token(me.id)}
+    client.get("/me", headers=headers)  # warm the principal cache
+
+    with captured_selects(async_engine) as statements:
+        assert client.get("/api/v1/gigs/?limit=3").status_code == 200
+        assert client.get("/api/v1/orders/?limit=3", headers=headers).status_code == 200
+        assert client.get(f"/api/v1/messages/{other.id}?limit=3", headers=headers).status_code == 200
+    assert len(statements) == 3
+
+    connection = db.connection()
+    for statement, parameters in statements:
+        plan = [row[-1] for row in connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, tuple(parameters))]
+        assert any("INDEX" in step for step in plan), (statement, plan)
+        assert not [step for step in plan if FULL_SCAN.search(step)], (statement, plan)
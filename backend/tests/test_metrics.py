@@ -0,0 +1,75 @@
+import logging
+import re
+import pytest
+from uuid import uuid4
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app import database
+from app.config import settings
+from app.core import limiter as rate_limits
+from app.core import metrics
+from app.core.security import create_access_token
+from app.models import Gig, User
+
+# One sample line of the text format: name, optional {labels}, value
+SAMPLE = re.compile(r'[a-zA-Z_:][a-zA-Z0-9_:]*(\{([a-zA-Z_][a-zA-Z0-9_]*="(\\.|[^"\\])*",?)*\})? \S+')
+
+
+@pytest.fixture
+def scrape(client, monkeypatch):
+    """Fetches /metrics the way Prometheus is configured to: with the metrics token."""
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+    return lambda: client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"}).text
+
+
+def test_request_metrics_server_timing_and_slow_query_log(db, client, async_engine, scrape, monkeypatch, caplog):
+    freelancer = User(email="f@x", hashed_password="x", full_name="F")
+    db.add(freelancer)
+    gig = Gig(freelancer_id=freelancer.id, title="Logo", description="d", delivery_days=2)
+    db.add(gig)
+    db.commit()
+    metrics.instrument_engine(async_engine, "test")
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 1e-6)
+    monkeypatch.setattr(settings, "SERVER_TIMING_ENABLED", True)
+
+    with caplog.at_level(logging.WARNING, logger="app.slow_query"):
+        response = client.get(f"/api/v1/gigs/{gig.id}")
+    assert response.status_code == 200
+    assert 'db;dur=' in response.headers["server-timing"] and 'desc="1 queries"' in response.headers["server-timing"]
+    assert any("/api/v1/gigs/{id}" in record.getMessage() for record in caplog.records)
+
+    exposition = scrape()
+    # Labelled by route template, not by the concrete id
+    assert 'devmart_http_request_duration_seconds_count{method="GET",route="/api/v1/gigs/{id}",status="200"}' in exposition
+    assert 'devmart_http_request_db_queries_bucket{method="GET",route="/api/v1/gigs/{id}",le="1"}' in exposition
+    assert str(gig.id) not in exposition
+    assert "devmart_db_slow_queries_total" in exposition
+
+
+def test_exposition_stays_valid_after_a_rate_limited_request(db, client, scrape):
+    user = User(email="u@x", hashed_password="x", full_name="U")
+    db.add(user)
+    db.commit()
+    headers = {"Authorization": "Bearer " + create_access_token(user.id)}
+    rate_limits.limiter.reset()
+    codes = [client.post("/api/v1/orders/", json={"gig_id": str(uuid4())}, headers=headers).status_code for _ in range(6)]
+    assert codes[-1] == 429
+    rate_limits.limiter.reset()
+
+    lines = [line for line in scrape().splitlines() if line and not line.startswith("#")]
+    assert [line for line in lines if not SAMPLE.fullmatch(line)] == []
+    assert any(line.startswith('devmart_rate_limit_rejected_total{route="/api/v1/orders/",key_kind="user"}') for line in lines)
+
+
+@pytest.mark.parametrize("path", ["/metrics", "/health/pool", "/health/websockets", "/health/cache", "/health/rate-limits", "/health/outbox"])
+def test_operational_endpoints_need_the_metrics_token(db, client, async_engine, monkeypatch, path):
+    # /health/outbox opens its own session instead of a request dependency
+    monkeypatch.setattr(database, "AsyncSessionLocal", async_sessionmaker(async_engine, class_=AsyncSession), raising=False)
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "")
+    assert client.get(path).status_code == 404
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+    assert client.get(path).status_code == 401
+    assert client.get(path, headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert client.get(path, headers={"Authorization": "Bearer scrape-secret"}).status_code == 200
+    assert client.get("/health/live").json() == {"status": "ok"}
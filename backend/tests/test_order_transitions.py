@@ -0,0 +1,44 @@
+from app.core.security import create_access_token
+from app.models import Gig, Order, User
+from app.models.order import OrderStatus
+
+
+def seed(db, status):
+    client = User(email="client@x", hashed_password="x", full_name="Client")
+    freelancer = User(email="f@x", hashed_password="x", full_name="F")
+    db.add_all([client, freelancer])
+    gig = Gig(freelancer_id=freelancer.id, title="Gig", description="d", delivery_days=2)
+    db.add(gig)
+    order = Order(gig_id=gig.id, client_id=client.id, freelancer_id=freelancer.id, status=status)
+    db.add(order)
+    db.commit()
+    auth = lambda user: {"Authorization": "Bearer " + create_access_token(user.id)}
+    return order, auth(client), auth(freelancer)
+
+
+def test_transition_is_one_conditional_update(db, client, count_queries):
+    order, as_client, as_freelancer = seed(db, OrderStatus.PAYMENT_CONFIRMED)
+    client.get("/me", headers=as_freelancer)  # warm the principal cache
+
+    with count_queries() as statements:
+        response = client.patch(f"/api/v1/orders/{order.id}/start-work", headers=as_freelancer)
+    assert response.status_code == 200
+    assert response.json()["status"] == OrderStatus.IN_PROGRESS and response.json()["version"] == 2
+    # The conditional UPDATE and its outbox event; no SELECT before or after
+    assert [s.split()[0] for s in statements] == ["UPDATE", "INSERT"]
+
+    # Wrong role, then a stale version
+    assert client.patch(f"/api/v1/orders/{order.id}/submit-work", headers=as_client).status_code == 403
+    assert client.patch(f"/api/v1/orders/{order.id}/submit-work?version=1", headers=as_freelancer).status_code == 409
+    assert client.patch(f"/api/v1/orders/{order.id}/submit-work?version=2", headers=as_freelancer).status_code == 200
+
+
+def test_conflicting_transitions_only_one_wins(db, client):
+    order, as_client, _ = seed(db, OrderStatus.SUBMITTED)
+
+    approve = client.patch(f"/api/v1/orders/{order.id}/approve", headers=as_client)
+    revision = client.patch(f"/api/v1/orders/{order.id}/revision", headers=as_client)
+    assert approve.status_code == 200 and approve.json()["status"] == OrderStatus.COMPLETED
+    assert revision.status_code == 409
+    # Repeating the action that won is idempotent
+    assert client.patch(f"/api/v1/orders/{order.id}/approve", headers=as_client).json()["version"] == 2
@@ -0,0 +1,55 @@
+import asyncio
+from uuid import uuid4
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models import OutboxEvent
+from app.services import outbox
+
+
+class Note(BaseModel):
+    n: int
+
+
+def test_dispatcher_retries_and_keeps_per_aggregate_order(tmp_path):
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'outbox.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        first, second = uuid4(), uuid4()
+        async with sessions() as session:
+            await outbox.record(session, [
+                outbox.new_event("order", aggregate, "test", Note(n=n), [])
+                for n, aggregate in enumerate([first, second, first, second])
+            ])
+            await session.commit()
+
+        delivered, failures = [], {0: 1}
+
+        async def consumer(event):
+            n = event.payload["data"]["n"]
+            if failures.get(n):
+                failures[n] -= 1
+                raise RuntimeError("consumer down")
+            delivered.append(n)
+
+        dispatcher = outbox.OutboxDispatcher(session_factory=sessions, batch_size=10, retry_base=0)
+        dispatcher.subscribe(consumer)
+        # Event 0 fails: event 2 (same aggregate) must wait for it, events 1 and 3 go through
+        await dispatcher.dispatch_once()
+        assert delivered == [1, 3]
+        await dispatcher.dispatch_once()
+        assert delivered == [1, 3, 0, 2]
+        assert dispatcher.stats.retried == 1 and dispatcher.stats.dispatched == 4
+
+        async with sessions() as session:
+            events = (await session.exec(select(OutboxEvent).order_by(OutboxEvent.id))).all()
+            assert all(event.dispatched_at is not None for event in events)
+            assert events[0].attempts == 1 and "consumer down" in events[0].last_error
+            assert (await outbox.backlog(session))["pending"] == 0
+        await engine.dispose()
+
+    asyncio.run(scenario())
@@ -0,0 +1,40 @@
+from datetime import datetime
+from uuid import uuid4
+import pytest
+from fastapi import HTTPException
+from app.core.pagination import decode_cursor, encode_cursor
+from app.models import Gig, User
+
+
+def test_cursor_round_trips_and_rejects_garbage():
+    created_at, id = datetime(2026, 3, 4, 5, 6, 7, 890123), uuid4()
+    assert decode_cursor(encode_cursor(created_at, id)) == (created_at, id)
+
+    for bad in ["", "not base64!", encode_cursor(created_at, id)[:-4], "WyIyMDI2Il0"]:
+        with pytest.raises(HTTPException) as error:
+            decode_cursor(bad)
+        assert error.value.status_code == 400
+
+
+def test_pages_are_stable_when_created_at_ties(db, client):
+    freelancer = User(email="f@x", hashed_password="x", full_name="F")
+    db.add(freelancer)
+    same_time = datetime(2026, 1, 1)
+    gigs = [Gig(freelancer_id=freelancer.id, title=f"Gig {i}", description="d", delivery_days=2, created_at=same_time) for i in range(7)]
+    db.add_all(gigs)
+    db.commit()
+    expected = [str(gig.id) for gig in sorted(gigs, key=lambda gig: gig.id, reverse=True)]
+
+    seen, cursor = [], None
+    while True:
+        response = client.get("/api/v1/gigs/", params={"limit": 3, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        seen += [gig["id"] for gig in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert seen == expected
+
+    # Offset paging shares the ordering
+    assert [gig["id"] for gig in client.get("/api/v1/gigs/?skip=3&limit=3").json()] == expected[3:6]
+    assert client.get("/api/v1/gigs/?cursor=tampered").status_code == 400
@@ -0,0 +1,50 @@
+import pytest
+from sqlalchemy import exc
+from sqlmodel import create_engine
+from app import database
+from app.config import settings
+from app.core.pool import MeteredAsyncQueuePool, MeteredQueuePool, attach_metrics, engine_options
+
+
+def test_engine_options_follow_settings(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 7)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 3)
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_MS", 2500)
+
+    sync = engine_options("postgresql://u:p@db/app")
+    assert sync["poolclass"] is MeteredQueuePool
+    assert (sync["pool_size"], sync["max_overflow"], sync["pool_pre_ping"], sync["echo"]) == (7, 3, False, False)
+    assert sync["connect_args"] == {"options": "-c statement_timeout=2500"}
+    assert engine_options("postgresql+asyncpg://u:p@db/app", is_async=True)["connect_args"] == {
+        "server_settings": {"statement_timeout": "2500"}
+    }
+
+    # PgBouncer (transaction pooling): no startup parameters, no reused prepared statements
+    monkeypatch.setattr(settings, "DB_PGBOUNCER", True)
+    pgbouncer = engine_options("postgresql+asyncpg://u:p@db/app", is_async=True)
+    assert pgbouncer["poolclass"] is MeteredAsyncQueuePool
+    assert pgbouncer["connect_args"]["statement_cache_size"] == 0
+    assert "server_settings" not in pgbouncer["connect_args"]
+
+    # SQLite keeps SQLAlchemy's own pool
+    assert set(engine_options("sqlite:///x.db")) == {"echo", "pool_pre_ping"}
+
+
+def test_pool_stats_report_checkouts_overflow_and_timeouts(tmp_path, monkeypatch):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", poolclass=MeteredQueuePool, pool_size=2, max_overflow=1, pool_timeout=0.05,
+    )
+    attach_metrics(engine)
+    monkeypatch.setattr(database, "engine", engine, raising=False)
+
+    connections = [engine.connect() for _ in range(3)]
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    stats = database.get_pool_stats()["sync"]
+    assert (stats["checked_out"], stats["overflow"], stats["max_overflow"]) == (3, 1, 1)
+    assert stats["checkouts"] == 4 and stats["timeouts"] == 1 and stats["wait_seconds_max"] >= 0.05
+
+    for connection in connections:
+        connection.close()
+    assert database.get_pool_stats()["sync"]["checked_out"] == 0
+    engine.dispose()
@@ -0,0 +1,69 @@
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from jose import jwt
+from sqlmodel import select
+from app.config import settings
+from app.core import cache, principal_cache
+from app.core.security import create_access_token
+from app.models import User
+
+
+def test_verified_tokens_are_cached_no_longer_than_their_exp(monkeypatch):
+    now = [time.monotonic()]
+    monkeypatch.setattr(cache, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    verified = []
+    real_verify = principal_cache.verify_jwt
+    monkeypatch.setattr(principal_cache, "verify_jwt", lambda token: verified.append(token) or real_verify(token))
+    principal_cache.clear()
+
+    token = create_access_token("someone", expires_delta=timedelta(seconds=5))
+    assert principal_cache.decode_token(token)["sub"] == "someone"
+    assert principal_cache.decode_token(token)["sub"] == "someone"
+    assert len(verified) == 1
+    assert principal_cache.decode_token("garbage") is None
+    assert principal_cache.decode_token("garbage") is None
+    assert len(verified) == 3  # invalid tokens are never cached
+
+    # Well inside AUTH_CACHE_TTL_SECONDS, but past the token's own expiry
+    assert settings.AUTH_CACHE_TTL_SECONDS > 10
+    now[0] += 10
+    principal_cache.decode_token(token)
+    assert len(verified) == 4
+
+
+def test_principal_is_cached_until_the_user_row_changes(db, client, count_queries):
+    user = User(email="u@x", hashed_password="x", full_name="Before")
+    db.add(user)
+    db.commit()
+    headers = {"Authorization": "Bearer " + create_access_token(user.id)}
+
+    assert client.get("/me", headers=headers).json()["full_name"] == "Before"
+    with count_queries() as statements:
+        assert client.get("/me", headers=headers).status_code == 200
+    assert statements == []
+
+    # ORM writes fire the mapper events, so the next request reloads the row
+    user.full_name = "After"
+    db.add(user)
+    db.commit()
+    assert client.get("/me", headers=headers).json()["full_name"] == "After"
+
+    # A removed user is rejected straight away, not after the cache TTL
+    db.delete(db.exec(select(User).where(User.id == user.id)).one())
+    db.commit()
+    assert client.get("/me", headers=headers).status_code == 401
+
+
+def test_principal_from_claims_never_touches_the_database(client, count_queries, monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_PRINCIPAL_FROM_CLAIMS", True)
+    claims = {
+        "sub": "8d0c2f4e-0c7b-4a8e-9a53-2f0d8b6f1c11", "email": "c@x", "name": "From Claims",
+        "exp": datetime.utcnow() + timedelta(minutes=5),
+    }
+    token = jwt.encode(claims, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+    with count_queries() as statements:
+        me = client.get("/me", headers={"Authorization": f"Bearer {token}"})
+    assert me.status_code == 200 and statements == []
+    assert me.json()["id"] == claims["sub"] and me.json()["full_name"] == "From Claims"
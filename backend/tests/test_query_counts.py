@@ -0,0 +1,48 @@
+from decimal import Decimal
+from app.core.security import create_access_token
+from app.models import Gig, Order, PaymentProof, User
+
+# Statement budgets per request, after authentication is cached
+ORDER_DASHBOARD_MAX_QUERIES = 2
+GIG_FEED_MAX_QUERIES = 1
+
+
+def seed(db, orders: int):
+    client = User(email="client@x", hashed_password="x", full_name="Client")
+    freelancers = [User(email=f"f{i}@x", hashed_password="x", full_name=f"F{i}") for i in range(3)]
+    db.add_all([client, *freelancers])
+    gigs = [Gig(freelancer_id=f.id, title=f"Gig {i}", description="d", delivery_days=2) for i, f in enumerate(freelancers)]
+    db.add_all(gigs)
+    for i in range(orders):
+        gig = gigs[i % len(gigs)]
+        order = Order(gig_id=gig.id, client_id=client.id, freelancer_id=gig.freelancer_id)
+        db.add(order)
+        if i % 2:
+            db.add(PaymentProof(order_id=order.id, user_id=client.id, proof_reference="r", payer_name="C", amount=Decimal("5")))
+    db.commit()
+    return client
+
+
+def dashboard_queries(client, count_queries, headers, limit):
+    client.get("/api/v1/orders/expanded?limit=1", headers=headers)  # warm the principal cache
+    with count_queries() as statements:
+        response = client.get(f"/api/v1/orders/expanded?limit={limit}", headers=headers)
+    assert response.status_code == 200
+    return response.json(), len(statements)
+
+
+def test_order_dashboard_runs_a_constant_number_of_queries(db, client, count_queries):
+    user = seed(db, orders=30)
+    headers = {"Authorization": "Bearer " + create_access_token(user.id)}
+
+    small, small_count = dashboard_queries(client, count_queries, headers, limit=3)
+    large, large_count = dashboard_queries(client, count_queries, headers, limit=30)
+    assert len(small) == 3 and len(large) == 30
+    assert small_count == large_count <= ORDER_DASHBOARD_MAX_QUERIES
+    assert {row["counterpart"]["full_name"] for row in large} == {"F0", "F1", "F2"}
+    assert sum(row["payment_proof"] is not None for row in large) == 15
+
+    with count_queries() as statements:
+        feed = client.get("/api/v1/gigs/expanded?limit=50").json()
+    assert len(statements) <= GIG_FEED_MAX_QUERIES
+    assert {gig["freelancer"]["full_name"] for gig in feed} == {"F0", "F1", "F2"}
@@ -0,0 +1,25 @@
+from uuid import uuid4
+from app.core import limiter as rate_limits
+from app.core.security import create_access_token
+from app.models import User
+
+CREATE_ORDER_LIMIT = 5
+
+
+def test_limits_are_per_user_not_per_address(db, client):
+    users = [User(email=f"{name}@x", hashed_password="x", full_name=name) for name in ("alice", "bob")]
+    db.add_all(users)
+    db.commit()
+    alice, bob = ({"Authorization": "Bearer " + create_access_token(user.id)} for user in users)
+    rate_limits.limiter.reset()
+    rejected_before = rate_limits.stats.rejected
+    body = {"gig_id": str(uuid4())}
+
+    # Same client address; the limit counts requests, whatever the outcome (404 here)
+    codes = [client.post("/api/v1/orders/", json=body, headers=alice).status_code for _ in range(CREATE_ORDER_LIMIT + 1)]
+    assert codes[-1] == 429 and 429 not in codes[:-1]
+    assert client.post("/api/v1/orders/", json=body, headers=bob).status_code != 429
+
+    assert rate_limits.stats.rejected == rejected_before + 1
+    assert rate_limits.stats.as_dict()["rejected_by_key_kind"]["user"] >= 1
+    rate_limits.limiter.reset()
@@ -0,0 +1,37 @@
+import asyncio
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models import Gig, Order, Review, User, UserRatingSummary
+from app.services import rating_service
+
+
+def test_incremental_summary_matches_a_full_rebuild(tmp_path):
+    url = f"sqlite:///{tmp_path / 'ratings.db'}"
+    SQLModel.metadata.create_all(create_engine(url))
+    client, freelancer = User(email="c@x", hashed_password="x", full_name="C"), User(email="f@x", hashed_password="x", full_name="F")
+    gig = Gig(freelancer_id=freelancer.id, title="t", description="d", delivery_days=1)
+
+    async def write_reviews():
+        engine = create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://"))
+        sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with sessions() as session:
+            session.add_all([client, freelancer, gig])
+            await session.commit()
+            for rating in [5, 4, 5, 1]:
+                order = Order(gig_id=gig.id, client_id=client.id, freelancer_id=freelancer.id)
+                session.add(order)
+                session.add(Review(order_id=order.id, reviewer_id=client.id, reviewee_id=freelancer.id, rating=rating, comment=""))
+                await rating_service.record_review(session, freelancer.id, rating)
+                await session.commit()
+            summary = await session.get(UserRatingSummary, freelancer.id)
+        await engine.dispose()
+        return rating_service.to_read(freelancer.id, summary)
+
+    incremental = asyncio.run(write_reviews())
+    assert incremental.review_count == 4 and incremental.average_rating == 3.75
+    assert incremental.histogram == {"1": 1, "2": 0, "3": 0, "4": 1, "5": 2}
+
+    with Session(create_engine(url)) as session:
+        assert rating_service.rebuild_summaries(session) == 1
+        assert rating_service.to_read(freelancer.id, session.get(UserRatingSummary, freelancer.id)) == incremental
@@ -0,0 +1,49 @@
+import asyncio
+from app.core.read_cache import MemoryCacheBackend, ReadThroughCache
+
+
+def test_concurrent_misses_share_one_load_and_writes_invalidate():
+    async def scenario():
+        cache = ReadThroughCache(MemoryCacheBackend(100, 60), "test", ttl=60)
+        loads = []
+
+        async def load():
+            loads.append(1)
+            await asyncio.sleep(0.01)
+            return f"page-{len(loads)}".encode()
+
+        results = await asyncio.gather(*[cache.get_or_load("page", load) for _ in range(20)])
+        assert set(results) == {b"page-1"} and len(loads) == 1
+        assert await cache.get_or_load("page", load) == b"page-1"
+        assert cache.stats.misses == 1 and cache.stats.coalesced == 19 and cache.stats.hits == 1
+
+        await cache.invalidate()
+        assert await cache.get_or_load("page", load) == b"page-2"
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_owner_does_not_cancel_coalesced_waiters():
+    async def scenario():
+        cache = ReadThroughCache(MemoryCacheBackend(100, 60), "test", ttl=60)
+        started = asyncio.Event()
+        loads = []
+
+        async def load():
+            loads.append(1)
+            started.set()
+            await asyncio.sleep(0.05)
+            return f"page-{len(loads)}".encode()
+
+        owner = asyncio.create_task(cache.get_or_load("page", load))
+        await started.wait()
+        waiters = [asyncio.create_task(cache.get_or_load("page", load)) for _ in range(5)]
+        await asyncio.sleep(0)
+        owner.cancel()
+
+        # One waiter takes over the load, the rest coalesce onto it
+        assert await asyncio.gather(*waiters) == [b"page-2"] * 5
+        assert owner.cancelled() and len(loads) == 2
+        assert await cache.get_or_load("page", load) == b"page-2"
+
+    asyncio.run(scenario())
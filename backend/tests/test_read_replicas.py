@@ -0,0 +1,102 @@
+import time
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app import database
+from app.config import settings
+from app.core import read_routing
+from app.core.security import create_access_token
+from app.database import get_read_session, get_read_session_factory
+from app.main import app
+from app.models import Gig, Message, User
+
+
+@pytest.fixture
+def replica(async_engine, client, tmp_path, monkeypatch):
+    """
+    A second database acting as a replica that has not caught up: whatever the
+    test seeds through the returned sync engine is all it ever sees.
+    """
+    replica_url = f"sqlite:///{tmp_path / 'replica.db'}"
+    engine = create_engine(replica_url)
+    SQLModel.metadata.create_all(engine)
+    replica_async = create_async_engine(replica_url.replace("sqlite://", "sqlite+aiosqlite://"), poolclass=NullPool)
+
+    # Undo the conftest shortcut that sends reads to the single test database
+    app.dependency_overrides.pop(get_read_session)
+    app.dependency_overrides.pop(get_read_session_factory)
+    primary_sessions = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_URLS", [replica_url])
+    monkeypatch.setattr(database, "AsyncSessionLocal", primary_sessions, raising=False)
+    monkeypatch.setattr(database, "ReplicaSessionLocals", [async_sessionmaker(replica_async, class_=AsyncSession)], raising=False)
+    yield engine
+    engine.dispose()
+
+
+def seed_replica(replica, *rows):
+    with Session(replica) as session:
+        session.add_all([type(row)(**row.model_dump()) for row in rows])
+        session.commit()
+
+
+def test_reads_go_to_the_replica_except_right_after_a_write(db, client, replica):
+    sender = User(email="s@x", hashed_password="x", full_name="S")
+    receiver = User(email="r@x", hashed_password="x", full_name="R")
+    db.add_all([sender, receiver])
+    db.commit()
+    seed_replica(replica, Message(sender_id=sender.id, receiver_id=receiver.id, content="from the replica"))
+
+    headers = {"Authorization": "Bearer " + create_access_token(sender.id)}
+    history = f"/api/v1/messages/{receiver.id}"
+
+    def contents():
+        response = client.get(history, headers=headers)
+        assert response.status_code == 200
+        return [message["content"] for message in response.json()]
+
+    replica_reads = read_routing.stats.replica_reads
+    assert contents() == ["from the replica"]
+    assert read_routing.stats.replica_reads == replica_reads + 1
+
+    # The write goes to the primary and pins this client's reads there for a while
+    sent = client.post("/api/v1/messages/", json={"receiver_id": str(receiver.id), "content": "fresh"}, headers=headers)
+    assert sent.status_code == 200
+    assert read_routing.STICKY_COOKIE in sent.headers["set-cookie"]
+    assert contents() == ["fresh"]
+
+    # Once the window has passed, reads return to the replica
+    client.cookies.set(read_routing.STICKY_COOKIE, str(int(time.time()) - 1))
+    assert contents() == ["from the replica"]
+
+    # Failed writes change nothing, so they do not pin reads
+    client.cookies.clear()
+    rejected = client.post("/api/v1/messages/", json={"receiver_id": "not-a-uuid", "content": "x"}, headers=headers)
+    assert rejected.status_code == 422
+    assert "set-cookie" not in rejected.headers
+
+
+def test_writer_sees_their_gig_edit_despite_a_stale_catalog_entry(db, client, replica):
+    freelancer = User(email="f@x", hashed_password="x", full_name="F")
+    db.add(freelancer)
+    gig = Gig(freelancer_id=freelancer.id, title="Old title", description="d", delivery_days=2)
+    db.add(gig)
+    db.commit()
+    seed_replica(replica, gig)
+    headers = {"Authorization": "Bearer " + create_access_token(freelancer.id)}
+
+    updated = client.patch(f"/api/v1/gigs/{gig.id}", json={"title": "New title"}, headers=headers)
+    assert updated.status_code == 200
+    sticky = dict(client.cookies)
+    assert read_routing.STICKY_COOKIE in sticky
+
+    # Someone else reads first and fills the fresh cache version from the lagging replica
+    client.cookies.clear()
+    assert client.get(f"/api/v1/gigs/{gig.id}").json()["title"] == "Old title"
+    assert client.get("/api/v1/gigs/").json()[0]["title"] == "Old title"
+
+    client.cookies.update(sticky)
+    assert client.get(f"/api/v1/gigs/{gig.id}").json()["title"] == "New title"
+    assert client.get("/api/v1/gigs/").json()[0]["title"] == "New title"
+    assert client.get("/api/v1/gigs/search?q=new").json()[0]["title"] == "New title"
@@ -0,0 +1,68 @@
+from decimal import Decimal
+from typing import List
+from pydantic import TypeAdapter
+from app.core.security import create_access_token
+from app.core.serialization import COLUMNAR_MEDIA_TYPE, columnar_to_objects, dump_json
+from app.models import Gig, Message, Order, User
+from app.schemas.gig import GigRead
+from app.schemas.message import MessageRead
+from app.schemas.order import OrderRead
+
+COLUMNAR = {"Accept": COLUMNAR_MEDIA_TYPE}
+
+
+def seed(db):
+    client = User(email="client@x", hashed_password="x", full_name="Client")
+    freelancer = User(email="f@x", hashed_password="x", full_name="F")
+    db.add_all([client, freelancer])
+    gigs = [Gig(freelancer_id=freelancer.id, title=f"Gig {i}", description="d", price=Decimal("12.50"), delivery_days=2) for i in range(5)]
+    orders = [Order(gig_id=gig.id, client_id=client.id, freelancer_id=freelancer.id) for gig in gigs]
+    messages = [Message(sender_id=client.id, receiver_id=freelancer.id, content=f"m{i}") for i in range(5)]
+    db.add_all([*gigs, *orders, *messages])
+    db.commit()
+    return client, freelancer, gigs, orders, messages
+
+
+def orm_body(schema, objects):
+    # What the ORM path produced: the fast path must be byte-compatible with it
+    return TypeAdapter(List[schema]).validate_json(dump_json(TypeAdapter(List[schema]), objects))
+
+
+def test_row_serialized_lists_match_the_read_schemas(db, client):
+    user, freelancer, gigs, orders, messages = seed(db)
+    headers = {"Authorization": "Bearer " + create_access_token(user.id)}
+
+    for url, schema, objects, auth in [
+        ("/api/v1/gigs/", GigRead, gigs, {}),
+        ("/api/v1/gigs/search?q=gig", GigRead, gigs, {}),
+        ("/api/v1/orders/", OrderRead, orders, headers),
+        (f"/api/v1/messages/{freelancer.id}", MessageRead, messages, headers),
+    ]:
+        response = client.get(url, headers=auth)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        body = TypeAdapter(List[schema]).validate_python(response.json())
+        assert sorted(body, key=lambda item: item.id) == sorted(orm_body(schema, objects), key=lambda item: item.id)
+        assert set(response.json()[0]) == set(schema.model_fields)
+
+
+def test_columnar_format_is_negotiated(db, client):
+    user, freelancer, gigs, orders, messages = seed(db)
+    headers = {"Authorization": "Bearer " + create_access_token(user.id)}
+
+    for url, auth in [("/api/v1/gigs/", {}), ("/api/v1/orders/", headers), (f"/api/v1/messages/{freelancer.id}", headers)]:
+        objects = client.get(url, headers=auth)
+        columnar = client.get(url, headers={**auth, **COLUMNAR})
+        assert columnar.headers["content-type"] == COLUMNAR_MEDIA_TYPE
+        assert "Accept" in columnar.headers["vary"]
+        page = columnar.json()
+        assert page["version"] == 1
+        assert columnar_to_objects(page) == objects.json()
+        # Different representations never share a validator
+        if "etag" in objects.headers:
+            assert columnar.headers["etag"] != objects.headers["etag"]
+
+    # Expanded pages nest objects and ignore the columnar request
+    expanded = client.get("/api/v1/gigs/expanded", headers=COLUMNAR)
+    assert expanded.headers["content-type"] == "application/json"
+    assert expanded.json()[0]["freelancer"]["full_name"] == "F"
@@ -0,0 +1,75 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from fastapi.testclient import TestClient
+from sqlmodel import SQLModel
+from app.config import settings
+from app.core.readiness import readiness
+from app.main import app
+
+BACKEND = Path(__file__).resolve().parent.parent
+# Generous: a cold `import app.main` takes well under a second; this catches a
+# module doing real work (connecting, reflecting, loading data) at import
+IMPORT_BUDGET_SECONDS = 3.0
+DRIVERS = ("asyncpg", "psycopg2", "aiosqlite")
+
+PROFILE = """
+import sys
+import app.main
+from app import database
+print("engines:", sorted(name for name in ("engine", "async_engine") if name in vars(database)))
+print("drivers:", sorted(name for name in {drivers!r} if name in sys.modules))
+"""
+
+
+def test_import_is_fast_and_touches_no_database():
+    # An empty DATABASE_URL (which .env does not override) must not break the import
+    env = {**os.environ, "DATABASE_URL": ""}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROFILE.format(drivers=DRIVERS)],
+        cwd=BACKEND, env=env, capture_output=True, text=True, timeout=60,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    assert "engines: []" in result.stdout
+    assert "drivers: []" in result.stdout
+
+    # -X importtime lines: "import time: self [us] | cumulative | module"
+    cumulative = {
+        line.rsplit("|", 1)[1].strip(): int(line.split("|")[1])
+        for line in result.stderr.splitlines() if line.startswith("import time:") and "|" in line and "cumulative" not in line
+    }
+    slowest = sorted(cumulative.items(), key=lambda item: -item[1])[:10]
+    assert cumulative["app.main"] / 1e6 < IMPORT_BUDGET_SECONDS, slowest
+
+
+def test_startup_does_not_create_tables(monkeypatch):
+    def create_all(*args, **kwargs):
+        raise AssertionError("create_all on startup")
+
+    monkeypatch.setattr(settings, "OUTBOX_DISPATCHER_ENABLED", False)
+    monkeypatch.setattr(SQLModel.metadata, "create_all", create_all)
+    with TestClient(app):
+        pass
+
+
+def test_readiness_probe_warms_once(client, count_queries, monkeypatch):
+    monkeypatch.setattr(readiness, "warmed", False)
+    monkeypatch.setattr(readiness, "warm_seconds", None)
+
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    assert response.json()["ready"] is True
+    assert response.json()["warm_seconds"] is not None
+    # The warm-up already loaded the feed page into the catalog cache
+    with count_queries() as statements:
+        assert client.get("/api/v1/gigs/").status_code == 200
+    assert statements == []
+
+    async def unreachable(connections):
+        raise ConnectionRefusedError("database down")
+
+    monkeypatch.setattr(readiness, "_ping", unreachable)
+    failed = client.get("/health/ready")
+    assert failed.status_code == 503
+    assert "database down" in failed.json()["last_error"]
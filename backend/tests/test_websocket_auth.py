@@ -0,0 +1,83 @@
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.websockets import WebSocketDisconnect
+from app import database
+from app.api.endpoints import messages
+from app.config import settings
+from app.core.security import create_access_token
+from app.models import User
+from app.websocket.connection_manager import manager
+
+OWN_ORIGIN = settings.CORS_ALLOWED_ORIGINS[0]
+
+
+@pytest.fixture
+def users(db, async_engine, client, monkeypatch):
+    # The handshake opens its own short-lived session instead of a request dependency
+    sessions = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(database, "AsyncSessionLocal", sessions, raising=False)
+    alice = User(email="a@x", hashed_password="x", full_name="A")
+    bob = User(email="b@x", hashed_password="x", full_name="B")
+    db.add_all([alice, bob])
+    db.commit()
+    return alice, bob
+
+
+@pytest.mark.parametrize("token", [None, "not-a-jwt", "bob"])
+def test_handshake_is_rejected_without_a_token_for_the_path_user(client, users, token):
+    alice, bob = users
+    if token == "bob":
+        token = create_access_token(bob.id)
+    url = f"/api/v1/messages/ws/{alice.id}" + (f"?token={token}" if token else "")
+    with pytest.raises(WebSocketDisconnect) as rejected:
+        with client.websocket_connect(url):
+            pass
+    assert rejected.value.code == 1008
+    assert str(alice.id) not in manager.active_connections
+
+
+@pytest.mark.parametrize("via", ["cookie", "query"])
+def test_handshake_accepts_the_cookie_or_query_token(client, users, via):
+    alice, _ = users
+    token = create_access_token(alice.id)
+    url = f"/api/v1/messages/ws/{alice.id}"
+    if via == "cookie":
+        client.cookies.set("access_token", token)
+    else:
+        url += f"?token={token}"
+    with client.websocket_connect(url, headers={"Origin": OWN_ORIGIN}) as websocket:
+        websocket.send_text("{}")
+        assert websocket.receive_json() == {"type": "error", "client_id": None, "detail": "Malformed frame"}
+        assert str(alice.id) in manager.active_connections
+    assert str(alice.id) not in manager.active_connections
+
+
+def test_socket_is_unregistered_when_a_frame_handler_fails(client, users, monkeypatch):
+    alice, _ = users
+
+    async def broken(connection, user_id, frame):
+        raise RuntimeError("handler bug")
+
+    monkeypatch.setattr(messages, "handle_frame", broken)
+    with pytest.raises(RuntimeError):
+        with client.websocket_connect(f"/api/v1/messages/ws/{alice.id}?token={create_access_token(alice.id)}") as websocket:
+            websocket.send_json({"type": "pong"})
+            websocket.receive_json()
+    assert str(alice.id) not in manager.active_connections
+
+
+@pytest.mark.parametrize("origin", ["https://evil.example", None])
+def test_cookie_handshake_from_a_foreign_origin_is_refused(client, users, origin):
+    alice, _ = users
+    token = create_access_token(alice.id)
+    client.cookies.set("access_token", token)
+    headers = {"Origin": origin} if origin else {}
+    with pytest.raises(WebSocketDisconnect) as rejected:
+        with client.websocket_connect(f"/api/v1/messages/ws/{alice.id}", headers=headers):
+            pass
+    assert rejected.value.code == 1008
+
+    # An explicit token cannot come from the victim's cookie jar, so any origin may use it
+    with client.websocket_connect(f"/api/v1/messages/ws/{alice.id}?token={token}", headers=headers):
+        assert str(alice.id) in manager.active_connections
@@ -0,0 +1,44 @@
+import asyncio
+from uuid import uuid4
+from app.websocket.backplane import LocalBroker, PubSubBackplane
+from app.websocket.connection_manager import ConnectionManager
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, message):
+        self.sent.append(message)
+
+
+def test_message_reaches_socket_on_another_worker():
+    async def scenario():
+        broker = LocalBroker()
+        worker_a = ConnectionManager(PubSubBackplane(broker.client()))
+        worker_b = ConnectionManager(PubSubBackplane(broker.client()))
+        await worker_a.start()
+        await worker_b.start()
+
+        receiver = uuid4()
+        socket = FakeWebSocket()
+        connection = await worker_b.connect(socket, receiver)
+
+        # Published on worker A, delivered by worker B which holds the socket
+        await worker_a.send_personal_message("hello", receiver)
+        await asyncio.sleep(0.01)
+        assert socket.sent == ["hello"]
+
+        # After the last local socket disconnects worker B stops receiving that user's traffic
+        await worker_b.disconnect(connection)
+        await worker_a.send_personal_message("gone", receiver)
+        await asyncio.sleep(0.01)
+        assert socket.sent == ["hello"]
+
+        await worker_a.stop()
+        await worker_b.stop()
+
+    asyncio.run(scenario())
@@ -0,0 +1,87 @@
+import asyncio
+import json
+from uuid import uuid4
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models import Conversation, Message, User
+from app.websocket import protocol
+from app import database
+from app.websocket import ingest
+from app.websocket.ingest import MessageWriter, handle_frame
+
+
+class FakeConnection:
+    def __init__(self):
+        self.frames = []
+        self.typing_peers = set()
+
+    def enqueue(self, message):
+        self.frames.append(json.loads(message))
+        return True
+
+
+def test_batched_messages_are_acked_and_folded_into_the_inbox(tmp_path):
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'ingest.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        alice, bob = User(email="a@x", hashed_password="x", full_name="A"), User(email="b@x", hashed_password="x", full_name="B")
+        async with sessions() as session:
+            session.add_all([alice, bob])
+            await session.commit()
+
+        writer = MessageWriter(session_factory=sessions, batch_size=10, max_delay=0.05)
+        connection = FakeConnection()
+        for i in range(5):
+            frame = protocol.SendFrame(type="send", client_id=f"c{i}", receiver_id=bob.id, content=f"hi {i}")
+            writer.submit(alice.id, frame, connection)
+        writer.submit(alice.id, protocol.SendFrame(type="send", client_id="bad", receiver_id=uuid4(), content="?"), connection)
+        await writer.stop()
+
+        assert writer.batches_written == 1 and writer.messages_written == 5
+        acks = [f["client_id"] for f in connection.frames if f["type"] == "ack"]
+        errors = [f["client_id"] for f in connection.frames if f["type"] == "error"]
+        assert acks == [f"c{i}" for i in range(5)] and errors == ["bad"]
+
+        async with sessions() as session:
+            assert (await session.exec(select(func.count()).select_from(Message))).one() == 5
+            conversation = (await session.exec(select(Conversation))).one()
+            assert conversation.last_message_preview == "hi 4"
+            assert conversation.unread_a + conversation.unread_b == 5
+        await engine.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_typing_is_only_forwarded_within_an_existing_conversation(tmp_path, monkeypatch):
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'typing.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        monkeypatch.setattr(database, "AsyncSessionLocal", sessions, raising=False)
+        published = []
+
+        async def publish(message, user_id):
+            published.append(user_id)
+
+        monkeypatch.setattr(ingest.manager, "send_personal_message", publish)
+
+        alice, bob, carol = (User(email=f"{n}@x", hashed_password="x", full_name=n) for n in "abc")
+        async with sessions() as session:
+            session.add_all([alice, bob, carol])
+            session.add(Conversation(user_a_id=min(alice.id, bob.id), user_b_id=max(alice.id, bob.id)))
+            await session.commit()
+
+        connection = FakeConnection()
+        for receiver_id in (bob.id, carol.id, uuid4(), bob.id):
+            await handle_frame(connection, alice.id, protocol.TypingFrame(type="typing", receiver_id=receiver_id))
+
+        assert published == [bob.id, bob.id]
+        assert connection.typing_peers == {bob.id}
+        await engine.dispose()
+
+    asyncio.run(scenario())
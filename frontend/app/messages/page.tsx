@@ -48,6 +48,15 @@ export default function MessagesPage() {
             socketRef.current = socket;
 
             socket.onmessage = (event) => {
+                // Answer server heartbeats so the socket is not reaped as dead
+                let frame: any = null;
+                try {
+                    frame = JSON.parse(event.data);
+                } catch {}
+                if (frame?.type === "ping") {
+                    socket.send(JSON.stringify({ type: "pong" }));
+                    return;
+                }
                 fetchHistory();
             };
 